@@ -1,10 +1,25 @@
-import os
-from pathlib import Path
+"""
+آنالیز فقط-خواندنی فایل‌های Python پروژه (هیچ فایلی تغییر نمی‌کند).
+
+Files are parsed in a process pool and each result is cached by the SHA-256 of
+the file's content (.analyze_cache.json), so a re-run only parses files that
+changed. Directories in DEFAULT_IGNORE, .analyzeignore (one glob per line) and
+--ignore are skipped. The report is streamed to analyze_python_report.json as
+results arrive: {"files": [...], "errors": [...], "warnings": [...], "summary": {...}}.
+
+Usage (from backend/):
+  python analyze_python_file.py [--root ..] [--jobs 4] [--ignore 'tmp_*' ...] [--no-cache] [--report path]
+"""
+import argparse
 import ast
+import fnmatch
+import hashlib
 import json
-import re
-import subprocess
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
 
 # ------------------ رنگ‌ها برای لاگ ------------------
 class Colors:
@@ -20,89 +35,169 @@ def log_success(msg): print(f"{Colors.GREEN}✅ {msg}{Colors.RESET}")
 def log_warning(msg): print(f"{Colors.YELLOW}⚠️  {msg}{Colors.RESET}")
 def log_error(msg): print(f"{Colors.RED}❌ {msg}{Colors.RESET}")
 def log_title(msg): print(f"\n{Colors.BOLD}{Colors.CYAN}=== {msg} ==={Colors.RESET}\n")
-def log_fix(msg): print(f"{Colors.CYAN}🔧 {msg}{Colors.RESET}")
 
 # ------------------ متغیرهای عمومی ------------------
-errors = []
-warnings = []
-fixes = []
 BASE_DIR = Path(__file__).resolve().parent
+CACHE_PATH = BASE_DIR / '.analyze_cache.json'
+REPORT_PATH = BASE_DIR / 'analyze_python_report.json'
+IGNORE_FILE = BASE_DIR / '.analyzeignore'
+# نسخه‌ی قواعد آنالیز؛ با تغییر آن کش قبلی نادیده گرفته می‌شود
+ANALYZER_VERSION = 1
+# کمتر از این تعداد فایل تغییر کرده، بدون process pool آنالیز می‌شود
+MIN_POOL_FILES = 50
+DEFAULT_IGNORE = [
+    '.git', '__pycache__', '.venv', 'venv', 'env', 'node_modules', 'staticfiles', 'media', 'htmlcov',
+    '.pytest_cache', 'fix_backups_*', '*_backup', '*_backups',
+]
 
 # ------------------ توابع اصلی ------------------
-def run(cmd):
-    try:
-        subprocess.run(cmd, shell=True, check=True)
-        return True
-    except subprocess.CalledProcessError:
-        errors.append(f"خطا در اجرای دستور: {cmd}")
-        log_error(f"خطا در اجرای دستور: {cmd}")
-        return False
-
-def read_file(path):
-    if os.path.exists(path):
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read()
-    return None
-
-def write_file(path, content):
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(content)
-    log_fix(f"{os.path.basename(path)} اصلاح شد")
-    fixes.append(f"{os.path.basename(path)} اصلاح شد")
-
-def analyze_python_file(path):
-    content = read_file(path)
-    if not content:
-        return
+def load_ignore(extra):
+    patterns = list(DEFAULT_IGNORE)
+    if IGNORE_FILE.exists():
+        patterns += [line.strip() for line in IGNORE_FILE.read_text(encoding='utf-8').splitlines()
+                     if line.strip() and not line.startswith('#')]
+    return patterns + list(extra)
+def is_ignored(relative, patterns):
+    return any(fnmatch.fnmatch(relative, p) or fnmatch.fnmatch(relative.rsplit('/', 1)[-1], p) for p in patterns)
+def iter_python_files(root, patterns):
+    """.py files under ``root`` relative to it, pruning ignored directories before descending."""
+    for current, dirs, files in os.walk(root):
+        base = Path(current).relative_to(root).as_posix()
+        prefix = '' if base == '.' else base + '/'
+        dirs[:] = sorted(d for d in dirs if not is_ignored(prefix + d, patterns))
+        for name in sorted(files):
+            if name.endswith('.py') and not is_ignored(prefix + name, patterns):
+                yield prefix + name
+def _imported_names(tree):
+    """(name bound, line, dotted import) for module-level imports."""
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield (alias.asname or alias.name.split('.')[0]), node.lineno, alias.name
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name != '*':
+                    yield alias.asname or alias.name, node.lineno, f"{'.' * node.level}{node.module or ''}.{alias.name}"
+def analyze_source(name, source):
+    """Findings for one file: syntax error, trailing whitespace, unused and duplicate imports."""
+    result = {'path': name, 'errors': [], 'warnings': [], 'lines': source.count('\n') + 1}
     try:
-        ast.parse(content)
+        tree = ast.parse(source, filename=name)
     except SyntaxError as e:
-        errors.append(f"SyntaxError در {path}: {e}")
-        log_error(f"SyntaxError در {path}: {e}")
-        return
-
-    new_content = content
-    # حذف خطوط خالی پشت سر هم
-    new_content = re.sub(r'\n\s*\n+', '\n', new_content)
-    # حذف trailing spaces
-    new_content = re.sub(r'[ \t]+$', '', new_content, flags=re.MULTILINE)
-
-    # مرتب کردن importها
-    lines = new_content.splitlines()
-    imports = [l for l in lines if l.strip().startswith('import') or l.strip().startswith('from')]
-    others = [l for l in lines if not (l.strip().startswith('import') or l.strip().startswith('from'))]
-    sorted_imports = sorted(imports)
-    new_content = '\n'.join(sorted_imports + [''] + others)
-
-    if new_content != content:
-        write_file(path, new_content)
-        fixes.append(f"پاکسازی {os.path.basename(path)}")
-
-def cleanup_code():
-    log_title("آنالیز و پاکسازی کدهای پروژه")
-    for root, dirs, files in os.walk(BASE_DIR):
-        for file in files:
-            if file.endswith(".py"):
-                analyze_python_file(os.path.join(root, file))
-    log_info("آنالیز خط به خط تمام فایل‌ها انجام شد")
-
-def show_report():
+        result['errors'].append(f"SyntaxError در {name}:{e.lineno}: {e.msg}")
+        return result
+    trailing = [n for n, line in enumerate(source.splitlines(), 1) if line != line.rstrip()]
+    if trailing:
+        result['warnings'].append(f"{name}: فاصله‌ی اضافه در انتهای {len(trailing)} خط (اولین: {trailing[0]})")
+    used = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+    used |= {node.value.id for node in ast.walk(tree) if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name)}
+    exported = set()
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == '__all__' for t in node.targets):
+            exported |= {elt.value for elt in getattr(node.value, 'elts', []) if isinstance(elt, ast.Constant)}
+    seen = {}
+    for bound, line, dotted in _imported_names(tree):
+        if dotted in seen:
+            result['warnings'].append(f"{name}:{line}: import تکراری {dotted} (خط {seen[dotted]})")
+        seen.setdefault(dotted, line)
+        # در __init__.py و settings، importها معمولاً برای re-export هستند
+        if bound not in used and bound not in exported and not name.endswith('__init__.py') and bound != '*':
+            if not name.endswith(('settings.py', 'apps.py')):
+                result['warnings'].append(f"{name}:{line}: import بدون استفاده {dotted}")
+    result['classes'] = sum(isinstance(node, ast.ClassDef) for node in ast.walk(tree))
+    result['functions'] = sum(isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) for node in ast.walk(tree))
+    return result
+def analyze_file(root, name):
+    """Worker: read, hash and analyze one file."""
+    data = (Path(root) / name).read_bytes()
+    result = analyze_source(name, data.decode('utf-8', errors='replace'))
+    result['sha256'] = hashlib.sha256(data).hexdigest()
+    return result
+def load_cache(root, use_cache):
+    if not use_cache or not CACHE_PATH.exists():
+        return {}
+    try:
+        cache = json.loads(CACHE_PATH.read_text(encoding='utf-8'))
+    except ValueError:
+        return {}
+    return cache.get('files', {}) if (cache.get('version'), cache.get('root')) == (ANALYZER_VERSION, str(root)) else {}
+class ReportWriter:
+    """Streams per-file results into a JSON document as they arrive."""
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+        self.file.write('{"files": [\n')
+        self.count = 0
+    def add(self, result):
+        self.file.write((',\n' if self.count else '') + json.dumps(result, ensure_ascii=False))
+        self.file.flush()
+        self.count += 1
+    def close(self, errors, warnings, summary):
+        self.file.write('\n],\n')
+        for key, value in (('errors', errors), ('warnings', warnings)):
+            self.file.write(f'"{key}": {json.dumps(value, indent=2, ensure_ascii=False)},\n')
+        self.file.write(f'"summary": {json.dumps(summary, ensure_ascii=False)}\n}}\n')
+        self.file.close()
+def analyze(root, patterns, jobs, use_cache, report_path):
+    started = time.perf_counter()
+    names = list(iter_python_files(root, patterns))
+    cached = load_cache(root, use_cache)
+    results, changed = {}, []
+    writer = ReportWriter(report_path)
+    # فایل‌هایی که hash محتوایشان تغییر نکرده از کش خوانده می‌شوند
+    for name in names:
+        entry = cached.get(name)
+        if entry is not None and entry['sha256'] == hashlib.sha256((root / name).read_bytes()).hexdigest():
+            results[name] = entry
+            writer.add(entry)
+        else:
+            changed.append(name)
+    if jobs > 1 and len(changed) >= MIN_POOL_FILES:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(analyze_file, str(root), name) for name in changed]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result['path']] = result
+                writer.add(result)
+    else:
+        # برای تعداد کم فایل، راه‌اندازی process pool از خود آنالیز گران‌تر است
+        for name in changed:
+            results[name] = analyze_file(root, name)
+            writer.add(results[name])
+    if use_cache:
+        CACHE_PATH.write_text(json.dumps({'version': ANALYZER_VERSION, 'root': str(root), 'files': results}, ensure_ascii=False), encoding='utf-8')
+    errors = [e for name in names for e in results[name]['errors']]
+    warnings = [w for name in names for w in results[name]['warnings']]
+    summary = {
+        'files': len(names), 'parsed': len(changed), 'cached': len(names) - len(changed),
+        'errors': len(errors), 'warnings': len(warnings), 'seconds': round(time.perf_counter() - started, 3),
+    }
+    writer.close(errors, warnings, summary)
+    return errors, warnings, summary
+def show_report(errors, warnings, summary, report_path):
     log_title("گزارش نهایی")
     print(f"خطاها: {len(errors)}")
     for e in errors: print(f"• {Colors.RED}{e}{Colors.RESET}")
     print(f"هشدارها: {len(warnings)}")
     for w in warnings: print(f"• {Colors.YELLOW}{w}{Colors.RESET}")
-    print(f"رفع شده‌ها: {len(fixes)}")
-    for f in fixes: print(f"• {Colors.GREEN}{f}{Colors.RESET}")
-    with open("analyze_python_report.json", "w", encoding="utf-8") as f:
-        json.dump({"errors": errors, "warnings": warnings, "fixes": fixes}, f, indent=2, ensure_ascii=False)
-    log_info("گزارش ذخیره شد در analyze_python_report.json")
+    log_info(f"{summary['files']} فایل ({summary['parsed']} آنالیز، {summary['cached']} از کش) در {summary['seconds']} ثانیه")
+    log_info(f"گزارش ذخیره شد در {report_path}")
 
 def main():
-    log_title("شروع آنالیز پیشرفته فایل‌های Python")
-    cleanup_code()
-    show_report()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--root', type=Path, default=BASE_DIR, help='directory to analyze (default: backend/)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help='worker processes')
+    parser.add_argument('--ignore', nargs='*', default=[], help='extra glob patterns to skip')
+    parser.add_argument('--no-cache', action='store_true', help='analyze every file and do not update the cache')
+    parser.add_argument('--report', type=Path, default=REPORT_PATH)
+    args = parser.parse_args()
+    log_title("شروع آنالیز فایل‌های Python (فقط خواندنی)")
+    errors, warnings, summary = analyze(args.root.resolve(), load_ignore(args.ignore), args.jobs, not args.no_cache, args.report)
+    show_report(errors, warnings, summary, args.report)
+    if errors:
+        log_error("آنالیز با خطا تمام شد")
+        return 1
     log_success("آنالیز کامل شد ✅")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Revocation of JWTs before they expire.
+
+Revoked token ids (``jti``) are rows of RevokedToken. Each worker keeps them in
+a Bloom filter as well: a token that is not in the filter is certainly not
+revoked, which is the answer for nearly every request, so authentication costs
+no query. A filter hit (a revoked token, or a false positive at
+JWT_DENYLIST_ERROR_RATE) is confirmed against the table. The filter picks up
+rows added by other workers every JWT_DENYLIST_REFRESH_SECONDS (one indexed
+query for ``id > cursor`` or ``revoked_at`` within JWT_DENYLIST_RESCAN_SECONDS
+of the previous refresh), and is rebuilt from scratch every
+JWT_DENYLIST_REBUILD_SECONDS, after expired rows have been deleted, or when it
+outgrows its capacity.
+
+Ids are allocated at insert but become visible at commit, so on PostgreSQL a
+row can appear below the cursor after a later id was already read; the
+``revoked_at`` window catches it. A revocation whose transaction stays open
+longer than the window is still missed until the next rebuild.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings; no false negatives, ``error_rate`` false positives at ``capacity`` items."""
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+    def _positions(self, key):
+        # two 64-bit halves of one digest, combined as h1 + i*h2 (Kirsch-Mitzenmacher)
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2, size = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1, self.size
+        for _ in range(self.hashes):
+            yield h1 % size
+            h1 += h2
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    def __contains__(self, key):
+        # a key that was never added usually fails on the first bit or two
+        bits = self.bits
+        for position in self._positions(key):
+            if not bits[position >> 3] >> (position & 7) & 1:
+                return False
+        return True
+class Denylist:
+    """Per-process view of RevokedToken: the Bloom filter, its DB cursor and the confirmed hits."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+    def clear(self):
+        """Forget everything; the next lookup rebuilds from the table."""
+        self.bloom, self.cursor, self.revoked = None, 0, set()
+        self.refreshed_at = self.rebuilt_at = 0.0
+        self.scanned_at = None  # wall clock of the last read, for the revoked_at window
+    def __contains__(self, jti):
+        self.refresh()
+        if jti not in self.bloom:
+            return False
+        if jti in self.revoked:
+            return True
+        from .models import RevokedToken
+        if RevokedToken.objects.filter(jti=jti, expires_at__gt=timezone.now()).exists():
+            self.revoked.add(jti)
+            return True
+        return False
+    def refresh(self, force=False):
+        """Add rows written since the last refresh, at most every JWT_DENYLIST_REFRESH_SECONDS."""
+        now = time.monotonic()
+        if not force and self.bloom is not None and now - self.refreshed_at < settings.JWT_DENYLIST_REFRESH_SECONDS:
+            return
+        from .models import RevokedToken
+        with self._lock:
+            if self.bloom is None or now - self.rebuilt_at >= settings.JWT_DENYLIST_REBUILD_SECONDS \
+                    or self.bloom.count >= self.bloom.capacity:
+                self._rebuild(now)
+            else:
+                since = self.scanned_at - timedelta(seconds=settings.JWT_DENYLIST_RESCAN_SECONDS)
+                self.scanned_at = timezone.now()
+                for pk, jti in RevokedToken.objects.filter(Q(pk__gt=self.cursor) | Q(revoked_at__gte=since)).values_list('pk', 'jti'):
+                    if jti not in self.bloom:  # rows in the window are read again
+                        self.bloom.add(jti)
+                    self.cursor = max(self.cursor, pk)
+            self.refreshed_at = now
+    def _rebuild(self, now):
+        from .models import RevokedToken
+        self.scanned_at = timezone.now()
+        RevokedToken.objects.filter(expires_at__lte=self.scanned_at).delete()
+        rows = list(RevokedToken.objects.order_by('pk').values_list('pk', 'jti'))
+        bloom = BloomFilter(max(settings.JWT_DENYLIST_CAPACITY, 2 * len(rows)), settings.JWT_DENYLIST_ERROR_RATE)
+        for _pk, jti in rows:
+            bloom.add(jti)
+        self.bloom, self.cursor, self.revoked = bloom, rows[-1][0] if rows else 0, set()
+        self.rebuilt_at = now
+    def revoke(self, tokens, user_id=None):
+        """Store the tokens' jtis until they expire; effective at once in this process, within a refresh elsewhere."""
+        from .models import RevokedToken
+        rows = [
+            RevokedToken(
+                jti=token[api_settings.JTI_CLAIM], token_type=token[api_settings.TOKEN_TYPE_CLAIM],
+                user_id=user_id or token.get(api_settings.USER_ID_CLAIM),
+                expires_at=datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc),
+            )
+            for token in tokens
+        ]
+        RevokedToken.objects.bulk_create(rows, ignore_conflicts=True)
+        self.refresh()
+        with self._lock:
+            for row in rows:
+                self.bloom.add(row.jti)
+                self.revoked.add(row.jti)
+        return len(rows)
+denylist = Denylist()
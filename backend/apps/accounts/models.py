@@ -36,4 +36,13 @@ class User(AbstractUser):
         return self.email
     class Meta:
         verbose_name = _('user')
-        verbose_name_plural = _('users')
\ No newline at end of file
+        verbose_name_plural = _('users')
+class RevokedToken(models.Model):
+    """A JWT revoked before its expiry (logout); rows past ``expires_at`` are pruned by the denylist"""
+    jti = models.CharField(max_length=255, unique=True)
+    token_type = models.CharField(max_length=20)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='revoked_tokens')
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    def __str__(self):
+        return f'{self.token_type} {self.jti}'
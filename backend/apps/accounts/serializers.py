@@ -1,10 +1,14 @@
+from .denylist import denylist
+from .tokens import RefreshToken
+from apps.core.serializers import SparseFieldsMixin
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer as BaseTokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 
 User = get_user_model()
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for the user object"""
     class Meta:
         model = User
@@ -46,4 +50,18 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         data.update({
             'user': UserSerializer(self.user).data
         })
-        return data
\ No newline at end of file
+        return data
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """Refresh that rejects revoked refresh tokens and, when rotating, revokes the one it replaces"""
+    token_class = RefreshToken
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        data = {'access': str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                denylist.revoke([refresh])
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        return data
@@ -0,0 +1,16 @@
+from .denylist import denylist
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+class RevocableTokenMixin:
+    """Token verification that also rejects jtis on the denylist (see apps.accounts.denylist)."""
+    def verify(self):
+        super().verify()
+        if self.payload.get(api_settings.JTI_CLAIM) in denylist:
+            raise TokenError(_('Token is revoked'))
+class AccessToken(RevocableTokenMixin, tokens.AccessToken):
+    pass
+class RefreshToken(RevocableTokenMixin, tokens.RefreshToken):
+    access_token_class = AccessToken
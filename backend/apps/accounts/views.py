@@ -1,14 +1,21 @@
+from .denylist import denylist
 from .models import User
 from .serializers import UserSerializer, UserRegisterSerializer, CustomTokenObtainPairSerializer
+from .tokens import AccessToken, RefreshToken
+from apps.core.throttling import ScopedSlidingWindowThrottle
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.views import TokenObtainPairView as BaseTokenObtainPairView
 
 class UserRegisterView(generics.CreateAPIView):
     """View for user registration"""
     serializer_class = UserRegisterSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [ScopedSlidingWindowThrottle]
+    throttle_scope = 'register'
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -47,4 +54,29 @@ class ChangePasswordView(APIView):
         return Response(
             {"message": "Password updated successfully"},
             status=status.HTTP_200_OK
-        )
\ No newline at end of file
+        )
+class LogoutView(APIView):
+    """
+    Revoke the access token in the Authorization header and the posted ``refresh``
+    token. No authentication is required, so a client whose access token has
+    already expired can still revoke its refresh token.
+    """
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    def post(self, request):
+        header = JWTAuthentication().get_header(request)
+        raw_tokens = [
+            (AccessToken, header and JWTAuthentication().get_raw_token(header)),
+            (RefreshToken, request.data.get('refresh')),
+        ]
+        tokens = []
+        for token_class, raw_token in raw_tokens:
+            if raw_token:
+                try:
+                    tokens.append(token_class(raw_token))
+                except TokenError:
+                    pass
+        if not tokens:
+            return Response({'detail': 'No valid token to revoke.'}, status=status.HTTP_400_BAD_REQUEST)
+        denylist.revoke(tokens)
+        return Response({'message': 'Logged out'}, status=status.HTTP_200_OK)
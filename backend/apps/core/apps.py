@@ -3,4 +3,7 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
-    verbose_name = 'هسته'
\ No newline at end of file
+    verbose_name = 'هسته'
+    def ready(self):
+        from .bootstrap import connect_signals
+        connect_signals()
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""
+Server-side bootstrap of the SPA shell (``templates/index.html``).
+
+With SPA_BOOTSTRAP on, Django serves the shell itself and embeds the JSON every
+first paint needs in a ``<script id="bootstrap-data">`` block, keyed by API
+path: the BOOTSTRAP_API_PATHS are fetched through the API views themselves, as
+an anonymous GET, so the payload is exactly what the client would download, and
+``/company/settings/`` comes from the COMPANY setting. The frontend's ApiClient
+answers those GETs from the page instead of the network. Landing routes
+(LANDING_PAGES) are also pre-rendered into ``#root`` with their own title,
+description, canonical URL and JSON-LD, for crawlers and the first paint.
+
+Rendered pages are cached in the default cache under a generation that
+``invalidate()`` replaces when a Service is saved or deleted or a catalogue
+import writes rows. With the per-process locmem cache, other workers catch up
+within SPA_BOOTSTRAP_CACHE_SECONDS; with a shared cache (SQLiteCache, Redis) at once.
+A service page is keyed by its path only if the slug is one of the active
+services (a set also cached per generation); every unknown slug shares one 404
+entry, so made-up URLs cannot trigger renders or fill the cache.
+"""
+import hashlib
+import json
+import re
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpRequest
+from django.template.loader import render_to_string
+from django.urls import Resolver404, resolve
+from django.utils.safestring import mark_safe
+
+API_PREFIX = '/api/v1'
+BOOTSTRAP_API_PATHS = ('/services/', '/services/active/', '/categories/')
+GENERATION_KEY = 'spa:generation'
+# models whose changes alter a bootstrap payload or a landing page
+INVALIDATING_MODELS = ('services.Service',)
+# copied from the page request, so the API sees the same host and scheme (pagination links)
+FORWARDED_META = ('SERVER_NAME', 'SERVER_PORT', 'HTTP_HOST', 'HTTP_X_FORWARDED_HOST', 'HTTP_X_FORWARDED_PROTO',
+                  'wsgi.url_scheme')
+JSON_SCRIPT_ESCAPES = {ord('<'): '\\u003C', ord('>'): '\\u003E', ord('&'): '\\u0026'}
+
+def api_payload(request, path):
+    """Data of an anonymous GET to ``API_PREFIX + path``, or None unless it answers 200."""
+    try:
+        match = resolve(API_PREFIX + path)
+    except Resolver404:
+        return None
+    api_request = HttpRequest()
+    api_request.method = 'GET'
+    api_request.path = api_request.path_info = API_PREFIX + path
+    api_request.META = {key: request.META[key] for key in FORWARDED_META if key in request.META}
+    api_request.META['REQUEST_METHOD'] = 'GET'
+    response = match.func(api_request, *match.args, **match.kwargs)
+    return response.data if response.status_code == 200 else None
+def bootstrap_data(request):
+    data = {path: api_payload(request, path) for path in BOOTSTRAP_API_PATHS}
+    data['/company/settings/'] = dict(settings.COMPANY)
+    return {path: payload for path, payload in data.items() if payload is not None}
+def _results(payload):
+    """The items of a list payload, paginated or not."""
+    if isinstance(payload, dict):
+        return payload.get('results') or []
+    return payload or []
+def _service_list(request, data, title):
+    services = _results(data.get('/services/active/'))
+    return {
+        'title': title,
+        'description': settings.COMPANY.get('description') or '، '.join(s['name'] for s in services[:10]),
+        'items': [{'name': s['name'], 'url': f'/services/{s["slug"]}', 'description': s['description']} for s in services],
+        'structured_data': {
+            '@context': 'https://schema.org', '@type': 'ItemList',
+            'itemListElement': [
+                {'@type': 'ListItem', 'position': i, 'name': s['name'], 'url': request.build_absolute_uri(f'/services/{s["slug"]}')}
+                for i, s in enumerate(services, 1)
+            ],
+        },
+    }
+def home_page(request, data):
+    return _service_list(request, data, settings.COMPANY['name'])
+def services_page(request, data):
+    return _service_list(request, data, 'خدمات')
+def service_page(request, data, slug):
+    service = api_payload(request, f'/services/{slug}/')
+    if service is None or not service.get('is_active'):
+        return None
+    data[f'/services/{slug}/'] = service
+    return {
+        'title': service['name'],
+        'description': service['description'],
+        'item': service,
+        'structured_data': {
+            '@context': 'https://schema.org', '@type': 'Service', 'name': service['name'],
+            'description': service['description'], 'url': request.build_absolute_uri(request.path),
+            'provider': {'@type': 'Organization', 'name': settings.COMPANY['name']},
+        },
+    }
+def products_page(request, data):
+    products = _results(api_payload(request, '/products/'))
+    return {
+        'title': 'محصولات',
+        'items': [{'name': p['name'], 'url': f'/label/{p["slug"]}', 'description': p.get('description', '')}
+                  for p in products],
+    }
+# (path regex, page function); a function returning None renders the bare shell with status 404
+LANDING_PAGES = [
+    (re.compile(r'^/$'), home_page),
+    (re.compile(r'^/services/?$'), services_page),
+    (re.compile(r'^/services/(?P<slug>[-\w]+)/?$'), service_page),
+    (re.compile(r'^/products/?$'), products_page),
+]
+def _json_ld(data):
+    return mark_safe(json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False).translate(JSON_SCRIPT_ESCAPES))
+def render_page(request):
+    """(status, html) of the shell for ``request.path``: bootstrap data plus the landing page, if any."""
+    data, page, status = bootstrap_data(request), None, 200
+    for pattern, view in LANDING_PAGES:
+        match = pattern.match(request.path)
+        if match:
+            page = view(request, data, **match.groupdict())
+            status = 404 if page is None else 200
+            break
+    if page is not None:
+        page['canonical'] = request.build_absolute_uri(request.path)
+        if 'structured_data' in page:
+            page['structured_data'] = _json_ld(page['structured_data'])
+    html = render_to_string('index.html', {'bootstrap': data, 'company': settings.COMPANY, 'page': page})
+    return status, html
+def generation():
+    value = cache.get(GENERATION_KEY)
+    if value is None:
+        cache.add(GENERATION_KEY, uuid.uuid4().hex, None)
+        value = cache.get(GENERATION_KEY)
+    return value
+def active_service_slugs(current):
+    """Slugs that have a landing page, read once per generation ``current``."""
+    key = f'spa:slugs:{current}'
+    slugs = cache.get(key)
+    if slugs is None:
+        from django.apps import apps
+        slugs = frozenset(apps.get_model('services.Service').objects.filter(is_active=True).values_list('slug', flat=True))
+        cache.set(key, slugs, settings.SPA_BOOTSTRAP_CACHE_SECONDS)
+    return slugs
+def _route(request, current):
+    for pattern, _view in LANDING_PAGES:
+        match = pattern.match(request.path)
+        if match:
+            slug = match.groupdict().get('slug')
+            # the 404 shell has nothing path-specific, so every unknown slug shares it
+            return '404' if slug is not None and slug not in active_service_slugs(current) else request.path
+    # every other client-side route gets the same shell, so arbitrary paths share one entry
+    return '*'
+def cached_page(request):
+    """(status, html, etag) for ``request``, rendered at most once per generation, host and landing route."""
+    current = generation()
+    key = f'spa:page:{current}:{request.get_host()}:{_route(request, current)}'
+    page = cache.get(key)
+    if page is None:
+        status, html = render_page(request)
+        page = status, html, '"%s"' % hashlib.md5(html.encode(), usedforsecurity=False).hexdigest()
+        cache.set(key, page, settings.SPA_BOOTSTRAP_CACHE_SECONDS)
+    return page
+def invalidate():
+    """Drop every cached page."""
+    cache.set(GENERATION_KEY, uuid.uuid4().hex, None)
+def _model_changed(**kwargs):
+    # after commit, or a page rendered from the old rows could be cached under the new generation
+    transaction.on_commit(invalidate)
+def connect_signals():
+    from django.apps import apps
+    for label in INVALIDATING_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(_model_changed, sender=model, dispatch_uid=f'spa-bootstrap-save-{label}')
+        post_delete.connect(_model_changed, sender=model, dispatch_uid=f'spa-bootstrap-delete-{label}')
@@ -0,0 +1,217 @@
+"""
+Django cache backend in one SQLite file shared by every worker on the host.
+
+LocMemCache keeps a copy per gunicorn process that is lost on restart; this
+backend stores entries in a WAL-mode SQLite file instead, so workers see each
+other's writes at once and the cache survives restarts, without running Redis or
+memcached. Reads are served from SQLite's memory-mapped pages (``MMAP_SIZE``),
+which the kernel shares between the processes; writers take the file's write
+lock for one short statement.
+
+``incr()`` of an integer is a single ``UPDATE ... RETURNING``, atomic across
+processes; counters are 64-bit and raise ValueError rather than overflow.
+Entries expire by timestamp and are evicted least recently used once the file
+holds more than ``MAX_SIZE`` bytes of keys and values (or more than
+``MAX_ENTRIES`` entries, when given); ``CULL_FREQUENCY`` sets how much is freed
+at a time (1/N of the cap). Reads refresh an entry's access time at most once a
+``TOUCH_INTERVAL``, so hot keys do not turn every get into a write.
+
+    CACHES = {'default': {
+        'BACKEND': 'apps.core.cache.SQLiteCache',
+        'LOCATION': '/var/cache/digi_print/cache.sqlite3',
+        'OPTIONS': {'MAX_SIZE': 64 * 2 ** 20},
+    }}
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS cache_entry (key TEXT NOT NULL UNIQUE, value BLOB NOT NULL, expires REAL, '
+    'accessed REAL NOT NULL, size INTEGER NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS cache_entry_accessed ON cache_entry (accessed)',
+    # running totals kept by triggers, so checking the cap is one row read
+    'CREATE TABLE IF NOT EXISTS cache_usage (id INTEGER PRIMARY KEY CHECK (id = 0), entries INTEGER NOT NULL, '
+    'bytes INTEGER NOT NULL)',
+    'INSERT OR IGNORE INTO cache_usage VALUES (0, 0, 0)',
+    'CREATE TRIGGER IF NOT EXISTS cache_entry_insert AFTER INSERT ON cache_entry BEGIN '
+    'UPDATE cache_usage SET entries = entries + 1, bytes = bytes + NEW.size; END',
+    'CREATE TRIGGER IF NOT EXISTS cache_entry_resize AFTER UPDATE OF size ON cache_entry BEGIN '
+    'UPDATE cache_usage SET bytes = bytes + NEW.size - OLD.size; END',
+    'CREATE TRIGGER IF NOT EXISTS cache_entry_delete AFTER DELETE ON cache_entry BEGIN '
+    'UPDATE cache_usage SET entries = entries - 1, bytes = bytes - OLD.size; END',
+)
+UPSERT = (
+    'INSERT INTO cache_entry (key, value, expires, accessed, size) VALUES (?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE '
+    'SET value = excluded.value, expires = excluded.expires, accessed = excluded.accessed, size = excluded.size'
+)
+LIVE = '(expires IS NULL OR expires > ?)'
+# evict the least recently used entries until ``bytes`` and ``entries`` have dropped by the given amounts
+EVICT = (
+    'DELETE FROM cache_entry WHERE rowid IN (SELECT rowid FROM (SELECT rowid, size, '
+    'ROW_NUMBER() OVER w AS n, SUM(size) OVER w AS freed FROM cache_entry '
+    'WINDOW w AS (ORDER BY accessed ROWS UNBOUNDED PRECEDING)) WHERE freed - size < ? OR n <= ?)'
+)
+CHUNK = 500  # keys per statement in get_many, under SQLite's variable limit
+
+def encode(value):
+    """The stored form of ``value`` and its size: ints natively so incr() runs in SQL, anything else pickled."""
+    if type(value) is int and -2 ** 63 <= value < 2 ** 63:
+        return value, 8
+    blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    return blob, len(blob)
+def decode(stored):
+    return pickle.loads(stored) if isinstance(stored, bytes) else stored
+class SQLiteCache(BaseCache):
+    TOUCH_INTERVAL = 1.0
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.path = str(location)
+        self._max_size = int(options.get('MAX_SIZE', 64 * 2 ** 20))
+        self._max_entries = int(options['MAX_ENTRIES']) if 'MAX_ENTRIES' in options else None
+        self._cull_frequency = int(options.get('CULL_FREQUENCY', 10))
+        self._mmap_size = int(options.get('MMAP_SIZE', 2 * self._max_size))
+        self._local = threading.local()
+    def _connection(self):
+        # one connection per thread, reopened in forked workers
+        if getattr(self._local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(f'PRAGMA mmap_size={self._mmap_size}')
+            with self._transaction(connection):
+                for statement in SCHEMA:
+                    connection.execute(statement)
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return self._local.connection
+    @contextmanager
+    def _transaction(self, connection):
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+    def _row(self, key, value, expires, now):
+        stored, size = encode(value)
+        return key, stored, expires, now, len(key) + size
+    def _excess(self, connection, keep=1.0):
+        """How many bytes and entries are over ``keep`` times the caps."""
+        entries, size = connection.execute('SELECT entries, bytes FROM cache_usage').fetchone()
+        excess_entries = entries - int(self._max_entries * keep) if self._max_entries is not None else 0
+        return max(size - int(self._max_size * keep), 0), max(excess_entries, 0)
+    def _cull(self, connection):
+        if self._excess(connection) == (0, 0):
+            return
+        with self._transaction(connection):
+            connection.execute('DELETE FROM cache_entry WHERE expires <= ?', (time.time(),))
+            if self._cull_frequency == 0:
+                connection.execute('DELETE FROM cache_entry')
+            elif self._excess(connection) != (0, 0):
+                # free 1/CULL_FREQUENCY of the cap at once, so eviction does not run on every write
+                connection.execute(EVICT, self._excess(connection, keep=1 - 1 / self._cull_frequency))
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key, now = self.make_and_validate_key(key, version=version), time.time()
+        connection = self._connection()
+        # replaces only an expired entry
+        added = connection.execute(
+            f'{UPSERT} WHERE cache_entry.expires <= ?', (*self._row(key, value, self.get_backend_timeout(timeout), now), now),
+        ).rowcount > 0
+        if added:
+            self._cull(connection)
+        return added
+    def get(self, key, default=None, version=None):
+        key, now = self.make_and_validate_key(key, version=version), time.time()
+        connection = self._connection()
+        row = connection.execute(
+            f'SELECT value, accessed FROM cache_entry WHERE key = ? AND {LIVE}', (key, now),
+        ).fetchone()
+        if row is None:
+            return default
+        if row[1] < now - self.TOUCH_INTERVAL:
+            connection.execute('UPDATE cache_entry SET accessed = ? WHERE key = ?', (now, key))
+        return decode(row[0])
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key, now = self.make_and_validate_key(key, version=version), time.time()
+        expires, connection = self.get_backend_timeout(timeout), self._connection()
+        if expires is not None and expires <= now:
+            connection.execute('DELETE FROM cache_entry WHERE key = ?', (key,))
+            return
+        connection.execute(UPSERT, self._row(key, value, expires, now))
+        self._cull(connection)
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key, now = self.make_and_validate_key(key, version=version), time.time()
+        return self._connection().execute(
+            f'UPDATE cache_entry SET expires = ?, accessed = ? WHERE key = ? AND {LIVE}',
+            (self.get_backend_timeout(timeout), now, key, now),
+        ).rowcount > 0
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._connection().execute('DELETE FROM cache_entry WHERE key = ?', (key,)).rowcount > 0
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._connection().execute(
+            f'SELECT 1 FROM cache_entry WHERE key = ? AND {LIVE}', (key, time.time()),
+        ).fetchone() is not None
+    def incr(self, key, delta=1, version=None):
+        key, now = self.make_and_validate_key(key, version=version), time.time()
+        connection = self._connection()
+        if -2 ** 63 <= delta < 2 ** 63:
+            # SQLite turns an overflowing integer sum into REAL; such rows are left to the slow path
+            row = connection.execute(
+                f"UPDATE cache_entry SET value = value + ?, accessed = ? WHERE key = ? AND {LIVE} "
+                f"AND typeof(value) = 'integer' AND typeof(value + ?) = 'integer' RETURNING value",
+                (delta, now, key, now, delta),
+            ).fetchone()
+            if row is not None:
+                return row[0]
+        # missing, expired, not a native integer or overflowing: read-modify-write under the write lock
+        with self._transaction(connection):
+            row = connection.execute(
+                f'SELECT value, expires FROM cache_entry WHERE key = ? AND {LIVE}', (key, now),
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Key '{key}' not found.")
+            value = decode(row[0]) + delta
+            if type(row[0]) is int and not -2 ** 63 <= value < 2 ** 63:
+                raise ValueError(f"Incrementing '{key}' by {delta} overflows a 64-bit integer.")
+            connection.execute(UPSERT, self._row(key, value, row[1], now))
+        return value
+    def get_many(self, keys, version=None):
+        keys = {self.make_and_validate_key(key, version=version): key for key in keys}
+        connection, now, found, stale = self._connection(), time.time(), {}, []
+        names = list(keys)
+        for start in range(0, len(names), CHUNK):
+            chunk = names[start:start + CHUNK]
+            for key, stored, accessed in connection.execute(
+                f'SELECT key, value, accessed FROM cache_entry WHERE key IN ({", ".join("?" * len(chunk))}) AND {LIVE}',
+                (*chunk, now),
+            ):
+                found[keys[key]] = decode(stored)
+                if accessed < now - self.TOUCH_INTERVAL:
+                    stale.append((now, key))
+        if stale:
+            connection.executemany('UPDATE cache_entry SET accessed = ? WHERE key = ?', stale)
+        return found
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        now, expires, connection = time.time(), self.get_backend_timeout(timeout), self._connection()
+        rows = [self._row(self.make_and_validate_key(key, version=version), value, expires, now) for key, value in data.items()]
+        with self._transaction(connection):
+            if expires is not None and expires <= now:
+                connection.executemany('DELETE FROM cache_entry WHERE key = ?', [row[:1] for row in rows])
+            else:
+                connection.executemany(UPSERT, rows)
+        self._cull(connection)
+        return []
+    def delete_many(self, keys, version=None):
+        keys = [(self.make_and_validate_key(key, version=version),) for key in keys]
+        with self._transaction(self._connection()) as connection:
+            connection.executemany('DELETE FROM cache_entry WHERE key = ?', keys)
+    def clear(self):
+        self._connection().execute('DELETE FROM cache_entry')
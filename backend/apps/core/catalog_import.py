@@ -0,0 +1,158 @@
+import hashlib
+import time
+from dataclasses import dataclass, field
+from .bootstrap import invalidate
+from .tabular import chunked, iter_records, iter_rows
+from apps.services.models import Service
+from apps.services.serializers import ServiceSerializer
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+
+# Persian/Arabic-Indic digits and separators in price lists exported from Excel
+DIGITS = str.maketrans('۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩٬،', '01234567890123456789,,')
+# Persian/Arabic letters in Latin, for slugs (SlugField only takes ASCII); ZWNJ separates words
+LETTERS = str.maketrans({
+    'ا': 'a', 'آ': 'a', 'أ': 'a', 'إ': 'e', 'ب': 'b', 'پ': 'p', 'ت': 't', 'ث': 's', 'ج': 'j', 'چ': 'ch', 'ح': 'h',
+    'خ': 'kh', 'د': 'd', 'ذ': 'z', 'ر': 'r', 'ز': 'z', 'ژ': 'zh', 'س': 's', 'ش': 'sh', 'ص': 's', 'ض': 'z', 'ط': 't',
+    'ظ': 'z', 'ع': '', 'غ': 'gh', 'ف': 'f', 'ق': 'gh', 'ک': 'k', 'ك': 'k', 'گ': 'g', 'ل': 'l', 'م': 'm', 'ن': 'n',
+    'و': 'v', 'ؤ': 'v', 'ه': 'h', 'ة': 'h', 'ی': 'y', 'ي': 'y', 'ئ': 'y', 'ء': '', '\u200c': ' ',
+})
+
+def auto_slug(text, max_length=200):
+    """
+    ASCII slug for ``text``. Persian letters are transliterated, which drops the
+    short vowels, so different names could collide: non-ASCII names get a short
+    hash of the original text, which also keeps re-imports keyed on the same row.
+    """
+    slug = slugify(text.translate(DIGITS).translate(LETTERS))
+    if text.isascii():
+        return slug[:max_length]
+    digest = hashlib.sha1(text.strip().encode()).hexdigest()[:8]
+    return f'{slug[:max_length - len(digest) - 1]}-{digest}' if slug else digest
+class ImportTarget:
+    """
+    How spreadsheet rows map onto a model: the serializer whose writable fields
+    validate each row, the unique ``key`` rows are upserted on, and header
+    aliases (e.g. Persian column names). A missing key is slugified from
+    ``slug_from`` (``auto_slug``).
+    """
+    def __init__(self, model, serializer_class, key='slug', slug_from='name', aliases=None, numeric=()):
+        self.model, self.key, self.slug_from = model, key, slug_from
+        self.aliases = {k.casefold(): v for k, v in (aliases or {}).items()}
+        self.numeric = set(numeric)
+        self.fields = {}
+        for name, serializer_field in serializer_class().fields.items():
+            if serializer_field.read_only:
+                continue
+            # uniqueness is what the upsert is keyed on: checking it per row would cost a query each
+            serializer_field.validators = [v for v in serializer_field.validators if not isinstance(v, UniqueValidator)]
+            self.fields[name] = serializer_field
+    def column(self, header):
+        name = header.strip().casefold()
+        name = self.aliases.get(name, name)
+        return name if name in self.fields else None
+    def validate(self, record):
+        """Validated model values for one record, or raise ValidationError({field: [...]})."""
+        data = {}
+        for header, value in record.items():
+            name = self.column(header)
+            if name is None or value == '':
+                continue
+            if name in self.numeric:
+                value = value.translate(DIGITS).replace(',', '')
+            data[name] = value
+        if not data.get(self.key) and data.get(self.slug_from):
+            data[self.key] = auto_slug(data[self.slug_from])
+        values, errors = {}, {}
+        for name, serializer_field in self.fields.items():
+            if name not in data:
+                if serializer_field.required:
+                    errors[name] = ['This field is required.']
+                continue
+            try:
+                values[name] = serializer_field.run_validation(data[name])
+            except serializers.ValidationError as exc:
+                errors[name] = exc.detail
+        if errors:
+            raise serializers.ValidationError(errors)
+        return values
+TARGETS = {
+    'services': ImportTarget(
+        Service, ServiceSerializer, numeric=('price',),
+        aliases={'title': 'name', 'نام': 'name', 'عنوان': 'name', 'اسلاگ': 'slug', 'توضیحات': 'description',
+                 'قیمت': 'price', 'فعال': 'is_active'},
+    ),
+}
+@dataclass
+class ImportStats:
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    errors: list = field(default_factory=list)  # (line, {field: [messages]})
+    seconds: float = 0.0
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+def _upsert(target, batch, stats, dry_run):
+    """Create or update one batch of {key: values}; rows equal to the stored ones are not written."""
+    model, key = target.model, target.key
+    names = list(target.fields)
+    existing = {obj[key]: obj for obj in model.objects.filter(**{f'{key}__in': list(batch)}).values('pk', *names)}
+    to_create, to_update, changed_fields = [], [], set()
+    for value, values in batch.items():
+        stored = existing.get(value)
+        if stored is None:
+            to_create.append(model(**values))
+            continue
+        diff = {name for name, new in values.items() if stored[name] != new}
+        if not diff:
+            stats.unchanged += 1
+            continue
+        changed_fields |= diff
+        to_update.append(model(pk=stored['pk'], **{**{n: stored[n] for n in names}, **values}))
+    stats.created += len(to_create)
+    stats.updated += len(to_update)
+    if dry_run or not (to_create or to_update):
+        return
+    with transaction.atomic():
+        if to_create:
+            model.objects.bulk_create(to_create)
+        if to_update:
+            if any(f.name == 'updated_at' for f in model._meta.concrete_fields):
+                now = timezone.now()
+                for obj in to_update:
+                    obj.updated_at = now
+                changed_fields.add('updated_at')
+            model.objects.bulk_update(to_update, sorted(changed_fields))
+def import_catalog(path, target, batch_size=1000, sheet=None, delimiter=',', dry_run=False, progress=None):
+    """
+    Stream ``path`` (.csv/.tsv/.xlsx) into ``target`` in batches of ``batch_size``
+    rows: one SELECT per batch to diff against stored rows, then bulk_create for
+    new keys and bulk_update for changed ones. Invalid rows are collected in
+    ``stats.errors`` with their line number and skipped; a later row with the same
+    key replaces an earlier one. ``progress(stats)`` is called after every batch.
+    """
+    stats, started = ImportStats(), time.perf_counter()
+    for chunk in chunked(iter_records(iter_rows(path, sheet, delimiter)), batch_size):
+        batch = {}
+        for line, record in chunk:
+            stats.rows += 1
+            try:
+                values = target.validate(record)
+            except serializers.ValidationError as exc:
+                stats.errors.append((line, exc.detail))
+                continue
+            batch[values[target.key]] = values
+        if batch:
+            _upsert(target, batch, stats, dry_run)
+        stats.seconds = time.perf_counter() - started
+        if progress:
+            progress(stats)
+    stats.seconds = time.perf_counter() - started
+    if not dry_run and (stats.created or stats.updated):
+        invalidate()  # bulk writes send no model signals
+    return stats
@@ -0,0 +1,78 @@
+import random
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+class _RoutingState:
+    """Per-request routing flags. Mutated in place so sync_to_async threads see changes."""
+    __slots__ = ('pinned', 'wrote')
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+_state = ContextVar('db_routing_state', default=None)
+def begin_request(pinned=False):
+    """Start a routing scope for one request; returns the token for ``end_request``."""
+    return _state.set(_RoutingState(pinned))
+def end_request(token):
+    """Close the scope; returns True when the request wrote to the primary."""
+    state = _state.get()
+    _state.reset(token)
+    return bool(state and state.wrote)
+def pin_to_primary():
+    """Send every following read of the current request to the primary."""
+    state = _state.get()
+    if state is not None:
+        state.pinned = True
+class use_primary(ContextDecorator):
+    """
+    Force reads to the primary inside the block, e.g. right after a write made
+    outside a request or for a read that must never be stale::
+
+        with use_primary():
+            order = Order.objects.get(pk=pk)
+
+    For a single queryset ``Order.objects.using('default')`` does the same. Views
+    can set ``use_primary_db = True`` (see ReplicaRoutingMiddleware).
+    """
+    def __enter__(self):
+        self.token = _state.set(_RoutingState(pinned=True))
+        return self
+    def __exit__(self, *exc):
+        inner = _state.get()
+        _state.reset(self.token)
+        outer = _state.get()
+        if outer is not None and inner.wrote:
+            outer.wrote = outer.pinned = True
+        return False
+def get_replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+class PrimaryReplicaRouter:
+    """
+    Route reads to DATABASE_REPLICAS and writes to ``default``.
+
+    Reads stay on the primary when the request is pinned (unsafe method, view
+    opted in, recent write by this client, or an earlier write in the request) and
+    inside an open transaction on the primary, so a request always reads its own
+    writes. Migrations only run on the primary.
+    """
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+        state = _state.get()
+        if state is not None and state.pinned:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.pinned = state.wrote = True
+        return DEFAULT_DB_ALIAS
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas mirror the primary, so objects from any alias may be related
+        return True
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,56 @@
+from django.db.backends.sqlite3 import base
+
+# Applied on every new connection. journal_mode=WAL is persisted in the database
+# file; the rest are per-connection settings. busy_timeout follows OPTIONS['timeout'].
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -20000,
+    'mmap_size': 134217728,
+    'temp_store': 'MEMORY',
+}
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite backend tuned for small production deployments with several gunicorn
+    workers writing to one file.
+
+    OPTIONS:
+      ``pragmas``: dict merged over DEFAULT_PRAGMAS (a value of None drops a pragma)
+      ``timeout``: the driver's lock wait in seconds (5 by default); busy_timeout is
+          set from it, so the pragma cannot silently shorten it
+      ``transaction_mode``: how ``atomic()`` begins transactions, IMMEDIATE by default
+          so a writer takes the write lock up front and waits on busy_timeout instead
+          of failing with "database is locked" when upgrading a read lock.
+    """
+    def get_connection_params(self):
+        options = self.settings_dict['OPTIONS']
+        stripped = {k: v for k, v in options.items() if k not in ('pragmas', 'transaction_mode')}
+        self.settings_dict = {**self.settings_dict, 'OPTIONS': stripped}
+        try:
+            return super().get_connection_params()
+        finally:
+            self.settings_dict = {**self.settings_dict, 'OPTIONS': options}
+    @property
+    def pragmas(self):
+        options = self.settings_dict['OPTIONS']
+        busy_timeout = int(float(options.get('timeout', 5)) * 1000)
+        pragmas = {**DEFAULT_PRAGMAS, 'busy_timeout': busy_timeout, **options.get('pragmas', {})}
+        if self.is_in_memory_db():
+            pragmas.pop('journal_mode', None)
+            pragmas.pop('mmap_size', None)
+        return {k: v for k, v in pragmas.items() if v is not None}
+    @property
+    def transaction_mode(self):
+        mode = str(self.settings_dict['OPTIONS'].get('transaction_mode', 'IMMEDIATE')).upper()
+        if mode not in TRANSACTION_MODES:
+            raise ValueError(f'transaction_mode must be one of {TRANSACTION_MODES}, not {mode!r}')
+        return mode
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f'BEGIN {self.transaction_mode}')
@@ -0,0 +1,18 @@
+from apps.core.schema import generate_schema, get_schema_path, reset_schema_cache, write_schema
+from django.core.management.base import BaseCommand
+import time
+
+class Command(BaseCommand):
+    help = 'Generate the OpenAPI document once and store it on disk for the prebuilt schema mode'
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Destination file (default: settings.OPENAPI_SCHEMA_PATH)')
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        content = generate_schema()
+        path = options['output'] or get_schema_path()
+        digest = write_schema(content, path)
+        reset_schema_cache()
+        elapsed = (time.perf_counter() - started) * 1000
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {path} ({len(content)} bytes, sha256 {digest[:12]}) in {elapsed:.0f} ms"
+        ))
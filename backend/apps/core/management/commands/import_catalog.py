@@ -0,0 +1,41 @@
+from apps.core.catalog_import import TARGETS, import_catalog
+from django.core.management.base import BaseCommand, CommandError
+import csv
+
+class Command(BaseCommand):
+    help = 'Stream a CSV/XLSX price list into the catalog, upserting on slug in batches'
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='.csv, .tsv or .xlsx file with a header row')
+        parser.add_argument('--target', choices=sorted(TARGETS), default='services')
+        parser.add_argument('--batch-size', type=int, default=1000, help='rows validated and written per batch')
+        parser.add_argument('--sheet', help='XLSX sheet name or 0-based index (default: first sheet)')
+        parser.add_argument('--delimiter', default=',', help='CSV delimiter')
+        parser.add_argument('--dry-run', action='store_true', help='validate and diff without writing')
+        parser.add_argument('--errors', help='write rejected rows to this CSV (line, field, message)')
+    def handle(self, *args, **options):
+        def progress(stats):
+            if options['verbosity'] > 1:
+                self.stdout.write(f'  {stats.rows} rows, {stats.rows_per_second:.0f} rows/s')
+        try:
+            stats = import_catalog(
+                options['path'], TARGETS[options['target']], batch_size=options['batch_size'],
+                sheet=options['sheet'], delimiter=options['delimiter'], dry_run=options['dry_run'], progress=progress,
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+        for line, detail in stats.errors[:20]:
+            self.stderr.write(f'  line {line}: ' + '; '.join(f'{name}: {" ".join(map(str, messages))}' for name, messages in detail.items()))
+        if len(stats.errors) > 20:
+            self.stderr.write(f'  ... {len(stats.errors) - 20} more')
+        if options['errors']:
+            with open(options['errors'], 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['line', 'field', 'message'])
+                for line, detail in stats.errors:
+                    for name, messages in detail.items():
+                        writer.writerows([line, name, str(message)] for message in messages)
+        prefix = '[dry run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix}{stats.rows} rows in {stats.seconds:.2f}s ({stats.rows_per_second:.0f} rows/s): '
+            f'{stats.created} created, {stats.updated} updated, {stats.unchanged} unchanged, {len(stats.errors)} errors'
+        ))
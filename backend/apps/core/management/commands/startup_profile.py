@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+# Django loads settings, app configs, models and URLconfs through
+# importlib.import_module, which ``-X importtime`` does not report, so the boot
+# script times those calls itself and prints them as JSON on stdout.
+BOOT_SCRIPT = '''
+import importlib, json, sys, time
+_real_import_module = importlib.import_module
+_calls = []
+_stack = []
+def _timed_import_module(name, package=None):
+    if name in sys.modules:
+        return _real_import_module(name, package)
+    started = time.perf_counter()
+    _stack.append(name)
+    try:
+        module = _real_import_module(name, package)
+    finally:
+        _stack.pop()
+    _calls.append((name, (time.perf_counter() - started) * 1e6, list(_stack)))
+    return module
+importlib.import_module = _timed_import_module
+import django
+django.setup()
+if {urls}:
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+print(json.dumps(_calls))
+'''
+
+class Command(BaseCommand):
+    help = 'Report per-app import time for INSTALLED_APPS, measured in a fresh interpreter'
+    def add_arguments(self, parser):
+        parser.add_argument('--no-urls', action='store_true', help='Only run django.setup(), do not load the URLconf')
+        parser.add_argument('--top', type=int, default=15, help='Number of slowest individual modules to list')
+    def handle(self, *args, **options):
+        script = BOOT_SCRIPT.format(urls=not options['no_urls'])
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings')}
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        wall = (time.perf_counter() - started) * 1000
+        if proc.returncode != 0:
+            self.stderr.write(proc.stderr[-2000:])
+            return
+        calls = json.loads(proc.stdout.strip().splitlines()[-1])
+        statement_imports = []
+        for line in proc.stderr.splitlines():
+            match = IMPORTTIME_RE.match(line)
+            if match:
+                statement_imports.append((match.group(4), int(match.group(2))))
+        def owned(name, app):
+            return name == app or name.startswith(app + '.')
+        rows = []
+        for app in settings.INSTALLED_APPS:
+            own = [c for c in calls if owned(c[0], app)]
+            # Count only the outermost import_module call per app so nested loads
+            # (e.g. models imported by admin) are not added twice.
+            outer = [c for c in own if not any(owned(parent, app) for parent in c[2])]
+            modules = sorted({c[0] for c in own})
+            rows.append((app, sum(c[1] for c in outer), modules))
+        self.stdout.write(f"{'app':40} {'ms':>8}  modules loaded by Django")
+        for app, elapsed_us, modules in sorted(rows, key=lambda r: -r[1]):
+            short = ', '.join(m[len(app) + 1:] or '(package)' for m in modules)
+            self.stdout.write(f'{app:40} {elapsed_us / 1000:>8.1f}  {short}')
+        self.stdout.write('')
+        self.stdout.write(f"Slowest statement imports (cumulative, top {options['top']}):")
+        for name, cumulative_us in sorted(statement_imports, key=lambda m: -m[1])[:options['top']]:
+            self.stdout.write(f'  {cumulative_us / 1000:>8.1f} ms  {name}')
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(calls) + len(statement_imports)} modules imported, {wall:.0f} ms wall for the boot subprocess'
+        ))
@@ -0,0 +1,102 @@
+import bisect
+import os
+import threading
+
+# Upper bounds (seconds) of the latency histogram buckets, Prometheus style.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class _Series:
+    """Counters for one (view, method, status) combination inside one thread's shard"""
+    __slots__ = ('buckets', 'count', 'duration', 'db_queries', 'db_duration')
+    def __init__(self, size):
+        self.buckets = [0] * size
+        self.count = 0
+        self.duration = 0.0
+        self.db_queries = 0
+        self.db_duration = 0.0
+class RequestMetrics:
+    """
+    Per-process request latency histograms.
+
+    Every thread writes only to its own shard, so recording needs no lock; shards are
+    merged when the metrics are read (scrapes are rare, requests are not).
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+    def observe(self, view, method, status, duration, db_queries=0, db_duration=0.0):
+        shard = self._shard()
+        key = (view, method, status)
+        series = shard.get(key)
+        if series is None:
+            series = shard[key] = _Series(len(self.bounds) + 1)
+        series.buckets[bisect.bisect_left(self.bounds, duration)] += 1
+        series.count += 1
+        series.duration += duration
+        series.db_queries += db_queries
+        series.db_duration += db_duration
+    def snapshot(self):
+        """Merge all shards into {(view, method, status): _Series}."""
+        with self._shards_lock:
+            shards = list(self._shards)
+        merged = {}
+        for shard in shards:
+            for key, series in list(shard.items()):
+                total = merged.get(key)
+                if total is None:
+                    total = merged[key] = _Series(len(self.bounds) + 1)
+                for i, value in enumerate(series.buckets):
+                    total.buckets[i] += value
+                total.count += series.count
+                total.duration += series.duration
+                total.db_queries += series.db_queries
+                total.db_duration += series.db_duration
+        return merged
+    def reset(self):
+        with self._shards_lock:
+            for shard in self._shards:
+                shard.clear()
+    def render_prometheus(self):
+        """Return the metrics in the Prometheus text exposition format (0.0.4)."""
+        snapshot = self.snapshot()
+        pid = os.getpid()
+        lines = [
+            '# HELP http_request_duration_seconds Wall time of requests per resolved view.',
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+        for (view, method, status), series in sorted(snapshot.items()):
+            labels = f'view="{_escape(view)}",method="{method}",status="{status}",pid="{pid}"'
+            cumulative = 0
+            for bound, value in zip(self.bounds, series.buckets):
+                cumulative += value
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {series.count}')
+            lines.append(f'http_request_duration_seconds_sum{{{labels}}} {series.duration:.6f}')
+            lines.append(f'http_request_duration_seconds_count{{{labels}}} {series.count}')
+        lines += [
+            '# HELP http_request_db_queries_total Database queries executed per resolved view.',
+            '# TYPE http_request_db_queries_total counter',
+        ]
+        for (view, method, status), series in sorted(snapshot.items()):
+            labels = f'view="{_escape(view)}",method="{method}",status="{status}",pid="{pid}"'
+            lines.append(f'http_request_db_queries_total{{{labels}}} {series.db_queries}')
+        lines += [
+            '# HELP http_request_db_seconds_total Time spent in database queries per resolved view.',
+            '# TYPE http_request_db_seconds_total counter',
+        ]
+        for (view, method, status), series in sorted(snapshot.items()):
+            labels = f'view="{_escape(view)}",method="{method}",status="{status}",pid="{pid}"'
+            lines.append(f'http_request_db_seconds_total{{{labels}}} {series.db_duration:.6f}')
+        return '\n'.join(lines) + '\n'
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+request_metrics = RequestMetrics()
@@ -0,0 +1,232 @@
+import gzip
+import logging
+import time
+from .db import router
+from .metrics import request_metrics
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from contextvars import ContextVar
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+logger = logging.getLogger('apps.core.requests')
+# The timer of the request being served. A context variable follows the request into
+# sync_to_async threads, which use their own DB connections under ASGI.
+_current_timer = ContextVar('request_query_timer', default=None)
+
+class QueryTimer:
+    """``execute_wrapper`` hook counting queries and the time spent in them"""
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+def _query_hook(execute, sql, params, many, context):
+    timer = _current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+def install_query_hook(sender, connection, **kwargs):
+    # at the bottom of the stack: a connection first opened inside a caller's
+    # ``execute_wrapper()`` block must not have that block's pop() take the hook
+    if _query_hook not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _query_hook)
+connection_created.connect(install_query_hook, dispatch_uid='apps.core.middleware.install_query_hook')
+class RequestTimingMiddleware:
+    """
+    Record wall time, DB query count and DB time for every request.
+
+    Results go into the per-process histograms served by ``/metrics/``, into a
+    ``Server-Timing`` header (when REQUEST_TIMING_HEADER is on) and, for requests
+    slower than REQUEST_SLOW_LOG_MS, into the ``apps.core.requests`` logger.
+    Place it first in MIDDLEWARE so the other middleware are included in the timing.
+    """
+    sync_capable = True
+    async_capable = True
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.emit_header = getattr(settings, 'REQUEST_TIMING_HEADER', True)
+        self.slow_ms = getattr(settings, 'REQUEST_SLOW_LOG_MS', 0)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = QueryTimer()
+        token = _current_timer.set(timer)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+        self._finish(request, response, timer, time.perf_counter() - started)
+        return response
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        token = _current_timer.set(timer)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+        self._finish(request, response, timer, time.perf_counter() - started)
+        return response
+    def _finish(self, request, response, timer, duration):
+        match = getattr(request, 'resolver_match', None)
+        view = (match.view_name or match._func_path) if match else 'unresolved'
+        request_metrics.observe(view, request.method, response.status_code, duration, timer.count, timer.duration)
+        if self.emit_header:
+            response['Server-Timing'] = (
+                f'app;dur={duration * 1000:.1f}, '
+                f'db;dur={timer.duration * 1000:.1f};desc="{timer.count} queries"'
+            )
+        if self.slow_ms and duration * 1000 >= self.slow_ms:
+            logger.warning(
+                f'Slow request {request.method} {request.path} ({view}) -> {response.status_code}: '
+                f'{duration * 1000:.0f} ms, {timer.count} queries, {timer.duration * 1000:.0f} ms in DB'
+            )
+class ReplicaRoutingMiddleware:
+    """
+    Read-your-writes stickiness for PrimaryReplicaRouter.
+
+    Unsafe methods and views with ``use_primary_db = True`` read from the primary
+    for the whole request. After a request that wrote, the client gets a cookie
+    that keeps its reads on the primary for REPLICA_STICKY_SECONDS, longer than
+    the expected replication lag.
+    """
+    sync_capable = True
+    async_capable = True
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.cookie_name = getattr(settings, 'REPLICA_STICKY_COOKIE', 'db_primary')
+        self.sticky_seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+    def _pinned(self, request):
+        return request.method not in self.safe_methods or self.cookie_name in request.COOKIES
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = router.begin_request(self._pinned(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = router.end_request(token)
+        return self._finish(response, wrote)
+    async def __acall__(self, request):
+        token = router.begin_request(self._pinned(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            wrote = router.end_request(token)
+        return self._finish(response, wrote)
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        if getattr(view_func, 'use_primary_db', False) or getattr(view_class, 'use_primary_db', False):
+            router.pin_to_primary()
+    def _finish(self, response, wrote):
+        if wrote and self.sticky_seconds:
+            response.set_cookie(
+                self.cookie_name, '1', max_age=self.sticky_seconds,
+                httponly=True, samesite='Lax', secure=settings.SESSION_COOKIE_SECURE,
+            )
+        return response
+def parse_accept_encoding(header):
+    """Return {coding: q} for an Accept-Encoding header."""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+class CompressionMiddleware:
+    """
+    Brotli/gzip compression negotiated from Accept-Encoding.
+
+    API_COMPRESSION_LEVELS maps content-type prefixes to ``{'br': quality, 'gzip':
+    level}``; other content types, bodies under API_COMPRESSION_MIN_SIZE, streaming
+    responses (WhiteNoise serves its own precompressed files), partial content and
+    responses that already carry a Content-Encoding or ``no-transform`` are left alone.
+    There is no BREACH mitigation (unlike GZipMiddleware's length randomisation), so
+    do not list content types that mix secrets such as CSRF tokens with reflected
+    input, i.e. HTML pages and forms.
+    """
+    sync_capable = True
+    async_capable = True
+    preference = ('br', 'gzip')
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'API_COMPRESSION_MIN_SIZE', 1024)
+        self.levels = getattr(settings, 'API_COMPRESSION_LEVELS', {'application/json': {'gzip': 6}})
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+    def levels_for(self, content_type):
+        content_type = content_type.split(';')[0].strip().lower()
+        for prefix, levels in self.levels.items():
+            if content_type.startswith(prefix):
+                return levels
+        return None
+    def choose_encoding(self, accept_encoding, levels):
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get('*', 0)
+        best, best_q = None, 0
+        for coding in self.preference:
+            if not levels.get(coding) or (coding == 'br' and brotli is None):
+                continue
+            q = accepted.get(coding, wildcard)
+            if q > best_q:
+                best, best_q = coding, q
+        return best
+    def compress(self, request, response):
+        if response.streaming or response.status_code == 206 or response.has_header('Content-Encoding'):
+            return response
+        levels = self.levels_for(response.get('Content-Type', ''))
+        if not levels:
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < self.min_size or 'no-transform' in response.get('Cache-Control', ''):
+            return response
+        coding = self.choose_encoding(request.headers.get('Accept-Encoding', ''), levels)
+        if coding is None:
+            return response
+        if coding == 'br':
+            compressed = brotli.compress(response.content, quality=levels['br'], mode=brotli.MODE_TEXT)
+        else:
+            compressed = gzip.compress(response.content, compresslevel=levels['gzip'], mtime=0)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = coding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # the representation changed, so a strong validator no longer matches
+            response['ETag'] = 'W/' + etag
+        return response
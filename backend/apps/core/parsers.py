@@ -0,0 +1,17 @@
+from .renderers import FastJSONRenderer, orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+class FastJSONParser(JSONParser):
+    """JSONParser backed by orjson (UTF-8 bodies); other charsets or no orjson use DRF's parser."""
+    renderer_class = FastJSONRenderer
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            # orjson rejects NaN/Infinity, which matches STRICT_JSON
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
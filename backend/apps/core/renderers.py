@@ -0,0 +1,46 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to DRF's stdlib renderer
+    orjson = None
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson. The output decodes to the same JSON as DRF's
+    renderer and is byte-identical except for floats in exponent notation: orjson
+    writes ``1e16`` and ``1.5e-7`` where the stdlib writes ``1e+16`` and ``1.5e-07``.
+
+    orjson writes dates, times and datetimes natively in DRF's format ('Z' for UTC,
+    the offset otherwise; only sub-minute offsets such as pre-1946 local mean time
+    are rounded to the minute). Decimals (rendered as numbers when the serializer
+    has not already coerced them to strings) and anything else orjson does not know
+    go through DRF's JSONEncoder. Indented output (browsable API, ``; indent=4``),
+    values orjson rejects and a missing orjson all use the stdlib path. Under
+    STRICT_JSON a NaN renders as null where the stdlib raises.
+    """
+    options = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or not self.compact or self.ensure_ascii or not self.strict:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # keep output a strict JavaScript subset, as DRF does
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+class EventStreamRenderer(FastJSONRenderer):
+    """
+    Lets ``Accept: text/event-stream`` through content negotiation. Streaming views
+    return their own StreamingHttpResponse; only error responses are rendered here,
+    as JSON.
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
@@ -0,0 +1,143 @@
+import functools
+import hashlib
+import threading
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.csrf import csrf_exempt
+from pathlib import Path
+
+_lock = threading.Lock()
+_cached = None
+
+def get_api_info():
+    """OpenAPI ``Info`` block shared by the live and the prebuilt schema."""
+    from drf_yasg import openapi
+    return openapi.Info(
+        title="Daidi Print API",
+        default_version='v1',
+        description="API documentation for Daidi Print",
+        terms_of_service="https://www.daidi-print.com/terms/",
+        contact=openapi.Contact(email="contact@daidi-print.com"),
+        license=openapi.License(name="BSD License"),
+    )
+def get_schema_path():
+    return Path(settings.OPENAPI_SCHEMA_PATH)
+def generate_schema():
+    """Introspect every API view once and return the encoded OpenAPI document (bytes)."""
+    from drf_yasg.codecs import OpenAPICodecJson
+    from drf_yasg.generators import OpenAPISchemaGenerator
+    generator = OpenAPISchemaGenerator(info=get_api_info())
+    swagger = generator.get_schema(request=None, public=True)
+    return OpenAPICodecJson(validators=[]).encode(swagger)
+def write_schema(content, path=None):
+    """Store the document and its sha256 next to it; return the hash."""
+    path = Path(path or get_schema_path())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256(content).hexdigest()
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(content)
+    tmp.replace(path)
+    path.with_name(path.name + '.sha256').write_text(digest, encoding='utf-8')
+    return digest
+def read_schema(path=None):
+    """Return (content, sha256) from disk, or None when no prebuilt file exists."""
+    path = Path(path or get_schema_path())
+    if not path.exists():
+        return None
+    content = path.read_bytes()
+    digest_path = path.with_name(path.name + '.sha256')
+    digest = digest_path.read_text(encoding='utf-8').strip() if digest_path.exists() else ''
+    if not digest:
+        digest = hashlib.sha256(content).hexdigest()
+    return content, digest
+def load_schema():
+    """
+    Return the (content, sha256) pair, generating and storing it on first use.
+    The result is kept in process memory, so the file is read at most once per worker.
+    """
+    global _cached
+    if _cached is None:
+        with _lock:
+            if _cached is None:
+                cached = read_schema()
+                if cached is None:
+                    content = generate_schema()
+                    cached = (content, write_schema(content))
+                _cached = cached
+    return _cached
+def reset_schema_cache():
+    global _cached
+    _cached = None
+def schema_json_view(request):
+    """Serve the prebuilt OpenAPI document with an ETag and long-lived cache headers."""
+    content, digest = load_schema()
+    etag = f'"{digest}"'
+    if request.GET.get('v') == digest:
+        max_age = 60 * 60 * 24 * 365
+    else:
+        max_age = settings.OPENAPI_SCHEMA_MAX_AGE
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(content, content_type='application/json; charset=utf-8')
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=max_age)
+    return response
+@functools.lru_cache(maxsize=None)
+def get_ui_renderer_class(ui):
+    """drf_yasg UI renderer whose spec URL is taken from the renderer context."""
+    from drf_yasg.renderers import ReDocRenderer, SwaggerUIRenderer
+    if ui == 'swagger':
+        class PrebuiltSwaggerUIRenderer(SwaggerUIRenderer):
+            def set_context(self, renderer_context, swagger=None):
+                self.spec_url = renderer_context['spec_url']
+                super().set_context(renderer_context, swagger)
+            def get_swagger_ui_settings(self):
+                return {**super().get_swagger_ui_settings(), 'url': self.spec_url}
+        return PrebuiltSwaggerUIRenderer
+    class PrebuiltReDocRenderer(ReDocRenderer):
+        def set_context(self, renderer_context, swagger=None):
+            self.spec_url = renderer_context['spec_url']
+            super().set_context(renderer_context, swagger)
+        def get_redoc_settings(self):
+            return {**super().get_redoc_settings(), 'url': self.spec_url}
+    return PrebuiltReDocRenderer
+def schema_ui_view(ui):
+    """
+    Build a view rendering the drf_yasg ``swagger`` or ``redoc`` page against the
+    prebuilt document instead of generating the schema on every page load.
+    """
+    def view(request):
+        from drf_yasg import openapi
+        _content, digest = load_schema()
+        renderer_context = {
+            'request': request,
+            'spec_url': f"{reverse('schema-json')}?v={digest}",
+        }
+        stub = openapi.Swagger(info=get_api_info(), _prefix='/', paths=openapi.Paths({}))
+        html = get_ui_renderer_class(ui)().render(stub, renderer_context=renderer_context)
+        response = HttpResponse(html, content_type='text/html; charset=utf-8')
+        patch_cache_control(response, public=True, max_age=settings.OPENAPI_SCHEMA_MAX_AGE)
+        return response
+    return view
+def live_schema_view(ui=None):
+    """
+    drf_yasg's per-request schema view, built on the first hit so the docs stack
+    (drf_yasg, swagger_spec_validator, jsonschema, ...) is not imported at worker boot.
+    """
+    view = None
+    def lazy_view(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            from drf_yasg.views import get_schema_view
+            from rest_framework import permissions
+            schema_view = get_schema_view(
+                get_api_info(),
+                public=True,
+                permission_classes=(permissions.AllowAny,),
+            )
+            view = schema_view.with_ui(ui, cache_timeout=0) if ui else schema_view.without_ui(cache_timeout=0)
+        return view(request, *args, **kwargs)
+    return csrf_exempt(lazy_view)
@@ -0,0 +1,141 @@
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.utils import timezone
+from functools import lru_cache
+from rest_framework import ISO_8601, serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+
+# Fields whose to_representation is a no-op for the value the database returns.
+PASSTHROUGH_FIELDS = (serializers.CharField, serializers.IntegerField, serializers.ReadOnlyField)
+def _is_passthrough(field):
+    for field_class in PASSTHROUGH_FIELDS:
+        if isinstance(field, field_class):
+            return type(field).to_representation is field_class.to_representation
+    return False
+def _datetime_converter(field):
+    """DateTimeField.to_representation with the timezone looked up once per response, not per value."""
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+    def convert(value):
+        if isinstance(value, str) or not timezone.is_aware(value):
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+class ValuesSerializer:
+    """
+    Read-only fast path for a ModelSerializer's list output.
+
+    Rows are fetched with ``values_list()`` for exactly the serializer's readable
+    fields and mapped through converters compiled once: plain char/integer fields
+    pass through, foreign keys read the ``*_id`` column (what PrimaryKeyRelatedField
+    renders), datetimes resolve the active timezone once per call and every other
+    field reuses its own bound ``to_representation``, so the output is identical
+    to ``serializer_class(queryset, many=True).data``.
+    Fields that need the model instance (method fields, nested serializers, dotted
+    sources) raise ImproperlyConfigured when the fast path is built.
+    """
+    def __init__(self, serializer_class, fields=None):
+        serializer = serializer_class()
+        model = serializer_class.Meta.model
+        self.names, self.lookups, converters, self.datetime_fields = [], [], [], {}
+        for name, field in serializer.fields.items():
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+            self.names.append(name)
+            self.lookups.append(self._lookup(model, name, field))
+            if isinstance(field, serializers.DateTimeField):
+                self.datetime_fields[len(converters)] = field
+            converters.append(None if _is_passthrough(field) or isinstance(field, serializers.PrimaryKeyRelatedField)
+                              else field.to_representation)
+        self.converters = tuple(converters)
+    @staticmethod
+    def _lookup(model, name, field):
+        source = field.source
+        if source == '*' or '.' in source or isinstance(field, (serializers.SerializerMethodField, serializers.BaseSerializer)):
+            raise ImproperlyConfigured(f'{name}: {type(field).__name__} needs model instances')
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            raise ImproperlyConfigured(f'{name}: {source!r} is not a model field')
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            if field.pk_field is not None or not model_field.many_to_one:
+                raise ImproperlyConfigured(f'{name}: only plain foreign keys are supported')
+            return model_field.attname
+        if model_field.is_relation:
+            raise ImproperlyConfigured(f'{name}: {type(field).__name__} on a relation needs model instances')
+        return source
+    def values(self, queryset):
+        return queryset.values_list(*self.lookups)
+    def to_representation(self, rows):
+        converters = list(self.converters)
+        for index, field in self.datetime_fields.items():
+            converters[index] = _datetime_converter(field)
+        items = tuple(zip(self.names, converters))
+        return [
+            {name: value if convert is None or value is None else convert(value)
+             for (name, convert), value in zip(items, row)}
+            for row in rows
+        ]
+@lru_cache(maxsize=256)
+def values_serializer(serializer_class, fields=None):
+    """Cached ValuesSerializer for ``serializer_class`` (optionally a subset of ``fields``)."""
+    return ValuesSerializer(serializer_class, fields)
+def _split(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+def parse_sparse_fields(request, available):
+    """
+    Return the field names selected by ``?fields=a,b`` and/or ``?omit=c`` as a
+    frozenset, or None when the request does not narrow the output (no parameters,
+    or not a GET/HEAD). Unknown names raise a ValidationError (400).
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    params = getattr(request, 'query_params', request.GET)
+    fields, omit = _split(params.get('fields', '')), _split(params.get('omit', ''))
+    if not fields and not omit:
+        return None
+    unknown = sorted(set(fields + omit) - set(available))
+    if unknown:
+        raise serializers.ValidationError({
+            'fields': [f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(available)}."],
+        })
+    return frozenset(fields or available) - frozenset(omit)
+@lru_cache(maxsize=None)
+def readable_fields(serializer_class):
+    """Names of the fields ``serializer_class`` outputs, in declaration order."""
+    return tuple(name for name, field in serializer_class().fields.items() if not field.write_only)
+def only_columns(queryset, serializer_class, fields):
+    """
+    ``queryset.only()`` the model fields behind ``fields``; left unchanged when a
+    selected field is not a plain model column (it may need other attributes).
+    """
+    model = queryset.model
+    serializer_fields = serializer_class().fields
+    columns = []
+    for name in fields:
+        source = serializer_fields[name].source
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            return queryset
+        if not model_field.concrete or model_field.many_to_many:
+            return queryset
+        columns.append(model_field.name)
+    return queryset.only(*columns)
+class SparseFieldsMixin:
+    """
+    Serializer mixin for ``?fields=id,name`` / ``?omit=description``: the top-level
+    serializer of a GET request drops the other fields before serializing.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None:
+            return
+        selected = parse_sparse_fields(request, readable_fields(type(self)))
+        if selected is not None:
+            for name in [name for name in self.fields if name not in selected]:
+                self.fields.pop(name)
@@ -0,0 +1,100 @@
+import csv
+import re
+import zipfile
+from itertools import islice
+from pathlib import Path
+from xml.etree.ElementTree import iterparse
+
+NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+CELL_REF_RE = re.compile(r'([A-Z]+)')
+
+def iter_csv_rows(path, delimiter=','):
+    """Rows of a CSV file as lists of strings; the file is read line by line (BOM from Excel is dropped)."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        yield from csv.reader(f, delimiter=delimiter)
+def _column_index(ref):
+    index = 0
+    for char in CELL_REF_RE.match(ref).group(1):
+        index = index * 26 + ord(char) - 64
+    return index - 1
+def _shared_strings(archive):
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return []
+    strings = []
+    with archive.open('xl/sharedStrings.xml') as f:
+        for _event, element in iterparse(f):
+            if element.tag == NS + 'si':
+                strings.append(''.join(t.text or '' for t in element.iter(NS + 't')))
+                element.clear()
+    return strings
+def _sheet_path(archive, sheet=None):
+    """Archive path of ``sheet`` (name or 0-based index; default the first sheet)."""
+    with archive.open('xl/workbook.xml') as f:
+        sheets = [(s.get('name'), s.get(REL_NS + 'id')) for _e, s in iterparse(f) if s.tag == NS + 'sheet']
+    with archive.open('xl/_rels/workbook.xml.rels') as f:
+        targets = {r.get('Id'): r.get('Target') for _e, r in iterparse(f) if r.tag.endswith('Relationship')}
+    if isinstance(sheet, str) and not sheet.isdigit():
+        matches = [rel for name, rel in sheets if name == sheet]
+        if not matches:
+            raise ValueError(f"Sheet {sheet!r} not found; available: {', '.join(name for name, _rel in sheets)}")
+        rel = matches[0]
+    else:
+        rel = sheets[int(sheet or 0)][1]
+    target = targets[rel].lstrip('/')
+    return target if target.startswith('xl/') else f'xl/{target}'
+def iter_xlsx_rows(path, sheet=None):
+    """
+    Rows of an XLSX sheet as lists of strings, parsed incrementally from the zip
+    (only the shared-strings table is held in memory). Empty cells are ''.
+    """
+    with zipfile.ZipFile(path) as archive:
+        strings = _shared_strings(archive)
+        with archive.open(_sheet_path(archive, sheet)) as f:
+            sheet_data = None
+            for event, element in iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    if element.tag == NS + 'sheetData':
+                        sheet_data = element
+                    continue
+                if element.tag != NS + 'row':
+                    continue
+                row = []
+                for cell in element.iter(NS + 'c'):
+                    kind, value = cell.get('t'), cell.find(NS + 'v')
+                    if kind == 'inlineStr':
+                        text = ''.join(t.text or '' for t in cell.iter(NS + 't'))
+                    elif value is None or value.text is None:
+                        text = ''
+                    elif kind == 's':
+                        text = strings[int(value.text)]
+                    elif kind == 'b':
+                        text = 'true' if value.text == '1' else 'false'
+                    else:
+                        text = value.text
+                    if cell.get('r'):
+                        row.extend([''] * (_column_index(cell.get('r')) - len(row)))
+                    row.append(text)
+                # drop parsed rows so memory stays flat however long the sheet is
+                sheet_data.clear()
+                yield row
+def iter_rows(path, sheet=None, delimiter=','):
+    """Rows of a .csv or .xlsx file, chosen by extension."""
+    suffix = Path(path).suffix.lower()
+    if suffix == '.xlsx':
+        return iter_xlsx_rows(path, sheet)
+    if suffix in ('.csv', '.tsv', '.txt'):
+        return iter_csv_rows(path, '\t' if suffix == '.tsv' else delimiter)
+    raise ValueError(f'Unsupported file type {suffix!r}: use .csv, .tsv or .xlsx')
+def iter_records(rows):
+    """(line number, {header: value}) for every non-empty row after the header row."""
+    rows = iter(rows)
+    header = [name.strip() for name in next(rows, [])]
+    for number, row in enumerate(rows, 2):
+        if any(value.strip() for value in row):
+            yield number, dict(zip(header, (value.strip() for value in row)))
+def chunked(iterable, size):
+    """Lists of at most ``size`` items, without materializing ``iterable``."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
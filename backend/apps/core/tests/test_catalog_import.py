@@ -0,0 +1,94 @@
+import zipfile
+from decimal import Decimal
+import pytest
+from apps.core.catalog_import import TARGETS, import_catalog
+from apps.core.tabular import iter_xlsx_rows
+from apps.services.models import Service
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = pytest.mark.django_db
+SERVICES = TARGETS['services']
+CSV = '''name,slug,price,description,is_active
+Business cards,business-cards,"1,250,000",Offset,true
+Banner,,۳۵۰۰۰۰,,false
+Broken,broken,not-a-number,,true
+,,100,,true
+'''
+
+def write_xlsx(path, rows):
+    """A minimal XLSX: shared strings for text, inline numbers, one sheet."""
+    strings, sheet_rows = [], []
+    for r, row in enumerate(rows, 1):
+        cells = []
+        for c, value in enumerate(row):
+            ref = f'{chr(65 + c)}{r}'
+            if isinstance(value, str):
+                strings.append(value)
+                cells.append(f'<c r="{ref}" t="s"><v>{len(strings) - 1}</v></c>')
+            elif value is not None:
+                cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+        sheet_rows.append(f'<row r="{r}">{"".join(cells)}</row>')
+    main = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+    rel = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('xl/workbook.xml', f'<workbook xmlns="{main}" xmlns:r="{rel}"><sheets>'
+                         f'<sheet name="Prices" sheetId="1" r:id="rId1"/></sheets></workbook>')
+        archive.writestr('xl/_rels/workbook.xml.rels', '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                         '<Relationship Id="rId1" Target="worksheets/sheet1.xml"/></Relationships>')
+        archive.writestr('xl/sharedStrings.xml', f'<sst xmlns="{main}">' + ''.join(f'<si><t>{s}</t></si>' for s in strings) + '</sst>')
+        archive.writestr('xl/worksheets/sheet1.xml', f'<worksheet xmlns="{main}"><sheetData>{"".join(sheet_rows)}</sheetData></worksheet>')
+@pytest.fixture
+def price_list(tmp_path):
+    path = tmp_path / 'services.csv'
+    path.write_text(CSV, encoding='utf-8-sig')
+    return path
+def test_csv_import_creates_and_reports_errors(price_list):
+    stats = import_catalog(price_list, SERVICES, batch_size=2)
+    assert (stats.rows, stats.created, stats.updated, stats.unchanged) == (4, 2, 0, 0)
+    assert [line for line, _detail in stats.errors] == [4, 5]
+    assert 'price' in stats.errors[0][1] and 'name' in stats.errors[1][1]
+    cards, banner = Service.objects.get(slug='business-cards'), Service.objects.get(slug='banner')
+    assert (cards.price, cards.description, cards.is_active) == (Decimal('1250000'), 'Offset', True)
+    assert (banner.price, banner.is_active) == (Decimal('350000'), False)
+def test_reimport_unchanged_file_writes_nothing(price_list):
+    import_catalog(price_list, SERVICES)
+    with CaptureQueriesContext(connection) as ctx:
+        stats = import_catalog(price_list, SERVICES)
+    assert (stats.created, stats.updated, stats.unchanged) == (0, 0, 2)
+    assert [q['sql'].split()[0] for q in ctx.captured_queries] == ['SELECT']
+def test_changed_rows_are_updated(price_list, tmp_path):
+    import_catalog(price_list, SERVICES)
+    before = Service.objects.get(slug='banner').updated_at
+    changed = tmp_path / 'changed.csv'
+    changed.write_text('نام,اسلاگ,قیمت\nBanner XL,banner,400000\nFlyer,flyer,90000\n', encoding='utf-8')
+    stats = import_catalog(changed, SERVICES)
+    assert (stats.created, stats.updated, stats.unchanged) == (1, 1, 0)
+    banner = Service.objects.get(slug='banner')
+    assert (banner.name, banner.price, banner.is_active) == ('Banner XL', Decimal('400000'), False)
+    assert banner.updated_at > before
+def test_persian_names_get_ascii_slugs(tmp_path):
+    path = tmp_path / 'fa.csv'
+    path.write_text('نام,قیمت\nچاپ بنر,۱۲٬۰۰۰\nچاپ بنر,۱۵٬۰۰۰\nچوپ بنر,۹۰۰۰\n', encoding='utf-8')
+    stats = import_catalog(path, SERVICES)
+    assert not stats.errors and stats.created == 2  # the repeated name is one row: the later price wins
+    assert import_catalog(path, SERVICES).unchanged == 2
+    banner = Service.objects.get(name='چاپ بنر')
+    assert banner.slug.startswith('chap-bnr-') and banner.slug.isascii() and banner.price == Decimal('15000')
+    assert Service.objects.get(name='چوپ بنر').slug != banner.slug  # same letters without vowels
+def test_xlsx_import(tmp_path):
+    path = tmp_path / 'prices.xlsx'
+    write_xlsx(path, [['name', 'slug', 'price', 'description'], ['Sticker', 'sticker', 15000, None], [None, None, None, None],
+                      ['Label', 'label', 20000, 'Roll']])
+    assert list(iter_xlsx_rows(path, 'Prices'))[1] == ['Sticker', 'sticker', '15000']
+    stats = import_catalog(path, SERVICES)
+    assert (stats.rows, stats.created, stats.errors) == (2, 2, [])
+    assert Service.objects.get(slug='label').description == 'Roll'
+def test_command(price_list, tmp_path, capsys):
+    errors = tmp_path / 'errors.csv'
+    call_command('import_catalog', str(price_list), '--dry-run', '--errors', str(errors))
+    out = capsys.readouterr()
+    assert '[dry run] 4 rows' in out.out and '2 created' in out.out and 'line 4: price' in out.err
+    assert not Service.objects.exists()
+    assert errors.read_text(encoding='utf-8').splitlines()[1].startswith('4,price,')
@@ -0,0 +1,64 @@
+import gzip
+import json
+import brotli
+import pytest
+from apps.core.middleware import CompressionMiddleware, parse_accept_encoding
+from django.http import FileResponse, HttpResponse, JsonResponse
+from django.test import RequestFactory
+
+PAYLOAD = {'results': [{'id': i, 'name': f'Service {i}', 'description': 'Offset printing ' * 5} for i in range(50)]}
+
+@pytest.fixture(autouse=True)
+def compression_settings(settings):
+    settings.API_COMPRESSION_MIN_SIZE = 1024
+    settings.API_COMPRESSION_LEVELS = {'application/json': {'br': 4, 'gzip': 6}, 'text/plain': {'gzip': 6}}
+def serve(response, accept_encoding='gzip, deflate, br'):
+    middleware = CompressionMiddleware(lambda request: response)
+    return middleware(RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding))
+@pytest.mark.parametrize('header, expected', [
+    ('gzip, deflate, br', {'gzip': 1.0, 'deflate': 1.0, 'br': 1.0}),
+    ('br;q=0.5, gzip;q=0.8', {'br': 0.5, 'gzip': 0.8}),
+    ('gzip;q=bogus, *', {'gzip': 0.0, '*': 1.0}),
+    ('', {}),
+])
+def test_parse_accept_encoding(header, expected):
+    assert parse_accept_encoding(header) == expected
+def test_prefers_brotli():
+    response = serve(JsonResponse(PAYLOAD))
+    assert response['Content-Encoding'] == 'br'
+    assert json.loads(brotli.decompress(response.content)) == PAYLOAD
+    assert response['Content-Length'] == str(len(response.content))
+    assert 'Accept-Encoding' in response['Vary']
+def test_gzip_when_brotli_not_accepted_or_ranked_lower():
+    for header in ('gzip', 'br;q=0.2, gzip;q=0.9'):
+        response = serve(JsonResponse(PAYLOAD), header)
+        assert response['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(response.content)) == PAYLOAD
+def test_per_content_type_levels():
+    response = serve(HttpResponse('metric 1\n' * 500, content_type='text/plain'))
+    assert response['Content-Encoding'] == 'gzip'
+    assert not serve(HttpResponse('<p>x</p>' * 500)).has_header('Content-Encoding')
+def test_html_is_not_compressed_by_default():
+    from config import settings as project_settings
+    assert not any(prefix.startswith('text/html') for prefix in project_settings.API_COMPRESSION_LEVELS)
+@pytest.mark.parametrize('response, header', [
+    (JsonResponse({'small': True}), 'br'),
+    (JsonResponse(PAYLOAD), 'identity'),
+    (JsonResponse(PAYLOAD), 'br;q=0, gzip;q=0'),
+])
+def test_left_uncompressed(response, header):
+    assert not serve(response, header).has_header('Content-Encoding')
+def test_skips_streaming_precompressed_and_no_transform(tmp_path):
+    path = tmp_path / 'data.json'
+    path.write_text(json.dumps(PAYLOAD))
+    assert not serve(FileResponse(path.open('rb'), content_type='application/json')).has_header('Content-Encoding')
+    already = JsonResponse(PAYLOAD)
+    already['Content-Encoding'] = 'identity'
+    assert serve(already)['Content-Encoding'] == 'identity'
+    no_transform = JsonResponse(PAYLOAD)
+    no_transform['Cache-Control'] = 'no-transform'
+    assert not serve(no_transform).has_header('Content-Encoding')
+def test_strong_etag_is_weakened():
+    response = JsonResponse(PAYLOAD)
+    response['ETag'] = '"abc"'
+    assert serve(response)['ETag'] == 'W/"abc"'
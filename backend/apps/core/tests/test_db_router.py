@@ -0,0 +1,69 @@
+import pytest
+from apps.core.db.router import PrimaryReplicaRouter, pin_to_primary, use_primary
+from apps.core.middleware import ReplicaRoutingMiddleware
+from apps.orders.models import Order
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+router = PrimaryReplicaRouter()
+
+@pytest.fixture(autouse=True)
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ['replica1']
+    settings.REPLICA_STICKY_SECONDS = 5
+def run(request, view=None):
+    """Serve ``request`` through the middleware; returns (response, read alias seen by the view)."""
+    seen = {}
+    def get_response(request):
+        match = view or (lambda request: None)
+        middleware.process_view(request, match, (), {})
+        seen['read'] = router.db_for_read(Order)
+        if request.method == 'POST':
+            seen['write'] = router.db_for_write(Order)
+            seen['read_after_write'] = router.db_for_read(Order)
+        return HttpResponse()
+    middleware = ReplicaRoutingMiddleware(get_response)
+    return middleware(request), seen
+def test_reads_go_to_replica_and_writes_to_primary():
+    assert router.db_for_read(Order) == 'replica1'
+    assert router.db_for_write(Order) == 'default'
+    assert not router.allow_migrate('replica1', 'orders')
+def test_without_replicas_everything_uses_primary(settings):
+    settings.DATABASE_REPLICAS = []
+    assert router.db_for_read(Order) == 'default'
+@pytest.mark.django_db
+def test_reads_inside_transaction_use_primary():
+    with transaction.atomic():
+        assert router.db_for_read(Order) == 'default'
+def test_use_primary_block():
+    with use_primary():
+        assert router.db_for_read(Order) == 'default'
+    assert router.db_for_read(Order) == 'replica1'
+def test_get_request_reads_from_replica_without_sticky_cookie():
+    response, seen = run(RequestFactory().get('/'))
+    assert seen['read'] == 'replica1'
+    assert 'db_primary' not in response.cookies
+def test_write_pins_request_and_sets_sticky_cookie():
+    response, seen = run(RequestFactory().post('/'))
+    assert seen['read'] == 'default'
+    assert seen['read_after_write'] == 'default'
+    assert response.cookies['db_primary']['max-age'] == 5
+def test_sticky_cookie_keeps_following_reads_on_primary():
+    request = RequestFactory().get('/')
+    request.COOKIES['db_primary'] = '1'
+    _response, seen = run(request)
+    assert seen['read'] == 'default'
+def test_view_can_opt_into_primary():
+    def view(request):
+        pass
+    view.use_primary_db = True
+    _response, seen = run(RequestFactory().get('/'), view)
+    assert seen['read'] == 'default'
+def test_pin_to_primary_outside_request_is_noop():
+    pin_to_primary()
+    assert router.db_for_read(Order) == 'replica1'
+@override_settings(REPLICA_STICKY_SECONDS=0)
+def test_stickiness_can_be_disabled():
+    response, _seen = run(RequestFactory().post('/'))
+    assert 'db_primary' not in response.cookies
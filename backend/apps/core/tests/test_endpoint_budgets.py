@@ -0,0 +1,219 @@
+"""
+Query-count and latency budgets for every route in ``config/api_urls.py``.
+
+The module seeds realistic volumes once (thousands of users, services and orders),
+then calls each endpoint through the test client and fails when it runs more
+queries than its budget or is slower than its latency ceiling. New routes must be
+added to ``BUDGETS``; ``test_every_api_route_has_a_budget`` enforces it.
+
+Query budgets are always enforced. Wall-clock timings are too noisy on shared CI
+to fail a build, so latency ceilings are only checked when PERF_LATENCY_FACTOR is
+set (1 = as written, higher for slower machines); PERF_SEED_SCALE scales the
+seeded volumes.
+"""
+import gc
+import itertools
+import os
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+import pytest
+from apps.newsletter.models import Subscriber
+from apps.orders.models import Order
+from apps.portfolio.models import PortfolioItem
+from apps.services.models import Service
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+pytestmark = pytest.mark.slow
+User = get_user_model()
+SCALE = float(os.environ.get('PERF_SEED_SCALE', 1))
+LATENCY_FACTOR = float(os.environ['PERF_LATENCY_FACTOR']) if os.environ.get('PERF_LATENCY_FACTOR') else None
+N_USERS = int(2000 * SCALE)
+N_SERVICES = int(1500 * SCALE)
+N_ORDERS = int(6000 * SCALE)
+N_SUBSCRIBERS = int(2000 * SCALE)
+N_PORTFOLIO = int(500 * SCALE)
+PASSWORD = 'Perf-pass-123'
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+STATUSES = [choice for choice, _label in Order.STATUS_CHOICES]
+_unique = itertools.count()
+
+@dataclass
+class Budget:
+    method: str
+    path: str
+    max_queries: int
+    max_ms: float
+    status: int = 200
+    auth: str = None  # None, 'user' or 'admin'
+    data: dict = field(default=None)
+    format: str = 'json'
+BUDGETS = {
+    'api-root': Budget('get', '/api/v1/', 0, 50),
+    'rest_framework:login': Budget('get', '/api/v1/auth/login/', 0, 100),
+    'rest_framework:logout': Budget('post', '/api/v1/auth/logout/', 0, 100),
+    'token_obtain_pair': Budget('post', '/api/v1/token/obtain/', 1, 150, data={'email': '{user_email}', 'password': PASSWORD}),
+    'token_refresh': Budget('post', '/api/v1/token/refresh/', 0, 50, data={'refresh': '{refresh}'}),
+    'accounts:register': Budget('post', '/api/v1/accounts/register/', 2, 150, status=201, data={
+        'email': 'new-user-{unique}@example.com', 'password': 'Sup3r-secret-pw', 'password2': 'Sup3r-secret-pw',
+        'first_name': 'New', 'last_name': 'User',
+    }),
+    'accounts:token_obtain_pair': Budget('post', '/api/v1/accounts/token/', 1, 150, data={'email': '{user_email}', 'password': PASSWORD}),
+    'accounts:token_refresh': Budget('post', '/api/v1/accounts/token/refresh/', 0, 50, data={'refresh': '{refresh}'}),
+    'accounts:logout': Budget('post', '/api/v1/accounts/logout/', 1, 50, auth='user', data={'refresh': '{refresh}'}),
+    'accounts:profile': Budget('get', '/api/v1/accounts/profile/', 1, 50, auth='user'),
+    'accounts:change_password': Budget('post', '/api/v1/accounts/change-password/', 2, 150, auth='user', data={
+        'old_password': PASSWORD, 'new_password': PASSWORD,
+    }),
+    'product-list': Budget('get', '/api/v1/products/', 0, 50),
+    'product-detail': Budget('get', '/api/v1/products/some-product/', 0, 50, status=404),
+    'product-calculate-price': Budget('post', '/api/v1/products/1/calculate_price/', 0, 50, data={'quantity': 3, 'base_price': 1000}),
+    'product-reviews': Budget('post', '/api/v1/products/1/reviews/', 0, 50, status=201, data={'rating': 5, 'comment': 'great'}),
+    'category-list': Budget('get', '/api/v1/categories/', 0, 50),
+    'category-detail': Budget('get', '/api/v1/categories/business-cards/', 0, 50),
+    'category-products': Budget('get', '/api/v1/categories/business-cards/products/', 0, 50),
+    'file-upload': Budget('post', '/api/v1/files/upload/', 0, 100, status=201, format='multipart', data={'file': 'upload'}),
+    'services:service-list': Budget('get', '/api/v1/services/', 2, 100),
+    'services:service-active': Budget('get', '/api/v1/services/active/', 1, 500),
+    'services:service-detail': Budget('get', '/api/v1/services/service-1/', 1, 50),
+    'portfolio-list': Budget('get', '/api/v1/portfolio/?category=labels', 1, 50),
+    'portfolio-detail': Budget('get', '/api/v1/portfolio/{portfolio_id}/', 1, 50),
+    'order-list': Budget('get', '/api/v1/orders/', 3, 100, auth='user'),
+    'order-detail': Budget('get', '/api/v1/orders/{order_id}/', 2, 50, auth='user'),
+    # the test client is WSGI, where the view refuses to stream (ASGI serves it from EventStreamApp)
+    'order-events': Budget('get', '/api/v1/orders/events/', 1, 50, status=503, auth='user'),
+    'order-cancel': Budget('post', '/api/v1/orders/{order_id}/cancel/', 4, 100, auth='user'),
+    'contact-create': Budget('post', '/api/v1/contact/', 0, 50, status=201, data={'name': 'A', 'message': 'Hello'}),
+    'newsletter:subscribe': Budget('post', '/api/v1/newsletter/subscribe/', 4, 100, status=201, data={'email': 'fresh-{unique}@example.com'}),
+    'newsletter:unsubscribe': Budget('post', '/api/v1/newsletter/unsubscribe/', 1, 50, data={'email': 'subscriber-1@example.com'}),
+    'newsletter:subscribers': Budget('get', '/api/v1/newsletter/subscribers/', 3, 100, auth='admin'),
+    'health': Budget('get', '/api/v1/health/', 1, 50),
+    'schema-json': Budget('get', '/api/openapi.json', 0, 3000),
+    'schema-swagger-ui': Budget('get', '/api/swagger/', 0, 3000),
+    'schema-redoc': Budget('get', '/api/redoc/', 0, 3000),
+}
+def iter_routes(resolver, namespace=None):
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            ns = namespace
+            if pattern.namespace:
+                ns = f'{namespace}:{pattern.namespace}' if namespace else pattern.namespace
+            yield from iter_routes(pattern, ns)
+        elif isinstance(pattern, URLPattern):
+            yield f'{namespace}:{pattern.name}' if namespace and pattern.name else pattern.name
+@pytest.fixture(scope='module')
+def perf_data(django_db_setup, django_db_blocker):
+    """Seed the test database once for the whole module and clean it up afterwards."""
+    with django_db_blocker.unblock(), override_settings(PASSWORD_HASHERS=FAST_HASHERS):
+        password = make_password(PASSWORD)
+        User.objects.bulk_create(
+            [User(email=f'user-{i}@example.com', password=password, first_name='U', last_name=str(i)) for i in range(N_USERS)],
+            batch_size=1000,
+        )
+        User.objects.create_superuser('admin@example.com', PASSWORD)
+        users = list(User.objects.values_list('pk', flat=True))
+        Service.objects.bulk_create(
+            [
+                Service(name=f'Service {i}', slug=f'service-{i}', description='x' * 200,
+                        price=Decimal(100000 + i), is_active=i % 5 != 0)
+                for i in range(N_SERVICES)
+            ],
+            batch_size=1000,
+        )
+        Order.objects.bulk_create(
+            [
+                Order(user_id=users[i % len(users)], product_name=f'Product {i % 50}', product_id=i % 50,
+                      quantity=1 + i % 20, total_price=Decimal('1500.00') * (1 + i % 20),
+                      status=STATUSES[i % len(STATUSES)])
+                for i in range(N_ORDERS)
+            ],
+            batch_size=1000,
+        )
+        Subscriber.objects.bulk_create(
+            [Subscriber(email=f'subscriber-{i}@example.com') for i in range(N_SUBSCRIBERS)],
+            batch_size=1000,
+        )
+        PortfolioItem.objects.bulk_create(
+            [
+                PortfolioItem(title=f'Work {i}', slug=f'work-{i}', category=('labels', 'boxes', 'banners')[i % 3],
+                              image=f'portfolio/work-{i}.jpg', width=1200, height=800 + i % 400,
+                              dominant_color='#c81e1e', placeholder='data:image/png;base64,' + 'A' * 200)
+                for i in range(N_PORTFOLIO)
+            ],
+            batch_size=1000,
+        )
+        user = User.objects.get(email='user-0@example.com')
+        Order.objects.bulk_create(
+            [Order(user=user, product_name='Bulk', total_price=Decimal('99.00'), status='pending') for _ in range(200)],
+        )
+        yield {'user': user, 'admin': User.objects.get(email='admin@example.com')}
+        Order.objects.all().delete()
+        PortfolioItem.objects.all().delete()
+        Subscriber.objects.all().delete()
+        Service.objects.all().delete()
+        User.objects.all().delete()
+@pytest.fixture(autouse=True)
+def fast_hashing_and_storage(settings, tmp_path):
+    settings.PASSWORD_HASHERS = FAST_HASHERS
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.OPENAPI_SCHEMA_PATH = str(tmp_path / 'openapi.json')
+    settings.THROTTLE_SQLITE_PATH = str(tmp_path / 'throttle.sqlite3')
+    # the denylist filter is loaded on the warm-up call; later requests must not re-read it
+    settings.JWT_DENYLIST_REFRESH_SECONDS = 3600
+def build_request(budget, perf_data):
+    user = perf_data['user']
+    refresh = RefreshToken.for_user(user)
+    order_id = Order.objects.filter(user=user, status='pending').values_list('pk', flat=True).first()
+    portfolio_id = PortfolioItem.objects.values_list('pk', flat=True).first()
+    values = {'user_email': user.email, 'refresh': str(refresh), 'order_id': order_id, 'portfolio_id': portfolio_id,
+              'unique': next(_unique)}
+    client = APIClient()
+    if budget.auth:
+        token = RefreshToken.for_user(perf_data[budget.auth]).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    data = None
+    if budget.data is not None:
+        data = {k: v.format(**values) if isinstance(v, str) else v for k, v in budget.data.items()}
+    if budget.format == 'multipart':
+        data = {'file': SimpleUploadedFile('proof.pdf', b'%PDF-1.4 ' + b'0' * 4096, content_type='application/pdf')}
+    return client, budget.path.format(**values), data
+def test_every_api_route_has_a_budget():
+    names = set(iter_routes(get_resolver('config.api_urls')))
+    missing = sorted(names - set(BUDGETS))
+    assert not missing, f'Add query/latency budgets for: {missing}'
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', sorted(BUDGETS))
+def test_endpoint_budget(name, perf_data):
+    budget = BUDGETS[name]
+    client, path, data = build_request(budget, perf_data)
+    kwargs = {'format': budget.format} if data is not None else {}
+    # warm-up call: URLconf, templates, lazy imports and the prebuilt schema
+    getattr(client, budget.method)(path, data, **kwargs) if data is not None else getattr(client, budget.method)(path)
+    client, path, data = build_request(budget, perf_data)
+    # start from a clean heap so a collection triggered by earlier tests' garbage
+    # is not billed to this endpoint
+    gc.collect()
+    with CaptureQueriesContext(connection) as ctx:
+        started = time.perf_counter()
+        if data is not None:
+            response = getattr(client, budget.method)(path, data, **kwargs)
+        else:
+            response = getattr(client, budget.method)(path)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    assert response.status_code == budget.status, response.content[:500]
+    queries = [q['sql'] for q in ctx.captured_queries]
+    assert len(queries) <= budget.max_queries, (
+        f'{name}: {len(queries)} queries > budget {budget.max_queries}:\n' + '\n'.join(queries)
+    )
+    if LATENCY_FACTOR is None:
+        return
+    ceiling = budget.max_ms * LATENCY_FACTOR
+    assert elapsed_ms <= ceiling, f'{name}: {elapsed_ms:.0f} ms > ceiling {ceiling:.0f} ms'
@@ -0,0 +1,77 @@
+import json
+import pytest
+from apps.orders.batching import GangPlanner, PrintItem, pack, plan_group
+from apps.orders.models import Order, OrderItem
+from django.core.management import call_command
+
+def item(pk, w, h, qty, paper='coated-300', lamination=False, uv=False):
+    return PrintItem(pk, 1, w, h, qty, paper, lamination, uv)
+def sheet_pieces(runs):
+    return sum(run.impressions * len(run.placements) for run in runs)
+def assert_valid(runs, sheet, margin):
+    for run in runs:
+        pieces = run.placements
+        for _id, x, y, w, h, _rotated in pieces:
+            assert x >= margin - 1e-6 and y >= margin - 1e-6
+            assert x + w <= sheet[0] - margin + 1e-6 and y + h <= sheet[1] - margin + 1e-6
+        for i, a in enumerate(pieces):
+            for b in pieces[i + 1:]:
+                assert a[1] + a[3] <= b[1] + 1e-6 or b[1] + b[3] <= a[1] + 1e-6 or a[2] + a[4] <= b[2] + 1e-6 or b[2] + b[4] <= a[2] + 1e-6
+def test_pack_places_every_piece_without_overlap():
+    items = [item(1, 9, 5, 500), item(2, 21, 29.7, 37), item(3, 10, 15, 83), item(4, 48, 33, 3)]
+    runs, unplaced = pack(items, (70, 100), gutter=0.3, margin=1)
+    assert unplaced == []
+    assert_valid(runs, (70, 100), 1)
+    for it in items:
+        assert sum(run.impressions * sum(p[0] == it.id for p in run.placements) for run in runs) == it.quantity
+    assert sheet_pieces(runs) == 623
+def test_large_quantities_become_one_run():
+    runs, _ = pack([item(1, 9, 5, 100_000)], (70, 100))
+    assert len(runs) <= 2 and runs[0].impressions == 100_000 // 154
+    assert runs[0].waste == pytest.approx(1 - 154 * 45 / 7000)
+def test_oversized_items_are_unplaced_and_best_sheet_is_chosen():
+    packer = plan_group([item(1, 40, 60, 1), item(2, 200, 10, 1)], [(70, 100), (50, 70)], margin=1)
+    assert packer.sheet == (50, 70) and [it.id for it in packer.unplaced] == [2]
+    runs = packer.runs()
+    assert [run.impressions for run in runs] == [1] and 0 < runs[0].waste < 1
+def test_planner_packs_arrivals_into_open_sheets_and_repacks_on_removal():
+    planner = GangPlanner([(70, 100)], gutter=0, margin=0)
+    planner.add([item(1, 10, 10, 10), item(2, 10, 10, 10, uv=True), item(3, 10, 10, 10, paper='kraft')])
+    plans, replanned = planner.plan()
+    assert (len(plans), replanned) == (3, 3)
+    planner.add([item(4, 5, 5, 4, uv=True)])
+    plans, replanned = planner.plan()
+    assert replanned == 0
+    uv = next(plan for plan in plans if plan.group == ('coated-300', False, True))
+    assert sheet_pieces(uv.runs) == 14 and uv.impressions == 1
+    assert_valid(uv.runs, (70, 100), 0)
+    planner.remove([3])
+    plans, replanned = planner.plan()
+    assert (len(plans), replanned) == (2, 1)
+@pytest.mark.django_db
+def test_command_plans_pending_items(capsys):
+    pending, shipped = Order.objects.create(product_name='Cards'), Order.objects.create(product_name='Old', status='shipped')
+    OrderItem.objects.create(order=pending, quantity=1000, paper_type='coated-300', size_width=9, size_height=5, has_lamination=True)
+    OrderItem.objects.create(order=pending, quantity=10, paper_type='offset-80', size_width=21, size_height=29.7)
+    OrderItem.objects.create(order=shipped, quantity=10, paper_type='kraft', size_width=10, size_height=10)
+    call_command('plan_gang_sheets', '--sheet', '50x70', '--json')
+    plans = json.loads(capsys.readouterr().out)
+    assert [(p['paper_type'], p['lamination']) for p in plans] == [('coated-300', True), ('offset-80', False)]
+    assert sum(run['impressions'] * len(run['placements']) for run in plans[0]['runs']) == 1000
+    call_command('plan_gang_sheets')
+    assert '2 groups (2 re-planned)' in capsys.readouterr().out
+def test_sync_replans_edited_and_returning_items():
+    planner = GangPlanner([(70, 100)], gutter=0, margin=0)
+    planner.sync([item(1, 10, 10, 10), item(2, 10, 10, 10, paper='kraft')])
+    assert planner.plan()[1] == 2
+    planner.sync([item(1, 10, 10, 10), item(2, 10, 10, 10, paper='kraft')])
+    assert planner.plan()[1] == 0
+    planner.sync([item(1, 10, 10, 50), item(2, 10, 10, 10, paper='kraft')])  # quantity edited
+    plans, replanned = planner.plan()
+    assert replanned == 1 and sheet_pieces(plans[0].runs) == 50
+    planner.sync([item(1, 10, 10, 50), item(2, 10, 10, 10, paper='offset-80')])  # paper changed groups
+    plans, replanned = planner.plan()
+    assert replanned == 2 and [plan.group[0] for plan in plans] == ['coated-300', 'offset-80']
+    planner.sync([item(1, 10, 10, 50), item(2, 10, 10, 10, paper='offset-80'), item(0, 10, 10, 5)])  # older item back to pending
+    plans, replanned = planner.plan()
+    assert replanned == 0 and sheet_pieces(plans[0].runs) == 55
@@ -0,0 +1,70 @@
+import pytest
+from apps.core.views import _parse_range
+
+CONTENT = bytes(range(256)) * 40  # 10240 bytes
+
+@pytest.fixture
+def media_file(settings, tmp_path):
+    settings.MEDIA_ROOT, settings.SERVE_MEDIA = tmp_path, True
+    (tmp_path / 'uploads').mkdir()
+    (tmp_path / 'uploads' / 'big.pdf').write_bytes(CONTENT)
+    return '/media/uploads/big.pdf'
+def body(response):
+    return b''.join(response.streaming_content)
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-99', (0, 99)),
+    ('bytes=100-', (100, 10239)),
+    ('bytes=-500', (9740, 10239)),
+    ('bytes=10000-99999', (10000, 10239)),
+    ('bytes=10240-', False),
+    ('bytes=-0', False),
+    ('bytes=50-10', None),
+    ('bytes=0-1,5-9', None),
+    ('items=0-1', None),
+])
+def test_parse_range(header, expected):
+    assert _parse_range(header, len(CONTENT)) == expected
+def test_full_download_advertises_ranges(client, media_file):
+    response = client.get(media_file)
+    assert response.status_code == 200
+    assert response['Accept-Ranges'] == 'bytes'
+    assert response['Content-Type'] == 'application/pdf'
+    assert body(response) == CONTENT
+def test_range_request_returns_partial_content(client, media_file):
+    response = client.get(media_file, HTTP_RANGE='bytes=1000-1999')
+    assert response.status_code == 206
+    assert response['Content-Range'] == f'bytes 1000-1999/{len(CONTENT)}'
+    assert response['Content-Length'] == '1000'
+    assert body(response) == CONTENT[1000:2000]
+def test_unsatisfiable_range(client, media_file):
+    response = client.get(media_file, HTTP_RANGE='bytes=99999-')
+    assert response.status_code == 416
+    assert response['Content-Range'] == f'bytes */{len(CONTENT)}'
+def test_stale_if_range_sends_whole_file(client, media_file):
+    response = client.get(media_file, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+    assert response.status_code == 200
+    assert body(response) == CONTENT
+def test_etag_revalidation(client, media_file):
+    etag = client.get(media_file)['ETag']
+    response = client.get(media_file, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    resumed = client.get(media_file, HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE=etag)
+    assert resumed.status_code == 206
+    assert body(resumed) == CONTENT[10:20]
+def test_active_content_is_downloaded_not_rendered(client, media_file, settings):
+    (settings.MEDIA_ROOT / 'uploads' / 'x.html').write_bytes(b'<script>alert(1)</script>')
+    (settings.MEDIA_ROOT / 'uploads' / 'x.svg').write_bytes(b'<svg onload="alert(1)"/>')
+    for name in ('x.html', 'x.svg'):
+        for headers in ({}, {'HTTP_RANGE': 'bytes=0-3'}):
+            response = client.get(f'/media/uploads/{name}', **headers)
+            assert response['Content-Type'] == 'application/octet-stream'
+            assert response['Content-Disposition'] == f'attachment; filename="{name}"'
+            assert response['X-Content-Type-Options'] == 'nosniff'
+    response = client.get(media_file)
+    assert response['Content-Disposition'].startswith('inline') and response['X-Content-Type-Options'] == 'nosniff'
+def test_media_is_not_served_unless_enabled(client, media_file, settings):
+    settings.SERVE_MEDIA = False
+    assert client.get(media_file).status_code == 404
+def test_path_traversal_is_rejected(client, media_file):
+    assert client.get('/media/../settings.py').status_code == 404
+    assert client.get('/media/uploads/missing.pdf').status_code == 404
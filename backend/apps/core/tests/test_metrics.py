@@ -0,0 +1,29 @@
+import pytest
+from apps.core.middleware import _query_hook, install_query_hook
+from django.db import connection
+from django.test import Client
+
+pytestmark = pytest.mark.django_db
+
+def test_metrics_need_a_token_outside_debug(settings):
+    settings.DEBUG, settings.METRICS_TOKEN = False, ''
+    assert Client().get('/metrics/').status_code == 404
+    settings.METRICS_TOKEN = 's3cret'
+    assert Client().get('/metrics/').status_code == 401
+    assert Client().get('/metrics/', HTTP_AUTHORIZATION='Bearer wrong').status_code == 401
+    response = Client().get('/metrics/', HTTP_AUTHORIZATION='Bearer s3cret')
+    assert response.status_code == 200 and response['Content-Type'].startswith('text/plain')
+def test_metrics_are_open_under_debug_without_a_token(settings):
+    settings.DEBUG, settings.METRICS_TOKEN = True, ''
+    assert Client().get('/metrics/').status_code == 200
+def test_query_hook_outlives_the_wrapper_block_that_opened_the_connection():
+    def caller_wrapper(execute, sql, params, many, context):
+        return execute(sql, params, many, context)
+    saved = list(connection.execute_wrappers)
+    connection.execute_wrappers[:] = []
+    try:
+        with connection.execute_wrapper(caller_wrapper):
+            install_query_hook(sender=None, connection=connection)  # as if connection_created fired here
+        assert connection.execute_wrappers == [_query_hook]
+    finally:
+        connection.execute_wrappers[:] = saved
@@ -0,0 +1,88 @@
+import pytest
+from apps.newsletter.models import Subscriber
+from apps.newsletter.sender import CampaignSender, RateLimiter, iter_subscriber_chunks
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.django_db
+
+class FakeConnection:
+    """SMTP backend stand-in: ``fail_sends`` are addresses that raise, ``fail_opens`` the opens that raise"""
+    def __init__(self, fail_sends=(), fail_opens=()):
+        self.fail_sends, self.fail_opens = set(fail_sends), set(fail_opens)
+        self.opens, self.sent, self.is_open = 0, [], False
+    def open(self):
+        self.opens += 1
+        if self.opens in self.fail_opens:
+            raise OSError('connection refused')
+        self.is_open = True
+    def close(self):
+        self.is_open = False
+    def send_messages(self, messages):
+        # Django's SMTP backend would open (and close) a connection just for this message
+        assert self.is_open, 'sent without a pooled connection'
+        email = messages[0].to[0]
+        if email in self.fail_sends:
+            raise OSError('recipient rejected')
+        self.sent.append(email)
+        return 1
+def subscribers(n):
+    Subscriber.objects.bulk_create([Subscriber(email=f'reader{i}@example.com') for i in range(n)])
+def test_subscribe_and_unsubscribe_are_idempotent():
+    client = APIClient()
+    assert client.post('/api/v1/newsletter/subscribe/', {'email': ' Reader@Example.com '}).status_code == 201
+    assert client.post('/api/v1/newsletter/subscribe/', {'email': 'reader@example.com'}).status_code == 200
+    assert client.post('/api/v1/newsletter/unsubscribe/', {'email': 'READER@example.com'}).status_code == 200
+    assert client.post('/api/v1/newsletter/unsubscribe/', {'email': 'reader@example.com'}).status_code == 200
+    subscriber = Subscriber.objects.get()
+    assert subscriber.email == 'reader@example.com' and not subscriber.is_active and subscriber.unsubscribed_at
+    assert client.post('/api/v1/newsletter/subscribe/', {'email': 'reader@example.com'}).status_code == 201
+    assert Subscriber.objects.get().is_active and Subscriber.objects.count() == 1
+def test_chunks_use_keyset_pagination():
+    subscribers(7)
+    Subscriber.objects.filter(email='reader3@example.com').update(is_active=False)
+    with CaptureQueriesContext(connection) as ctx:
+        chunks = list(iter_subscriber_chunks(3))
+    assert [len(chunk) for chunk in chunks] == [3, 3]
+    assert 'reader3@example.com' not in [email for chunk in chunks for _pk, email in chunk]
+    assert len(ctx.captured_queries) == 3 and 'OFFSET' not in ctx.captured_queries[1]['sql']
+def test_rate_limiter_is_a_token_bucket():
+    now, sleeps = [0.0], []
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+    limiter = RateLimiter(2, burst=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(4):
+        limiter.acquire()
+    assert sleeps == [0.5, 0.5]
+    now[0] += 10  # idle: the bucket refills only up to its burst
+    for _ in range(3):
+        limiter.acquire()
+    assert sleeps == [0.5, 0.5, 0.5]
+    RateLimiter(0, sleep=sleeps.append).acquire()
+    assert len(sleeps) == 3
+def test_sender_recycles_and_reconnects_after_failures():
+    subscribers(6)
+    smtp = FakeConnection(fail_sends={'reader1@example.com'})
+    result = CampaignSender('Hi', 'Body', chunk_size=4, rate_limit=0, messages_per_connection=2, connection=smtp).send()
+    assert (result['sent'], result['failed']) == (5, 1)
+    # initial open, a fresh connection after the failure, one recycle after two more messages
+    assert smtp.opens == 3
+def test_failed_reconnect_is_retried_with_backoff():
+    subscribers(4)
+    sleeps = []
+    smtp = FakeConnection(fail_sends={'reader0@example.com'}, fail_opens={2, 3})
+    result = CampaignSender('Hi', 'Body', rate_limit=0, connection=smtp, sleep=sleeps.append).send()
+    assert (result['sent'], result['failed'], result['aborted']) == (3, 1, False)
+    assert smtp.sent == ['reader1@example.com', 'reader2@example.com', 'reader3@example.com']
+    assert sleeps == [2, 4] and smtp.opens == 4
+def test_campaign_stops_when_the_server_cannot_be_reached_again(settings):
+    settings.NEWSLETTER_RECONNECT_ATTEMPTS = 2
+    subscribers(5)
+    sleeps = []
+    smtp = FakeConnection(fail_opens={2, 3})
+    result = CampaignSender('Hi', 'Body', rate_limit=0, messages_per_connection=2, connection=smtp, sleep=sleeps.append).send()
+    assert (result['sent'], result['failed'], result['aborted']) == (2, 0, True)
+    assert smtp.sent == ['reader0@example.com', 'reader1@example.com'] and not smtp.is_open
+    assert sleeps == [2]
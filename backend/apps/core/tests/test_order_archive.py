@@ -0,0 +1,81 @@
+import pytest
+from apps.orders.archive import archive_orders
+from apps.orders.models import ArchivedOrder, Order, OrderEvent, OrderItem
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user('buyer@example.com', 'Passw0rd-123')
+@pytest.fixture
+def orders(user):
+    """Five orders, one a day apart from a year ago; the delivered and cancelled ones are cold."""
+    year_ago = timezone.now() - timedelta(days=365)
+    created = []
+    for day, status in enumerate(['delivered', 'pending', 'cancelled', 'delivered', 'shipped']):
+        order = Order.objects.create(user=user, product_name=f'Job {day}', status=status, total_price=10 * day)
+        OrderItem.objects.create(order=order, paper_type='coated-300', size_width='9.00', size_height='5.00', quantity=100)
+        at = year_ago + timedelta(days=day)
+        Order.objects.filter(pk=order.pk).update(created_at=at, updated_at=at)
+        created.append(order.pk)
+    Order.objects.filter(pk=created[3]).update(updated_at=timezone.now())  # delivered, but touched today
+    return created
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+def test_cold_orders_move_in_batches(orders):
+    assert archive_orders(older_than_days=30, dry_run=True).archived == 2
+    stats = archive_orders(older_than_days=30, batch_size=1, pause=0)
+    assert (stats.archived, stats.batches) == (2, 2)
+    assert sorted(ArchivedOrder.objects.values_list('pk', flat=True)) == [orders[0], orders[2]]
+    assert not Order.objects.filter(pk__in=[orders[0], orders[2]]).exists()
+    assert not OrderEvent.objects.filter(order_id=orders[0]).exists()
+    archived = ArchivedOrder.objects.get(pk=orders[0])
+    assert archived.status == 'delivered' and archived.created_at < timezone.now() - timedelta(days=300)
+    assert archived.items[0]['size_width'] == '9.00' and archived.items[0]['quantity'] == 100
+    call_command('archive_orders', older_than=30, pause=0, verbosity=0)
+    assert ArchivedOrder.objects.count() == 2
+def test_api_reads_archived_orders_transparently(user, orders):
+    client = client_for(user)
+    before = client.get('/api/v1/orders/').json()
+    archive_orders(older_than_days=30, pause=0)
+    assert client.get('/api/v1/orders/').json() == before
+    assert [o['id'] for o in before['results']] == orders[::-1]
+    sparse = client.get('/api/v1/orders/', {'fields': 'id,status'}).json()
+    assert sparse['results'][-1] == {'id': orders[0], 'status': 'delivered'}
+    assert client.get(f'/api/v1/orders/{orders[0]}/').json()['product_name'] == 'Job 0'
+    assert client.post(f'/api/v1/orders/{orders[2]}/cancel/').status_code == 400
+    other = get_user_model().objects.create_user('other@example.com', 'Passw0rd-123')
+    assert client_for(other).get(f'/api/v1/orders/{orders[0]}/').status_code == 404
+def test_writing_an_archived_order_restores_it(user, orders):
+    archive_orders(older_than_days=30, pause=0)
+    created_at = ArchivedOrder.objects.get(pk=orders[0]).created_at
+    response = client_for(user).patch(f'/api/v1/orders/{orders[0]}/', {'quantity': 3}, format='json')
+    assert response.status_code == 200 and response.json()['quantity'] == 3
+    order = Order.objects.get(pk=orders[0])
+    assert order.created_at == created_at and order.items.get().size_width == 9
+    assert not ArchivedOrder.objects.filter(pk=orders[0]).exists()
+def test_admin_finds_archived_orders(orders):
+    admin = get_user_model().objects.create_superuser('admin@example.com', 'x')
+    archive_orders(older_than_days=30, pause=0)
+    client = APIClient()
+    client.force_login(admin)
+    response = client.get(f'/admin/orders/order/{orders[0]}/change/')
+    assert response.status_code == 302 and response['Location'] == f'/admin/orders/archivedorder/{orders[0]}/change/'
+    assert client.get(response['Location']).status_code == 200
+    response = client.get('/admin/orders/order/', {'q': 'Job'})
+    assert '2 archived orders also match' in response.content.decode()
+    response = client.post('/admin/orders/archivedorder/', {'action': 'restore', '_selected_action': [orders[0]]})
+    assert response.status_code == 302 and Order.objects.filter(pk=orders[0]).exists()
+def test_orders_with_the_same_timestamp_are_listed_by_id(user, orders):
+    Order.objects.filter(pk__in=orders).update(created_at=timezone.now() - timedelta(days=365))
+    archive_orders(older_than_days=30, pause=0)
+    rows = client_for(user).get('/api/v1/orders/', {'fields': 'id,status'}).json()['results']
+    assert [o['id'] for o in rows] == sorted(orders, reverse=True)
+    assert ArchivedOrder.objects.count() == 2
@@ -0,0 +1,125 @@
+import asyncio
+import pytest
+import time
+from apps.orders.events import EventStreamApp, broadcaster, order_event_stream
+from apps.orders.models import Order, OrderEvent
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.test import AsyncClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from wsgiref.util import setup_testing_defaults
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user('buyer@example.com', 'Passw0rd-123')
+@pytest.fixture(autouse=True)
+def fast_streams(settings):
+    settings.ORDER_EVENTS_POLL_INTERVAL = 0.05
+    settings.ORDER_EVENTS_HEARTBEAT = 5
+def test_status_changes_are_logged(user):
+    order = Order.objects.create(user=user, product_name='Cards')
+    order.quantity = 5
+    order.save()
+    Order.objects.create(product_name='Anonymous')
+    order = Order.objects.get(pk=order.pk)
+    order.status = 'confirmed'
+    order.save()
+    assert list(OrderEvent.objects.order_by('id').values_list('order_id', 'previous_status', 'status')) == [
+        (order.pk, '', 'pending'), (order.pk, 'pending', 'confirmed'),
+    ]
+def test_stream_resumes_and_pushes_live_changes(user, django_capture_on_commit_callbacks):
+    order = Order.objects.create(user=user, product_name='Cards')
+    created = order.events.get().pk
+    def ship():
+        with django_capture_on_commit_callbacks(execute=True):
+            order.status = 'shipped'
+            order.save()
+    async def scenario():
+        stream = order_event_stream(user.pk, 0)
+        assert await anext(stream) == 'retry: 3000\n\n'
+        replayed = await anext(stream)
+        assert replayed.startswith(f'id: {created}\nevent: order.status\n') and '"status": "pending"' in replayed
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.01)
+        assert len(broadcaster) == 1 and not pending.done()
+        await sync_to_async(ship)()
+        live = await asyncio.wait_for(pending, 1)
+        assert '"status": "shipped", "previous_status": "pending"' in live
+        # written by another worker: no in-process publish, the poller picks it up
+        await sync_to_async(OrderEvent.objects.create)(user=user, order=order, status='delivered', previous_status='shipped')
+        assert '"status": "delivered"' in await asyncio.wait_for(anext(stream), 1)
+        await stream.aclose()
+        assert len(broadcaster) == 0
+        await asyncio.sleep(0.15)  # the idle poller exits
+    async_to_sync(scenario)()
+def test_stream_sends_heartbeats_and_skips_history_without_last_event_id(user, settings):
+    settings.ORDER_EVENTS_HEARTBEAT = 0.02
+    Order.objects.create(user=user, product_name='Cards')
+    async def scenario():
+        stream = order_event_stream(user.pk)
+        await anext(stream)
+        assert await asyncio.wait_for(anext(stream), 1) == ': keep-alive\n\n'
+        await stream.aclose()
+        await asyncio.sleep(0.15)
+    async_to_sync(scenario)()
+def test_view_authenticates_with_query_token_and_honours_last_event_id(user, settings):
+    settings.ORDER_EVENTS_MAX_STREAM = 0
+    first = Order.objects.create(user=user, product_name='Cards')
+    second = Order.objects.create(user=user, product_name='Flyers')
+    client, token = AsyncClient(), RefreshToken.for_user(user).access_token
+    async def scenario():
+        anonymous = await client.get('/api/v1/orders/events/', headers={'accept': 'text/event-stream'})
+        last_event_id = await sync_to_async(lambda: first.events.get().pk)()
+        response = await client.get(f'/api/v1/orders/events/?access_token={token}',
+                                    headers={'accept': 'text/event-stream', 'last-event-id': str(last_event_id)})
+        body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        return anonymous.status_code, response, body
+    anonymous, response, body = async_to_sync(scenario)()
+    assert anonymous == 401
+    assert response.status_code == 200 and response['Content-Type'] == 'text/event-stream'
+    assert f'"order": {second.pk}' in body and f'"order": {first.pk}' not in body
+def test_view_refuses_to_stream_under_wsgi(user, settings):
+    settings.ORDER_EVENTS_MAX_STREAM = 60  # a buffered stream would hold the worker this long
+    environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/api/v1/orders/events/', 'HTTP_ACCEPT': 'text/event-stream',
+               'QUERY_STRING': f'access_token={RefreshToken.for_user(user).access_token}'}
+    setup_testing_defaults(environ)
+    started = []
+    started_at = time.monotonic()
+    body = b''.join(WSGIHandler()(environ, lambda status, headers: started.append(status)))
+    assert started == ['503 Service Unavailable'] and b'ASGI' in body
+    assert time.monotonic() - started_at < 5
+def test_asgi_app_serves_the_stream_outside_django_and_stops_on_disconnect(user):
+    Order.objects.create(user=user, product_name='Cards')
+    token = RefreshToken.for_user(user).access_token
+    passed = []
+    async def django_app(scope, receive, send):
+        passed.append(scope['path'])
+    app = EventStreamApp(django_app, '/api/v1/orders/events/')
+    def scope(*headers):
+        return {'type': 'http', 'method': 'GET', 'path': '/api/v1/orders/events/', 'query_string': b'', 'headers': list(headers)}
+    async def scenario():
+        await app({**scope(), 'path': '/api/v1/orders/'}, None, None)
+        assert passed == ['/api/v1/orders/']
+        sent, disconnected = [], asyncio.Event()
+        async def receive():
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+        async def send(message):
+            sent.append(message)
+        await app(scope((b'authorization', b'Bearer not-a-token')), receive, send)
+        assert sent[0]['status'] == 401
+        sent.clear()
+        streaming = asyncio.ensure_future(app(scope(
+            (b'authorization', f'Bearer {token}'.encode()), (b'last-event-id', b'0'), (b'origin', b'https://shop.example'),
+        ), receive, send))
+        await asyncio.sleep(0.05)
+        assert sent[0]['status'] == 200 and (b'access-control-allow-origin', b'https://shop.example') in sent[0]['headers']
+        assert b'"status": "pending"' in b''.join(message.get('body', b'') for message in sent[1:])
+        disconnected.set()
+        await asyncio.wait_for(streaming, 1)
+        assert len(broadcaster) == 0
+        await asyncio.sleep(0.15)
+    async_to_sync(scenario)()
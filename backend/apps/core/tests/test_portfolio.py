@@ -0,0 +1,62 @@
+import io
+from unittest import mock
+import pytest
+from apps.portfolio import models
+from apps.portfolio.models import PortfolioItem
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+def upload(size=(300, 200), color=(200, 30, 30), orientation=None):
+    image = Image.new('RGB', size, color)
+    image.paste((20, 20, 200), (0, 0, size[0] // 5, size[1]))
+    buffer = io.BytesIO()
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    image.save(buffer, 'JPEG', exif=exif)
+    return SimpleUploadedFile('work.jpg', buffer.getvalue(), content_type='image/jpeg')
+def create(slug, category='labels', **kwargs):
+    return PortfolioItem.objects.create(title=slug.title(), slug=slug, category=category, image=upload(**kwargs))
+def test_metadata_is_computed_once_at_ingest():
+    item = create('red-label', orientation=6)
+    assert (item.width, item.height) == (200, 300)
+    red, green, blue = (int(item.dominant_color[i:i + 2], 16) for i in (1, 3, 5))
+    assert red > 150 and green < 80 and blue < 80
+    assert item.placeholder.startswith('data:image/png;base64,') and len(item.placeholder) < 400
+    with mock.patch.object(models, 'image_metadata') as metadata:
+        item.title = 'Renamed'
+        item.save()
+        PortfolioItem.objects.get(pk=item.pk).save()
+    metadata.assert_not_called()
+def test_list_is_cursor_paginated_filtered_and_does_no_file_io():
+    for i in range(5):
+        create(f'label-{i}')
+    create('box', category='packaging')
+    client = APIClient()
+    with mock.patch('PIL.Image.open', side_effect=AssertionError('file I/O')), CaptureQueriesContext(connection) as ctx:
+        response = client.get('/api/v1/portfolio/', {'category': 'labels', 'page_size': 3})
+    body = response.json()
+    assert len(ctx.captured_queries) == 1
+    assert [row['slug'] for row in body['results']] == ['label-4', 'label-3', 'label-2']
+    assert set(body['results'][0]) == {'id', 'title', 'slug', 'category', 'image', 'width', 'height',
+                                       'dominant_color', 'placeholder', 'is_featured'}
+    assert body['results'][0]['width'] == 300 and 'count' not in body
+    following = client.get(body['next']).json()
+    assert [row['slug'] for row in following['results']] == ['label-1', 'label-0'] and following['next'] is None
+def test_detail_and_inactive_items():
+    item = create('flyer')
+    hidden = create('draft')
+    PortfolioItem.objects.filter(pk=hidden.pk).update(is_active=False)
+    client = APIClient()
+    response = client.get(f'/api/v1/portfolio/{item.pk}/')
+    assert response.status_code == 200 and response.json()['slug'] == 'flyer'
+    assert client.get(f'/api/v1/portfolio/{hidden.pk}/').status_code == 404
+    assert [row['slug'] for row in client.get('/api/v1/portfolio/').json()['results']] == ['flyer']
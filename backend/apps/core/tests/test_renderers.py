@@ -0,0 +1,59 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+import pytest
+from apps.core import parsers, renderers
+from apps.core.parsers import FastJSONParser
+from apps.core.renderers import FastJSONRenderer
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+UTC = datetime.timezone.utc
+TEHRAN = ZoneInfo('Asia/Tehran')
+LONDON = ZoneInfo('Europe/London')
+PAYLOADS = [
+    {'total_price': Decimal('1250000.50'), 'price': Decimal('99'), 'quantity': 3},
+    {'created_at': datetime.datetime(2025, 3, 1, 8, 30, 15, 123456, tzinfo=UTC)},
+    {'created_at': datetime.datetime(2025, 3, 1, 12, 0, tzinfo=TEHRAN), 'naive': datetime.datetime(2025, 1, 1)},
+    {'winter': datetime.datetime(2025, 1, 1, tzinfo=LONDON), 'summer': datetime.datetime(2025, 7, 1, tzinfo=LONDON)},
+    {'date': datetime.date(2025, 3, 21), 'time': datetime.time(9, 15, 30, 500), 'delta': datetime.timedelta(hours=2)},
+    {'id': uuid.UUID('12345678-1234-5678-1234-567812345678'), 'label': _('name'), 'raw': b'bytes'},
+    {'name': 'چاپ کارت ویزیت', 'separator': 'a\u2028b\u2029c', 'nested': [{'a': None, 'b': True, 'c': 1.5}], 1: 'int key'},
+    [],
+    'plain',
+]
+
+@pytest.mark.parametrize('data', PAYLOADS)
+def test_render_matches_drf(data):
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+def test_indent_and_none_match_drf():
+    data = PAYLOADS[0]
+    assert FastJSONRenderer().render(data, 'application/json; indent=4') == JSONRenderer().render(data, 'application/json; indent=4')
+    assert FastJSONRenderer().render(None) == b''
+def test_exponent_floats_differ_only_in_spelling():
+    data = {'big': 1e16, 'small': 1.5e-7}
+    fast, drf = FastJSONRenderer().render(data), JSONRenderer().render(data)
+    assert fast == b'{"big":1e16,"small":1.5e-7}' and drf == b'{"big":1e+16,"small":1.5e-07}'
+    assert FastJSONParser().parse(io.BytesIO(fast)) == JSONParser().parse(io.BytesIO(drf)) == data
+def test_oversized_int_falls_back_to_stdlib():
+    assert FastJSONRenderer().render({'n': 2 ** 70}) == b'{"n":1180591620717411303424}'
+def test_without_orjson(monkeypatch):
+    monkeypatch.setattr(renderers, 'orjson', None)
+    monkeypatch.setattr(parsers, 'orjson', None)
+    for data in PAYLOADS:
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+    assert FastJSONParser().parse(io.BytesIO(b'{"a": 1}')) == {'a': 1}
+@pytest.mark.parametrize('body', [b'{"price": "12.50", "items": [1, 2.5, null]}', '{"name": "بنر"}'.encode()])
+def test_parse_matches_drf(body):
+    assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+@pytest.mark.parametrize('body', [b'{"a": ', b'{"a": NaN}'])
+def test_parse_errors(body):
+    with pytest.raises(ParseError):
+        FastJSONParser().parse(io.BytesIO(body))
+def test_parse_other_charset():
+    body = '{"name": "café"}'.encode('latin-1')
+    assert FastJSONParser().parse(io.BytesIO(body), parser_context={'encoding': 'latin-1'}) == {'name': 'café'}
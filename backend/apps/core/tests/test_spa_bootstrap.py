@@ -0,0 +1,79 @@
+import json
+import pytest
+import re
+from apps.core.bootstrap import invalidate
+from apps.core.views import spa_view
+from apps.services.models import Service
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture(autouse=True)
+def spa(settings):
+    settings.SPA_BOOTSTRAP_CACHE_SECONDS = 300
+    settings.COMPANY = {'name': 'Digi Print', 'description': '', 'phone': '021-1234'}
+    cache.clear()
+    yield
+    cache.clear()
+@pytest.fixture
+def services():
+    Service.objects.create(name='Business cards', slug='business-cards', description='Matte <b>350g</b>', price=120000)
+    Service.objects.create(name='Labels', slug='labels', description='Roll labels', price=80000)
+    Service.objects.create(name='Old', slug='old', price=1, is_active=False)
+def get(path, **headers):
+    return spa_view(RequestFactory().get(path, **headers))
+def embedded(response):
+    match = re.search(r'<script id="bootstrap-data" type="application/json">(.*?)</script>', response.content.decode(), re.S)
+    return json.loads(match.group(1))
+def test_shell_embeds_the_first_paint_api_responses(services):
+    data = embedded(get('/dashboard'))
+    client = APIClient()
+    for path in ('/services/', '/services/active/', '/categories/'):
+        assert data[path] == client.get(f'/api/v1{path}').json()
+    assert [s['slug'] for s in data['/services/active/']] == ['business-cards', 'labels']
+    assert data['/company/settings/']['phone'] == '021-1234'
+def test_service_landing_page_is_prerendered(services):
+    response = get('/services/business-cards')
+    html = response.content.decode()
+    assert response.status_code == 200
+    assert '<title>Business cards | Digi Print</title>' in html
+    assert '<h1>Business cards</h1>' in html and 'Matte &lt;b&gt;350g&lt;/b&gt;' in html
+    assert '<link rel="canonical" href="http://testserver/services/business-cards" />' in html
+    ld = json.loads(re.search(r'<script type="application/ld\+json">(.*?)</script>', html).group(1))
+    assert ld['@type'] == 'Service' and ld['description'] == 'Matte <b>350g</b>'
+    assert embedded(response)['/services/business-cards/']['price'] == '120000'
+    listing = get('/services').content.decode()
+    assert '<a href="/services/labels">Labels</a>' in listing and '>Old<' not in listing
+    assert get('/services/old').status_code == 404
+    assert get('/services/missing').status_code == 404
+def test_pages_are_cached_until_a_service_changes(services, django_capture_on_commit_callbacks):
+    first = get('/services/labels')
+    with CaptureQueriesContext(connection) as ctx:
+        again = get('/services/labels')
+        assert get('/profile').status_code == get('/orders/7').status_code == 200
+    assert again.content == first.content
+    assert len(ctx.captured_queries) == 3  # one render of the shell that every client-side route shares
+    assert get('/services/labels', HTTP_IF_NONE_MATCH=first['ETag']).status_code == 304
+    with django_capture_on_commit_callbacks(execute=True):
+        Service.objects.filter(slug='labels').update(description='stale')  # no signal: still cached
+        assert b'stale' not in get('/services/labels').content
+        service = Service.objects.get(slug='labels')
+        service.description = 'Waterproof roll labels'
+        service.save()
+    assert b'Waterproof roll labels' in get('/services/labels').content
+    invalidate()
+    with CaptureQueriesContext(connection) as ctx:
+        get('/')
+    assert ctx.captured_queries
+def test_unknown_service_slugs_share_one_cached_404(services):
+    assert get('/services/missing-0').status_code == 404
+    with CaptureQueriesContext(connection) as ctx:
+        responses = [get(f'/services/missing-{i}') for i in range(1, 20)] + [get('/services/old')]
+    assert {response.status_code for response in responses} == {404}
+    assert not ctx.captured_queries
+    assert len({key for key in cache._cache if ':spa:page:' in key}) == 1
+    assert get('/services/labels').status_code == 200
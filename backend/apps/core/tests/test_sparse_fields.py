@@ -0,0 +1,66 @@
+from decimal import Decimal
+import pytest
+from apps.newsletter.models import Subscriber
+from apps.orders.models import Order
+from apps.services.models import Service
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture
+def data():
+    user = get_user_model().objects.create_user(email='sparse@example.com', password='x', first_name='Sara')
+    admin = get_user_model().objects.create_superuser(email='admin@example.com', password='x')
+    Service.objects.bulk_create([
+        Service(name=f'Service {i}', slug=f'service-{i}', description='long text ' * 50, price=Decimal(1000), is_active=True)
+        for i in range(3)
+    ])
+    order = Order.objects.create(user=user, product_name='Banner', quantity=2, total_price=Decimal('10.00'))
+    Subscriber.objects.subscribe('reader@example.com')
+    return user, admin, order
+def get(client, path, params):
+    """GET ``path``; returns the response and the column list of the last SELECT."""
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(path, params)
+    return response, ctx.captured_queries[-1]['sql'].split(' FROM ')[0]
+def test_fields_narrow_output_and_columns(data):
+    response, columns = get(APIClient(), '/api/v1/services/', {'fields': 'id,name'})
+    assert response.status_code == 200
+    assert [set(row) for row in response.json()['results']] == [{'id', 'name'}] * 3
+    assert '"description"' not in columns and '"price"' not in columns
+def test_omit(data):
+    response, columns = get(APIClient(), '/api/v1/services/active/', {'omit': 'description,updated_at'})
+    assert set(response.json()[0]) == {'id', 'name', 'slug', 'price', 'is_active', 'created_at'}
+    assert '"description"' not in columns
+def test_unknown_field_is_rejected(data):
+    response = APIClient().get('/api/v1/services/', {'fields': 'id,secret', 'omit': 'nope'})
+    assert response.status_code == 400
+    assert 'nope, secret' in response.json()['fields'][0]
+def test_retrieve_uses_only(data):
+    user, _admin, order = data
+    client = APIClient()
+    client.force_authenticate(user)
+    response, columns = get(client, f'/api/v1/orders/{order.pk}/', {'fields': 'id,status'})
+    assert response.json() == {'id': order.pk, 'status': 'pending'}
+    assert '"product_name"' not in columns
+def test_user_and_subscriber_serializers(data):
+    user, admin, _order = data
+    client = APIClient()
+    client.force_authenticate(user)
+    assert client.get('/api/v1/accounts/profile/', {'fields': 'email,first_name'}).json() == {
+        'email': 'sparse@example.com', 'first_name': 'Sara',
+    }
+    client.force_authenticate(admin)
+    response, columns = get(client, '/api/v1/newsletter/subscribers/', {'fields': 'email'})
+    assert response.json()['results'] == [{'email': 'reader@example.com'}]
+    assert '"subscribed_at"' not in columns
+def test_writes_ignore_sparse_fields(data):
+    user, _admin, _order = data
+    client = APIClient()
+    client.force_authenticate(user)
+    response = client.post('/api/v1/orders/?fields=id', {'product_name': 'Card', 'quantity': 1, 'total_price': '5.00'}, format='json')
+    assert response.status_code == 201
+    assert response.json()['product_name'] == 'Card'
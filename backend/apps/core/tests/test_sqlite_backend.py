@@ -0,0 +1,12 @@
+import pytest
+from apps.core.db.sqlite3.base import DatabaseWrapper
+
+def wrapper(options):
+    return DatabaseWrapper({'NAME': '/tmp/db.sqlite3', 'OPTIONS': options, 'TIME_ZONE': None})
+@pytest.mark.parametrize('options, busy_timeout', [
+    ({}, 5000),
+    ({'timeout': 20}, 20000),
+    ({'timeout': 20, 'pragmas': {'busy_timeout': 1000}}, 1000),
+])
+def test_busy_timeout_follows_the_driver_timeout(options, busy_timeout):
+    assert wrapper(options).pragmas['busy_timeout'] == busy_timeout
@@ -0,0 +1,90 @@
+import multiprocessing
+import pytest
+from apps.core import cache as sqlite_cache
+from apps.core.cache import SQLiteCache
+from django.core.cache import caches
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controls time.time() for the backend and Django's timeout arithmetic."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(sqlite_cache.time, 'time', lambda: now[0])
+    return now
+def make_cache(path, **options):
+    return SQLiteCache(str(path), {'TIMEOUT': 60, 'OPTIONS': options})
+def count(path, n):
+    cache = make_cache(path)
+    for _ in range(n):
+        cache.incr('hits')
+def test_cache_api(tmp_path, clock):
+    cache = make_cache(tmp_path / 'cache.sqlite3')
+    cache.set('page', {'html': '<p>hi</p>'})
+    assert cache.get('page') == {'html': '<p>hi</p>'} and cache.get('missing', 'default') == 'default'
+    assert not cache.add('page', 'other') and cache.add('new', [1, 2])
+    cache.set('forever', 'x', None)
+    cache.set_many({'a': 1, 'b': 'two'}, 30)
+    assert cache.get_many(['a', 'b', 'c']) == {'a': 1, 'b': 'two'}
+    clock[0] += 45
+    assert cache.get_many(['a', 'b']) == {} and cache.has_key('page') and not cache.has_key('a')
+    assert cache.add('a', 'again')
+    assert cache.touch('page', 100)
+    clock[0] += 50
+    assert cache.get('page') and cache.get('forever') == 'x' and cache.get('new') is None
+    assert cache.delete('page') and not cache.delete('page')
+    cache.delete_many(['a', 'forever'])
+    assert cache.get_many(['a', 'forever']) == {}
+    cache.set('gone', 1, 0)
+    assert not cache.has_key('gone')
+    cache.clear()
+    assert cache._connection().execute('SELECT entries, bytes FROM cache_usage').fetchone() == (0, 0)
+def test_incr(tmp_path):
+    cache = make_cache(tmp_path / 'cache.sqlite3')
+    cache.set('n', 5)
+    assert (cache.incr('n'), cache.incr('n', 10), cache.decr('n', 3)) == (6, 16, 13)
+    cache.set('ratio', 0.5)
+    assert cache.incr('ratio') == 1.5 and cache.get('ratio') == 1.5
+    with pytest.raises(ValueError):
+        cache.incr('missing')
+def test_incr_past_64_bits_raises_and_keeps_the_value(tmp_path):
+    cache = make_cache(tmp_path / 'cache.sqlite3')
+    cache.set('n', 2 ** 63 - 2)
+    assert cache.incr('n') == 2 ** 63 - 1
+    for key, delta in (('n', 1), ('n', 2 ** 64)):
+        with pytest.raises(ValueError):
+            cache.incr(key, delta)
+    assert cache.get('n') == 2 ** 63 - 1
+    cache.set('low', -2 ** 63)
+    with pytest.raises(ValueError):
+        cache.decr('low')
+    assert cache.get('low') == -2 ** 63 and cache.decr('n', 2 ** 63) == -1
+def test_workers_share_entries_and_counters(tmp_path):
+    path = tmp_path / 'cache.sqlite3'
+    worker_a, worker_b = make_cache(path), make_cache(path)
+    worker_a.set('k', 'from a')
+    assert worker_b.get('k') == 'from a'
+    worker_a.set('hits', 0)
+    processes = [multiprocessing.get_context('fork').Process(target=count, args=(path, 200)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert worker_b.get('hits') == 800
+def test_least_recently_used_entries_are_evicted_under_the_size_cap(tmp_path, clock):
+    cache = make_cache(tmp_path / 'cache.sqlite3', MAX_SIZE=10_000, CULL_FREQUENCY=4)
+    for i in range(9):
+        cache.set(f'k{i}', 'x' * 1000)
+        clock[0] += 2
+    assert cache.get('k0')  # read: now the most recently used
+    cache.set('k9', 'x' * 1000)  # over 10 kB: down to 3/4 of the cap, oldest reads and writes first
+    kept = cache.get_many([f'k{i}' for i in range(10)])
+    assert sorted(kept, key=lambda key: int(key[1:])) == ['k0', 'k4', 'k5', 'k6', 'k7', 'k8', 'k9']
+    entries, size = cache._connection().execute('SELECT entries, bytes FROM cache_usage').fetchone()
+    assert entries == 7 and size <= 7_500
+    limited = make_cache(tmp_path / 'entries.sqlite3', MAX_ENTRIES=10, CULL_FREQUENCY=2)
+    for i in range(11):
+        limited.set(f'k{i}', i)
+    assert len(limited.get_many([f'k{i}' for i in range(11)])) == 5
+def test_configured_as_django_cache(tmp_path, settings):
+    settings.CACHES = {'default': {'BACKEND': 'apps.core.cache.SQLiteCache', 'LOCATION': str(tmp_path / 'c.sqlite3')}}
+    caches['default'].set('key', 'value')
+    assert make_cache(tmp_path / 'c.sqlite3').get('key') == 'value'
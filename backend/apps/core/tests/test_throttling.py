@@ -0,0 +1,70 @@
+import pytest
+from apps.core import throttling
+from apps.core.throttling import CacheCounterStore, SQLiteCounterStore, ScopedSlidingWindowThrottle
+from django.core.cache import cache
+from django.test import RequestFactory
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+
+class View:
+    throttle_scope = 'test'
+@pytest.fixture(autouse=True)
+def throttle_settings(settings, tmp_path, monkeypatch):
+    settings.THROTTLE_STORE = 'sqlite'
+    settings.THROTTLE_SQLITE_PATH = str(tmp_path / 'throttle.sqlite3')
+    monkeypatch.setattr(ScopedSlidingWindowThrottle, 'THROTTLE_RATES', {'test': '3/min', 'contact': '2/min'})
+    cache.clear()
+def make_throttle(now):
+    throttle = ScopedSlidingWindowThrottle()
+    throttle.timer = lambda: now
+    return throttle
+def allowed(now, ip='10.0.0.1'):
+    request = Request(RequestFactory().post('/', REMOTE_ADDR=ip))
+    request.user = None
+    throttle = make_throttle(now)
+    return throttle.allow_request(request, View()), throttle.wait()
+@pytest.mark.parametrize('store', ['sqlite', 'cache'])
+def test_sliding_window(settings, store):
+    settings.THROTTLE_STORE = store
+    start = 6000.0  # a window boundary for 60 s windows
+    for ip in ('10.0.0.1', '10.0.0.2'):
+        assert [allowed(start + i, ip)[0] for i in range(4)] == [True, True, True, False]
+    assert allowed(start + 10, ip='10.0.0.3')[0]
+    # 4 hits (rejected ones count) in the previous window weigh 4 * 0.75 = 3 a quarter into the next one
+    ok, wait = allowed(start + 75)
+    assert not ok and wait == pytest.approx(15)
+    # halfway through, the weight is 2; one more hit fits
+    assert allowed(start + 90, '10.0.0.2') == (True, None)
+    assert not allowed(start + 91, '10.0.0.2')[0]
+def test_sqlite_counters_are_shared_between_workers(tmp_path):
+    path = tmp_path / 'shared.sqlite3'
+    worker_a, worker_b = SQLiteCounterStore(path), SQLiteCounterStore(path)
+    assert worker_a.hit('k', 7, 60) == (0, 1)
+    assert worker_b.hit('k', 7, 60) == (0, 2)
+    assert worker_a.hit('k', 8, 60) == (2, 1)
+def test_cache_store():
+    store = CacheCounterStore('default')
+    store.hit('k', 1, 60)
+    assert store.hit('k', 2, 60) == (1, 1)
+def test_store_follows_settings(settings, tmp_path):
+    settings.THROTTLE_SQLITE_PATH = str(tmp_path / 'other.sqlite3')
+    assert throttling.get_counter_store().path == settings.THROTTLE_SQLITE_PATH
+    settings.THROTTLE_STORE = 'cache'
+    assert isinstance(throttling.get_counter_store(), CacheCounterStore)
+def test_endpoint_returns_429_with_retry_after():
+    client = APIClient()
+    statuses = [client.post('/api/v1/contact/', {'message': 'hi'}, format='json').status_code for _ in range(3)]
+    assert statuses == [201, 201, 429]
+    response = client.post('/api/v1/contact/', {'message': 'hi'}, format='json')
+    assert int(response['Retry-After']) <= 60
+def post_contact(client, forwarded_for):
+    return client.post('/api/v1/contact/', {'message': 'hi'}, format='json', HTTP_X_FORWARDED_FOR=forwarded_for).status_code
+def test_spoofed_forwarded_for_does_not_reset_the_limit():
+    client = APIClient()
+    assert [post_contact(client, f'203.0.113.{i}') for i in range(3)] == [201, 201, 429]
+def test_forwarded_for_is_trusted_behind_configured_proxies(settings):
+    settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}
+    client = APIClient()
+    # the proxy appends the real client address; only the last NUM_PROXIES entries count
+    assert [post_contact(client, f'10.9.9.9, 203.0.113.{i}') for i in range(3)] == [201, 201, 201]
+    assert post_contact(client, '203.0.113.1') == 201 and post_contact(client, '1.2.3.4, 203.0.113.1') == 429
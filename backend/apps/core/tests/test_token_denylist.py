@@ -0,0 +1,89 @@
+import pytest
+import uuid
+from apps.accounts.denylist import BloomFilter, denylist
+from apps.accounts.models import RevokedToken
+from apps.accounts.tokens import RefreshToken
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user('buyer@example.com', 'Passw0rd-123')
+@pytest.fixture(autouse=True)
+def fresh_denylist(settings):
+    settings.JWT_DENYLIST_REFRESH_SECONDS = 3600
+    denylist.clear()
+    yield
+    denylist.clear()
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(10000, 0.01)
+    keys = [uuid.uuid4().hex for _ in range(10000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10000))
+    assert false_positives < 300
+    assert len(bloom.bits) < 13000  # ~1.2 bytes per key at 1%
+def test_logout_revokes_access_and_refresh_tokens(user):
+    refresh = RefreshToken.for_user(user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    assert client.get('/api/v1/accounts/profile/').status_code == 200
+    response = client.post('/api/v1/accounts/logout/', {'refresh': str(refresh)}, format='json')
+    assert response.status_code == 200
+    assert RevokedToken.objects.filter(user=user).count() == 2
+    assert client.get('/api/v1/accounts/profile/').status_code == 401
+    response = APIClient().post('/api/v1/accounts/token/refresh/', {'refresh': str(refresh)}, format='json')
+    assert response.status_code == 401
+    assert APIClient().post('/api/v1/accounts/logout/', {'refresh': 'junk'}, format='json').status_code == 400
+def test_revocations_by_other_workers_are_picked_up_on_refresh(user, settings):
+    access = RefreshToken.for_user(user).access_token
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+    assert client.get('/api/v1/accounts/profile/').status_code == 200
+    # another process writes the row; this one only sees it after its next refresh
+    RevokedToken.objects.create(jti=access['jti'], token_type='access', user=user,
+                                expires_at=timezone.now() + timedelta(hours=1))
+    assert client.get('/api/v1/accounts/profile/').status_code == 200
+    settings.JWT_DENYLIST_REFRESH_SECONDS = 0
+    assert client.get('/api/v1/accounts/profile/').status_code == 401
+def test_rebuild_prunes_expired_rows(user):
+    RevokedToken.objects.create(jti='old', token_type='access', expires_at=timezone.now() - timedelta(seconds=1))
+    RevokedToken.objects.create(jti='live', token_type='access', expires_at=timezone.now() + timedelta(hours=1))
+    denylist.refresh(force=True)
+    assert list(RevokedToken.objects.values_list('jti', flat=True)) == ['live']
+    assert 'live' in denylist and 'old' not in denylist
+def test_valid_token_costs_no_denylist_query(user):
+    RevokedToken.objects.bulk_create([
+        RevokedToken(jti=uuid.uuid4().hex, token_type='access', expires_at=timezone.now() + timedelta(hours=1))
+        for _ in range(500)
+    ])
+    denylist.refresh(force=True)
+    access = RefreshToken.for_user(user).access_token
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get('/api/v1/accounts/profile/').status_code == 200
+    assert not any('revokedtoken' in q['sql'] for q in ctx.captured_queries)
+def test_rows_committed_below_the_cursor_are_picked_up_within_the_rescan_window(settings):
+    expires = timezone.now() + timedelta(hours=1)
+    RevokedToken.objects.create(id=10, jti='seen', token_type='access', expires_at=expires)
+    denylist.refresh(force=True)
+    assert denylist.cursor == 10
+    # a transaction that took id 5 before id 10 but committed after the refresh
+    RevokedToken.objects.create(id=5, jti='late', token_type='access', expires_at=expires)
+    # one that stayed open longer than the window is only seen by the next rebuild
+    RevokedToken.objects.create(id=3, jti='stale', token_type='access', expires_at=expires)
+    RevokedToken.objects.filter(id=3).update(revoked_at=timezone.now() - timedelta(seconds=settings.JWT_DENYLIST_RESCAN_SECONDS + 5))
+    denylist.refresh(force=True)
+    assert 'late' in denylist and 'stale' not in denylist
+    assert denylist.cursor == 10 and denylist.bloom.count == 2
+    settings.JWT_DENYLIST_REBUILD_SECONDS = 0
+    denylist.refresh(force=True)
+    assert 'stale' in denylist
@@ -0,0 +1,70 @@
+import datetime
+from decimal import Decimal
+import pytest
+from apps.core.serializers import ValuesSerializer, values_serializer
+from apps.orders.models import Order
+from apps.orders.serializers import OrderSerializer
+from apps.services.models import Service
+from apps.services.serializers import ServiceSerializer
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture
+def catalog():
+    user = get_user_model().objects.create_user(email='values@example.com', password='x')
+    services = Service.objects.bulk_create([
+        Service(name=f'خدمت {i}', slug=f'service-{i}', description='' if i % 3 else 'چاپ افست',
+                price=Decimal(i * 1000), is_active=bool(i % 2))
+        for i in range(12)
+    ])
+    orders = Order.objects.bulk_create([
+        Order(user=user if i % 4 else None, product_name=f'بنر {i}', product_id=i if i % 2 else None,
+              quantity=i, total_price=Decimal(f'{i}.{i:02d}'), status=Order.STATUS_CHOICES[i % 6][0])
+        for i in range(15)
+    ])
+    # a timestamp with microseconds
+    Order.objects.filter(pk=orders[0].pk).update(created_at=datetime.datetime(2025, 3, 1, 8, 30, 15, 123456, tzinfo=datetime.timezone.utc))
+    return user, services, orders
+def render(data):
+    return JSONRenderer().render(data)
+@pytest.mark.parametrize('serializer_class, model', [(ServiceSerializer, Service), (OrderSerializer, Order)])
+def test_output_is_byte_identical(catalog, serializer_class, model):
+    queryset = model.objects.all()
+    fast = ValuesSerializer(serializer_class)
+    assert render(fast.to_representation(fast.values(queryset))) == render(serializer_class(queryset, many=True).data)
+def test_subset_of_fields(catalog):
+    fast = values_serializer(OrderSerializer, frozenset({'id', 'total_price'}))
+    rows = fast.to_representation(fast.values(Order.objects.all()))
+    assert set(rows[0]) == {'id', 'total_price'}
+    assert fast is values_serializer(OrderSerializer, frozenset({'id', 'total_price'}))
+def test_fields_needing_instances_are_rejected():
+    class WithMethod(serializers.ModelSerializer):
+        label = serializers.SerializerMethodField()
+        class Meta:
+            model = Service
+            fields = ['id', 'label']
+    class WithDotted(serializers.ModelSerializer):
+        email = serializers.CharField(source='user.email')
+        class Meta:
+            model = Order
+            fields = ['id', 'email']
+    for serializer_class in (WithMethod, WithDotted):
+        with pytest.raises(ImproperlyConfigured):
+            ValuesSerializer(serializer_class)
+def test_list_endpoints_match_model_serializers(catalog):
+    user, _services, _orders = catalog
+    client = APIClient()
+    response = client.get('/api/v1/services/', {'page': 2})
+    page = Service.objects.all()[10:20]
+    assert response.json()['results'] == ServiceSerializer(page, many=True).data
+    response = client.get('/api/v1/services/active/')
+    assert response.content == render(ServiceSerializer(Service.objects.filter(is_active=True), many=True).data)
+    client.force_authenticate(user)
+    response = client.get('/api/v1/orders/')
+    assert response.json()['count'] == Order.objects.filter(user=user).count()
+    assert response.json()['results'] == OrderSerializer(Order.objects.filter(user=user)[:10], many=True).data
@@ -0,0 +1,102 @@
+import os
+import random
+import sqlite3
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import ScopedRateThrottle, SimpleRateThrottle
+
+class CacheCounterStore:
+    """Window counters in a Django cache; shared across workers with Redis or memcached."""
+    def __init__(self, alias='default'):
+        self.cache = caches[alias]
+    def hit(self, key, window, duration):
+        """Count a hit in ``window``; returns (previous window count, current window count)."""
+        current_key, timeout = f'{key}:{window}', int(duration * 2) + 1
+        self.cache.add(current_key, 0, timeout)
+        try:
+            current = self.cache.incr(current_key)
+        except ValueError:  # expired between add() and incr()
+            self.cache.set(current_key, 1, timeout)
+            current = 1
+        return self.cache.get(f'{key}:{window - 1}', 0), current
+class SQLiteCounterStore:
+    """
+    Window counters in a small SQLite file (WAL) that every worker on the host
+    opens, so the limits hold across gunicorn processes without a cache server.
+    One upsert and one primary-key read per request; expired rows are purged
+    occasionally so the table stays bounded by the number of active clients.
+    """
+    PURGE_PROBABILITY = 0.001
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+    def _connection(self):
+        # one connection per thread, reopened in forked workers
+        if getattr(self._local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=OFF')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS throttle_counter '
+                '(key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires REAL NOT NULL) WITHOUT ROWID'
+            )
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return self._local.connection
+    def hit(self, key, window, duration):
+        connection, now = self._connection(), time.time()
+        (current,) = connection.execute(
+            'INSERT INTO throttle_counter (key, count, expires) VALUES (?, 1, ?) '
+            'ON CONFLICT(key) DO UPDATE SET count = count + 1 RETURNING count',
+            (f'{key}:{window}', now + duration * 2),
+        ).fetchone()
+        row = connection.execute('SELECT count FROM throttle_counter WHERE key = ?', (f'{key}:{window - 1}',)).fetchone()
+        if random.random() < self.PURGE_PROBABILITY:
+            connection.execute('DELETE FROM throttle_counter WHERE expires < ?', (now,))
+        return row[0] if row else 0, current
+_stores = {}
+def get_counter_store():
+    """The store selected by THROTTLE_STORE ('sqlite' or 'cache'), one per location."""
+    kind = getattr(settings, 'THROTTLE_STORE', 'cache')
+    location = settings.THROTTLE_SQLITE_PATH if kind == 'sqlite' else getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')
+    store = _stores.get((kind, location))
+    if store is None:
+        store = _stores[kind, location] = SQLiteCounterStore(location) if kind == 'sqlite' else CacheCounterStore(location)
+    return store
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    SimpleRateThrottle with a sliding-window counter instead of a timestamp list.
+
+    Each client keeps two integers: the hits of the current fixed window and of
+    the previous one. The rate is estimated as ``previous * (1 - elapsed) +
+    current``, so memory and work per request are constant however high the
+    rate, where DRF's throttles read, trim and rewrite a list of up to
+    ``num_requests`` timestamps on every call. Rejected requests are counted too.
+    """
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        position = self.timer() / self.duration
+        window = int(position)
+        elapsed = position - window
+        previous, current = get_counter_store().hit(self.key, window, self.duration)
+        if previous * (1 - elapsed) + current <= self.num_requests:
+            return True
+        if current > self.num_requests:
+            # over budget even without the previous window: wait for the next one
+            self.wait_seconds = (1 - elapsed) * self.duration
+        else:
+            # until the previous window's weight has decayed enough
+            self.wait_seconds = max(1 - (self.num_requests - current) / previous - elapsed, 0) * self.duration
+        return False
+    def wait(self):
+        return getattr(self, 'wait_seconds', None)
+class ScopedSlidingWindowThrottle(ScopedRateThrottle, SlidingWindowThrottle):
+    """
+    Per-view limits: the view's ``throttle_scope`` picks its rate from
+    DEFAULT_THROTTLE_RATES; clients are identified by user id or IP address.
+    """
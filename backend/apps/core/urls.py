@@ -0,0 +1,6 @@
+from . import views
+from django.urls import path
+
+urlpatterns = [
+    path('', views.HealthCheckView.as_view(), name='health'),
+]
@@ -0,0 +1,210 @@
+import asyncio
+import hmac
+import mimetypes
+import re
+from .bootstrap import cached_page
+from .metrics import request_metrics
+from .serializers import only_columns, parse_sparse_fields, readable_fields, values_serializer
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import connection
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date
+from pathlib import Path
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers may be ``async def``.
+
+    Authentication, permissions and throttling (``initial``) are sync-only in DRF, so
+    they run in a worker thread; the handler itself runs on the event loop under
+    ASGI. Under WSGI Django wraps the view with ``async_to_sync`` and it still works.
+    """
+    view_is_async = True
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+class SparseQuerysetMixin:
+    """
+    GenericAPIView mixin: ``?fields=``/``?omit=`` (see SparseFieldsMixin) also prune
+    the SQL columns with ``.only()``.
+    """
+    def get_sparse_fields(self):
+        return parse_sparse_fields(self.request, readable_fields(self.get_serializer_class()))
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        return queryset if fields is None else only_columns(queryset, self.get_serializer_class(), fields)
+class ValuesListMixin(SparseQuerysetMixin):
+    """
+    Serve a ModelViewSet's ``list`` from ``.values_list()`` rows instead of model
+    instances (see apps.core.serializers.ValuesSerializer); output is unchanged
+    and ``?fields=``/``?omit=`` select the columns fetched. Other read-only actions
+    can call ``list_values`` with their own queryset; ``get_values`` can reshape
+    the rows query.
+    """
+    def list(self, request, *args, **kwargs):
+        return self.list_values(self.filter_queryset(self.get_queryset()))
+    def list_values(self, queryset, paginate=True):
+        fast = values_serializer(self.get_serializer_class(), self.get_sparse_fields())
+        rows = self.get_values(fast, queryset)
+        page = self.paginate_queryset(rows) if paginate else None
+        if page is not None:
+            return self.get_paginated_response(fast.to_representation(page))
+        return Response(fast.to_representation(rows))
+    def get_values(self, fast, queryset):
+        """Rows of ``queryset`` for ``fast``; override to combine querysets (e.g. a UNION)."""
+        return fast.values(queryset)
+def _ping_database():
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+class HealthCheckView(AsyncAPIView):
+    """Liveness/readiness probe: reports whether the default database answers"""
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    async def get(self, request):
+        try:
+            await sync_to_async(_ping_database)()
+        except Exception as exc:
+            return Response({'status': 'error', 'database': str(exc)}, status=503)
+        return Response({'status': 'ok', 'database': 'ok'})
+def metrics_view(request):
+    """
+    Prometheus text-format metrics of this worker process.
+    The scraper must send ``Authorization: Bearer <METRICS_TOKEN>``; without a
+    token the endpoint is only served under DEBUG (404 otherwise), as it exposes
+    per-route traffic and latency.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token and not settings.DEBUG:
+        raise Http404
+    if token:
+        supplied = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+        if not hmac.compare_digest(supplied, token):
+            return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+    return HttpResponse(
+        request_metrics.render_prometheus(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+def spa_view(request):
+    """
+    The SPA shell with its first-paint API data embedded and, on landing routes,
+    the content pre-rendered (see apps.core.bootstrap). Served from the cache
+    until the data changes; revalidated with an ETag.
+    """
+    status, html, etag = cached_page(request)
+    response = get_conditional_response(request, etag=etag) if status == 200 else None
+    if response is None:
+        response = HttpResponse(html, status=status)
+    response['ETag'] = etag
+    patch_cache_control(response, no_cache=True)
+    return response
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+def _parse_range(header, size):
+    """
+    Return the inclusive (start, end) of a single ``bytes=`` range, None when the
+    header should be ignored (malformed or multiple ranges) and False when it
+    cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        suffix = int(last)
+        return (max(0, size - suffix), size - 1) if suffix and size else False
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        return False
+    return start, end
+def _iter_range(f, length, block_size=FileResponse.block_size):
+    try:
+        while length > 0:
+            data = f.read(min(block_size, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+    finally:
+        f.close()
+# media types a browser may render inline from our origin; anything else (HTML, SVG,
+# scripts) could run in the site's context, so it is sent as a download
+INLINE_MEDIA_TYPES = frozenset({
+    'image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/avif', 'application/pdf',
+})
+def serve_media(request, path):
+    """
+    Serve a file from MEDIA_ROOT with ETag/Last-Modified revalidation and single
+    byte-range requests (206), so large downloads can resume and media can seek.
+    Only INLINE_MEDIA_TYPES are served inline; everything else goes out as an
+    ``application/octet-stream`` attachment, always with ``nosniff``.
+    """
+    if not settings.SERVE_MEDIA:
+        raise Http404
+    try:
+        fullpath = Path(safe_join(settings.MEDIA_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404
+    if not fullpath.is_file():
+        raise Http404
+    stat = fullpath.stat()
+    size = stat.st_size
+    etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+    last_modified = http_date(stat.st_mtime)
+    content_type = mimetypes.guess_type(fullpath.name)[0]
+    inline = content_type in INLINE_MEDIA_TYPES
+    if not inline:
+        content_type = 'application/octet-stream'
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    byte_range = None
+    if response is None:
+        if request.method == 'GET' and 'Range' in request.headers:
+            if_range = request.headers.get('If-Range')
+            if not if_range or if_range in (etag, last_modified):
+                byte_range = _parse_range(request.headers['Range'], size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+        elif byte_range:
+            start, end = byte_range
+            f = fullpath.open('rb')
+            f.seek(start)
+            response = StreamingHttpResponse(_iter_range(f, end - start + 1), status=206, content_type=content_type)
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = str(end - start + 1)
+        else:
+            response = FileResponse(fullpath.open('rb'), content_type=content_type, as_attachment=not inline)
+    if byte_range and not inline:
+        response['Content-Disposition'] = content_disposition_header(True, fullpath.name)
+    response['X-Content-Type-Options'] = 'nosniff'
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'MEDIA_MAX_AGE', 0))
+    return response
@@ -1,10 +1,11 @@
+from apps.core.views import AsyncAPIView
 from rest_framework import status
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
-from rest_framework.views import APIView
 
-class FileUploadAPIView(APIView):
-    parser_classes = []
-    def post(self, request):
+class FileUploadAPIView(AsyncAPIView):
+    parser_classes = [MultiPartParser, FormParser]
+    async def post(self, request):
         f = None
         for k in ('file', 'upload', 'image'):
             f = request.FILES.get(k) if hasattr(request, 'FILES') else None
@@ -12,4 +13,4 @@ class FileUploadAPIView(APIView):
                 break
         if not f:
             return Response({'error': 'file not provided'}, status=status.HTTP_400_BAD_REQUEST)
-        return Response({'url': f'/media/uploads/{f.name}'}, status=status.HTTP_201_CREATED)
\ No newline at end of file
+        return Response({'url': f'/media/uploads/{f.name}'}, status=status.HTTP_201_CREATED)
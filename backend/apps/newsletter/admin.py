@@ -0,0 +1,10 @@
+from .models import Subscriber
+from django.contrib import admin
+
+@admin.register(Subscriber)
+class SubscriberAdmin(admin.ModelAdmin):
+    """Admin configuration for the Subscriber model"""
+    list_display = ('email', 'is_active', 'subscribed_at', 'unsubscribed_at')
+    list_filter = ('is_active', 'subscribed_at')
+    search_fields = ('email',)
+    date_hierarchy = 'subscribed_at'
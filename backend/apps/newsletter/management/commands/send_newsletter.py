@@ -0,0 +1,38 @@
+from apps.newsletter.sender import CampaignSender
+from django.core.management.base import BaseCommand, CommandError
+from pathlib import Path
+
+class Command(BaseCommand):
+    help = 'Send a newsletter campaign to all active subscribers'
+    def add_arguments(self, parser):
+        parser.add_argument('--subject', required=True)
+        parser.add_argument('--body', help='Plain-text body')
+        parser.add_argument('--body-file', help='Read the plain-text body from a file')
+        parser.add_argument('--html-file', help='Optional HTML alternative')
+        parser.add_argument('--chunk-size', type=int, help='Subscribers fetched per query')
+        parser.add_argument('--rate', type=float, help='Maximum messages per second (0 = unlimited)')
+        parser.add_argument('--per-connection', type=int, help='Messages sent before the SMTP connection is recycled')
+    def handle(self, *args, **options):
+        body = options['body']
+        if options['body_file']:
+            body = Path(options['body_file']).read_text(encoding='utf-8')
+        if not body:
+            raise CommandError('Either --body or --body-file is required')
+        html_body = None
+        if options['html_file']:
+            html_body = Path(options['html_file']).read_text(encoding='utf-8')
+        sender = CampaignSender(
+            subject=options['subject'],
+            body=body,
+            html_body=html_body,
+            chunk_size=options['chunk_size'],
+            rate_limit=options['rate'],
+            messages_per_connection=options['per_connection'],
+        )
+        result = sender.send()
+        if result['aborted']:
+            raise CommandError(f"SMTP server unreachable: stopped after {result['sent']} messages "
+                               f"({result['failed']} failed); the remaining subscribers were not mailed")
+        self.stdout.write(self.style.SUCCESS(
+            f"Sent {result['sent']} messages ({result['failed']} failed) in {result['seconds']}s"
+        ))
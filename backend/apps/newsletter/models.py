@@ -0,0 +1,47 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+class SubscriberManager(models.Manager):
+    """Manager that keeps subscribe/unsubscribe idempotent on the normalized email"""
+    @staticmethod
+    def normalize_email(email):
+        return (email or '').strip().lower()
+    def subscribe(self, email):
+        """Subscribe an email address. Return (subscriber, created_or_reactivated)."""
+        email = self.normalize_email(email)
+        subscriber, created = self.get_or_create(email=email)
+        if created:
+            return subscriber, True
+        if not subscriber.is_active:
+            subscriber.is_active = True
+            subscriber.unsubscribed_at = None
+            subscriber.save(update_fields=['is_active', 'unsubscribed_at'])
+            return subscriber, True
+        return subscriber, False
+    def unsubscribe(self, email):
+        """Deactivate an email address. Return the number of rows changed (0 or 1)."""
+        email = self.normalize_email(email)
+        return self.filter(email=email, is_active=True).update(
+            is_active=False,
+            unsubscribed_at=timezone.now(),
+        )
+class Subscriber(models.Model):
+    """Newsletter subscriber identified by a normalized (lower-cased) email"""
+    email = models.EmailField(_('email address'), unique=True)
+    is_active = models.BooleanField(_('is active'), default=True)
+    subscribed_at = models.DateTimeField(_('subscribed at'), auto_now_add=True)
+    unsubscribed_at = models.DateTimeField(_('unsubscribed at'), null=True, blank=True)
+    objects = SubscriberManager()
+    class Meta:
+        verbose_name = _('subscriber')
+        verbose_name_plural = _('subscribers')
+        ordering = ('-subscribed_at',)
+        indexes = [
+            models.Index(fields=['is_active', 'id'], name='newsletter_active_id_idx'),
+        ]
+    def save(self, *args, **kwargs):
+        self.email = Subscriber.objects.normalize_email(self.email)
+        super().save(*args, **kwargs)
+    def __str__(self):
+        return self.email
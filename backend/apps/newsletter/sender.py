@@ -0,0 +1,136 @@
+import logging
+import time
+from .models import Subscriber
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+logger = logging.getLogger(__name__)
+
+class RateLimiter:
+    """
+    Token bucket limiting how many messages are handed to the SMTP server per second.
+    A rate of 0 (or None) disables throttling.
+    """
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate or 0)
+        self.capacity = float(burst or max(self.rate, 1))
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            self.sleep((1 - self.tokens) / self.rate)
+            self.updated = self.clock()
+            self.tokens = 1
+        self.tokens -= 1
+def iter_subscriber_chunks(chunk_size, queryset=None):
+    """
+    Yield lists of (pk, email) for active subscribers using keyset pagination on the
+    primary key, so only one chunk is ever held in memory.
+    """
+    if queryset is None:
+        queryset = Subscriber.objects.filter(is_active=True)
+    queryset = queryset.order_by('pk').values_list('pk', 'email')
+    last_pk = 0
+    while True:
+        chunk = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1][0]
+class CampaignAborted(Exception):
+    """The SMTP server could not be reached again; the rest of the campaign was not sent."""
+class CampaignSender:
+    """
+    Send one campaign to every active subscriber.
+
+    Subscribers are streamed in chunks of ``chunk_size``; all mail goes through a
+    single SMTP connection that is recycled every ``messages_per_connection``
+    messages (or after an SMTP error) and throttled by ``rate_limit`` messages/second.
+    A reconnect is retried with backoff; if it keeps failing the campaign stops
+    rather than letting the backend open a connection per message.
+    """
+    def __init__(self, subject, body, html_body=None, from_email=None, chunk_size=None,
+                 rate_limit=None, messages_per_connection=None, connection=None, sleep=time.sleep):
+        self.subject = subject
+        self.body = body
+        self.html_body = html_body
+        self.from_email = from_email or settings.DEFAULT_FROM_EMAIL
+        self.chunk_size = chunk_size or settings.NEWSLETTER_CHUNK_SIZE
+        self.messages_per_connection = messages_per_connection or settings.NEWSLETTER_MESSAGES_PER_CONNECTION
+        if rate_limit is None:
+            rate_limit = settings.NEWSLETTER_RATE_LIMIT
+        self.limiter = RateLimiter(rate_limit)
+        self.connection = connection or get_connection()
+        self.connected = False
+        self.reconnect_attempts = settings.NEWSLETTER_RECONNECT_ATTEMPTS
+        self.reconnect_backoff = settings.NEWSLETTER_RECONNECT_BACKOFF
+        self.sleep = sleep
+        self.sent = 0
+        self.failed = 0
+    def build_message(self, email):
+        message = EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.body,
+            from_email=self.from_email,
+            to=[email],
+            connection=self.connection,
+        )
+        if self.html_body:
+            message.attach_alternative(self.html_body, 'text/html')
+        return message
+    def reconnect(self):
+        """
+        Replace the SMTP connection, retrying the open ``reconnect_attempts`` times
+        with doubling pauses; raises CampaignAborted when none succeeds.
+        """
+        try:
+            self.connection.close()
+        except Exception:
+            pass
+        self.connected = False
+        for attempt in range(self.reconnect_attempts):
+            if attempt:
+                self.sleep(self.reconnect_backoff * 2 ** (attempt - 1))
+            try:
+                self.connection.open()
+            except Exception as exc:
+                logger.warning(f"Newsletter SMTP reconnect failed (attempt {attempt + 1}): {exc}")
+                continue
+            self.connected = True
+            return
+        raise CampaignAborted(f'SMTP server unreachable after {self.reconnect_attempts} attempts')
+    def send(self, queryset=None):
+        """Send the campaign and return a dict with sent/failed counters and whether it was aborted."""
+        started = time.monotonic()
+        on_connection, aborted = 0, False
+        self.connection.open()
+        self.connected = True
+        try:
+            for chunk in iter_subscriber_chunks(self.chunk_size, queryset):
+                for _pk, email in chunk:
+                    if not self.connected or on_connection >= self.messages_per_connection:
+                        self.reconnect()
+                        on_connection = 0
+                    self.limiter.acquire()
+                    try:
+                        self.sent += self.connection.send_messages([self.build_message(email)])
+                    except Exception as exc:
+                        self.failed += 1
+                        logger.warning(f"Newsletter delivery to {email} failed: {exc}")
+                        self.connected = False  # reopened before the next message
+                        continue
+                    on_connection += 1
+        except CampaignAborted as exc:
+            logger.error(f"Newsletter campaign aborted after {self.sent} messages: {exc}")
+            aborted = True
+        finally:
+            self.connection.close()
+        elapsed = time.monotonic() - started
+        return {'sent': self.sent, 'failed': self.failed, 'seconds': round(elapsed, 2), 'aborted': aborted}
@@ -0,0 +1,15 @@
+from .models import Subscriber
+from apps.core.serializers import SparseFieldsMixin
+from rest_framework import serializers
+
+class SubscriberSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Serializer for the Subscriber model"""
+    class Meta:
+        model = Subscriber
+        fields = ['id', 'email', 'is_active', 'subscribed_at', 'unsubscribed_at']
+        read_only_fields = fields
+class SubscriptionSerializer(serializers.Serializer):
+    """Input serializer for subscribe/unsubscribe requests"""
+    email = serializers.EmailField()
+    def validate_email(self, value):
+        return Subscriber.objects.normalize_email(value)
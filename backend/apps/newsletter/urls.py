@@ -0,0 +1,9 @@
+from . import views
+from django.urls import path
+
+app_name = 'newsletter'
+urlpatterns = [
+    path('subscribe/', views.SubscribeAPIView.as_view(), name='subscribe'),
+    path('unsubscribe/', views.UnsubscribeAPIView.as_view(), name='unsubscribe'),
+    path('subscribers/', views.SubscriberListAPIView.as_view(), name='subscribers'),
+]
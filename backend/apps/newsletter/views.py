@@ -0,0 +1,41 @@
+from .models import Subscriber
+from .serializers import SubscriberSerializer, SubscriptionSerializer
+from apps.core.views import SparseQuerysetMixin
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+class SubscribeAPIView(APIView):
+    """Subscribe an email address; repeating the call is harmless"""
+    permission_classes = [permissions.AllowAny]
+    def post(self, request):
+        serializer = SubscriptionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        subscriber, changed = Subscriber.objects.subscribe(serializer.validated_data['email'])
+        return Response(
+            {'status': 'subscribed', 'email': subscriber.email},
+            status=status.HTTP_201_CREATED if changed else status.HTTP_200_OK
+        )
+class UnsubscribeAPIView(APIView):
+    """Unsubscribe an email address; unknown or inactive emails are not an error"""
+    permission_classes = [permissions.AllowAny]
+    def post(self, request):
+        serializer = SubscriptionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        email = serializer.validated_data['email']
+        Subscriber.objects.unsubscribe(email)
+        return Response({'status': 'unsubscribed', 'email': email}, status=status.HTTP_200_OK)
+class SubscriberListAPIView(SparseQuerysetMixin, generics.ListAPIView):
+    """Paginated list of subscribers for the admin panel"""
+    serializer_class = SubscriberSerializer
+    permission_classes = [permissions.IsAdminUser]
+    def get_queryset(self):
+        queryset = Subscriber.objects.all()
+        is_active = self.request.query_params.get('is_active', None)
+        if is_active is not None:
+            is_active = is_active.lower() in ('true', '1', 't')
+            queryset = queryset.filter(is_active=is_active)
+        search = self.request.query_params.get('search', None)
+        if search:
+            queryset = queryset.filter(email__icontains=search.strip().lower())
+        return queryset
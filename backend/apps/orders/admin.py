@@ -1,8 +1,53 @@
-from .models import Order
-from django.contrib import admin
+from .archive import restore_orders
+from .models import ArchivedOrder, Order, OrderItem
+from django.contrib import admin, messages
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.utils.html import format_html
+from urllib.parse import urlencode
 
+class OrderItemInline(admin.TabularInline):
+    model = OrderItem
+    extra = 0
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
     list_display = ('id', 'user', 'product_name', 'quantity', 'total_price', 'status', 'created_at')
     list_filter = ('status', 'created_at')
-    search_fields = ('product_name', 'user__username')
\ No newline at end of file
+    search_fields = ('product_name', 'user__email')
+    inlines = [OrderItemInline]
+    def change_view(self, request, object_id, form_url='', extra_context=None):
+        # links to an order keep working after it is archived
+        if str(object_id).isdigit() and not Order.objects.filter(pk=object_id).exists() \
+                and ArchivedOrder.objects.filter(pk=object_id).exists():
+            return redirect('admin:orders_archivedorder_change', object_id)
+        return super().change_view(request, object_id, form_url, extra_context)
+    def changelist_view(self, request, extra_context=None):
+        query = request.GET.get('q')
+        if query:
+            archive = ArchivedOrderAdmin(ArchivedOrder, self.admin_site)
+            matches, _duplicates = archive.get_search_results(request, ArchivedOrder.objects.all(), query)
+            count = matches.count()
+            if count:
+                url = reverse('admin:orders_archivedorder_changelist') + '?' + urlencode({'q': query})
+                messages.info(request, format_html('{} archived orders also match: <a href="{}">show them</a>', count, url))
+        return super().changelist_view(request, extra_context)
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(admin.ModelAdmin):
+    """Read-only: archived orders change only by being restored to the hot table"""
+    list_display = ('id', 'user', 'product_name', 'quantity', 'total_price', 'status', 'created_at', 'archived_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('product_name', 'user__email')
+    date_hierarchy = 'created_at'
+    actions = ['restore']
+    def has_add_permission(self, request):
+        return False
+    def has_change_permission(self, request, obj=None):
+        return False
+    def has_view_permission(self, request, obj=None):
+        return request.user.has_perm('orders.view_order') or super().has_view_permission(request, obj)
+    @admin.action(description='Restore to active orders', permissions=['restore'])
+    def restore(self, request, queryset):
+        restored = restore_orders(list(queryset.values_list('pk', flat=True)))
+        self.message_user(request, f'{restored} orders restored.', messages.SUCCESS)
+    def has_restore_permission(self, request):
+        return request.user.has_perm('orders.add_order')
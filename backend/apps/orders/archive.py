@@ -0,0 +1,107 @@
+"""
+Archival of cold orders.
+
+Delivered and cancelled orders untouched for ORDER_ARCHIVE_AFTER_DAYS are moved,
+ORDER_ARCHIVE_BATCH_SIZE at a time, from the hot ``orders_order`` table to
+ArchivedOrder (same ids, items as JSON; their OrderEvents are dropped, they are
+long past ORDER_EVENTS_RETENTION_HOURS). Each batch is one short transaction and
+batches are ORDER_ARCHIVE_BATCH_PAUSE seconds apart, so live traffic keeps the
+database between them. Candidates are walked by primary key, so a run reads the
+hot table once.
+
+Reads stay transparent: ``with_archived`` unions both tables for the orders
+list, OrderViewSet falls back to the archive for a single order, and an archived
+order that is written to is restored first (``restore_orders``).
+"""
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+ARCHIVABLE_STATUSES = ('delivered', 'cancelled')
+ORDER_FIELDS = ('id', 'user_id', 'product_name', 'product_id', 'quantity', 'total_price', 'status', 'created_at',
+                'updated_at')
+ITEM_FIELDS = ('id', 'product_name', 'quantity', 'paper_type', 'size_width', 'size_height', 'has_lamination',
+               'has_uv_coating')
+
+@dataclass
+class ArchiveStats:
+    archived: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+def archivable(cutoff):
+    from .models import Order
+    return Order.objects.filter(status__in=ARCHIVABLE_STATUSES, updated_at__lt=cutoff)
+def _archive_batch(ids, cutoff):
+    from .models import ArchivedOrder, Order, OrderItem
+    with transaction.atomic():
+        # re-read under the lock: an order may have changed since it was picked
+        rows = list(archivable(cutoff).filter(pk__in=ids).select_for_update().values(*ORDER_FIELDS))
+        if not rows:
+            return 0
+        ids = [row['id'] for row in rows]
+        items = defaultdict(list)
+        for item in OrderItem.objects.filter(order_id__in=ids).order_by('pk').values('order_id', *ITEM_FIELDS):
+            items[item.pop('order_id')].append(item)
+        ArchivedOrder.objects.bulk_create([ArchivedOrder(**row, items=items[row['id']]) for row in rows])
+        Order.objects.filter(pk__in=ids).delete()
+    return len(rows)
+def archive_orders(older_than_days=None, batch_size=None, pause=None, limit=None, dry_run=False, progress=None):
+    """
+    Move archivable orders last updated more than ``older_than_days`` ago to
+    ArchivedOrder; stops after ``limit`` orders. ``progress(stats)`` is called
+    after every batch. With ``dry_run`` only counts them.
+    """
+    days = settings.ORDER_ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    batch_size = batch_size or settings.ORDER_ARCHIVE_BATCH_SIZE
+    pause = settings.ORDER_ARCHIVE_BATCH_PAUSE if pause is None else pause
+    cutoff = timezone.now() - timedelta(days=days)
+    stats, started = ArchiveStats(), time.perf_counter()
+    if dry_run:
+        stats.archived = archivable(cutoff).count() if limit is None else min(limit, archivable(cutoff).count())
+        return stats
+    cursor = 0
+    while limit is None or stats.archived < limit:
+        size = batch_size if limit is None else min(batch_size, limit - stats.archived)
+        ids = list(archivable(cutoff).filter(pk__gt=cursor).order_by('pk').values_list('pk', flat=True)[:size])
+        if not ids:
+            break
+        cursor = ids[-1]
+        stats.archived += _archive_batch(ids, cutoff)
+        stats.batches += 1
+        stats.seconds = time.perf_counter() - started
+        if progress:
+            progress(stats)
+        if pause and len(ids) == size:
+            time.sleep(pause)
+    stats.seconds = time.perf_counter() - started
+    return stats
+def restore_orders(ids):
+    """Move archived orders (and their items) back to the hot table; returns how many."""
+    from .models import ArchivedOrder, Order, OrderItem
+    with transaction.atomic():
+        archived = list(ArchivedOrder.objects.filter(pk__in=ids).select_for_update())
+        if not archived:
+            return 0
+        orders = [Order(**{field: getattr(row, field) for field in ORDER_FIELDS}) for row in archived]
+        Order.objects.bulk_create(orders)
+        # bulk_create stamps auto_now(_add) fields with the current time: put the originals back
+        for order, row in zip(orders, archived):
+            order.created_at, order.updated_at = row.created_at, row.updated_at
+        Order.objects.bulk_update(orders, ['created_at', 'updated_at'])
+        OrderItem.objects.bulk_create([OrderItem(order_id=row.id, **item) for row in archived for item in row.items])
+        ArchivedOrder.objects.filter(pk__in=[row.id for row in archived]).delete()
+    return len(archived)
+def with_archived(orders, archived, lookups):
+    """
+    ``values_list(*lookups)`` rows of two querysets, hot ``orders`` and
+    ``archived``, as one UNION ALL newest first (then by id, so pages are stable
+    when timestamps tie), which still paginates and counts in SQL.
+    """
+    # the sort columns must be selected; extra trailing columns are ignored by ValuesSerializer
+    columns = (*lookups, *(name for name in ('created_at', 'id') if name not in lookups))
+    hot, cold = (queryset.order_by().values_list(*columns) for queryset in (orders, archived))
+    return hot.union(cold, all=True).order_by('-created_at', '-id')
@@ -0,0 +1,272 @@
+"""
+Gang-sheet planning: pending order items that share paper and finish are packed
+together onto press sheets and emitted as print runs.
+
+Packing is a shelf heuristic (first-fit decreasing height) on the usable sheet
+area, so every layout is guillotine-cuttable. The whole sheets an item fills on
+its own are emitted first as a single run, so large quantities cost no more
+than small ones; the remainder is placed a row at a time, with first-fit over
+shelves and sheets answered by a max-tree instead of a scan. Identical mixed
+sheets are merged into one run with an impression count.
+"""
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from django.conf import settings
+
+EPS = 1e-9
+PLANNED_STATUSES = ('pending', 'confirmed')
+
+@dataclass(frozen=True)
+class PrintItem:
+    id: int
+    order_id: int
+    width: float  # trimmed size, cm
+    height: float
+    quantity: int
+    paper_type: str
+    has_lamination: bool = False
+    has_uv_coating: bool = False
+    @property
+    def group(self):
+        return self.paper_type, self.has_lamination, self.has_uv_coating
+@dataclass
+class PrintRun:
+    group: tuple
+    sheet: tuple  # (width, height), cm
+    impressions: int  # identical sheets printed
+    placements: tuple  # (item id, x, y, width, height, rotated) of one sheet
+    @property
+    def used_area(self):
+        return sum(p[3] * p[4] for p in self.placements)
+    @property
+    def waste(self):
+        """Share of each sheet (margins included) not covered by pieces."""
+        return 1 - self.used_area / (self.sheet[0] * self.sheet[1])
+@dataclass
+class GroupPlan:
+    group: tuple
+    sheet: tuple
+    runs: list = field(default_factory=list)
+    unplaced: list = field(default_factory=list)  # items larger than every sheet
+    @property
+    def impressions(self):
+        return sum(run.impressions for run in self.runs)
+    @property
+    def waste(self):
+        total = self.impressions * self.sheet[0] * self.sheet[1]
+        return 1 - sum(run.used_area * run.impressions for run in self.runs) / total if total else 0.0
+def _orient(item, width, height, gutter):
+    """
+    (w, h, rotated) for a piece in a usable ``width`` x ``height`` area: the way
+    round that fits more copies per sheet, short side up on a tie; None if it
+    cannot fit either way.
+    """
+    best = None
+    for w, h, rotated in ((item.width, item.height, False), (item.height, item.width, True)):
+        if w <= width - gutter + EPS and h <= height - gutter + EPS:
+            key = (int((width + EPS) // (w + gutter)) * int((height + EPS) // (h + gutter)), -h)
+            if best is None or key > best[0]:
+                best = key, (w, h, rotated)
+    return best and best[1]
+class _FirstFit:
+    """Max-tree over slots: the lowest slot whose value reaches a threshold, in O(log n)."""
+    def __init__(self):
+        self.size, self.count, self.tree = 1, 0, [-1.0, -1.0]
+    def append(self, value):
+        if self.count == self.size:
+            leaves = self.tree[self.size:] + [-1.0] * self.size
+            self.size *= 2
+            self.tree = [-1.0] * self.size + leaves
+            for node in range(self.size - 1, 0, -1):
+                self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+        self.count += 1
+        self.update(self.count - 1, value)
+        return self.count - 1
+    def update(self, index, value):
+        node = index + self.size
+        self.tree[node] = value
+        node //= 2
+        tree = self.tree
+        while node:
+            value = max(tree[2 * node], tree[2 * node + 1])
+            if tree[node] == value:
+                break
+            tree[node] = value
+            node //= 2
+    def first(self, threshold, start=0):
+        tree, size = self.tree, self.size
+        if tree[1] < threshold:
+            return None
+        if not start:
+            node = 1
+            while node < size:
+                node = 2 * node if tree[2 * node] >= threshold else 2 * node + 1
+            return node - size
+        stack = [(1, 0, size)]
+        while stack:
+            node, low, high = stack.pop()
+            if high <= start or tree[node] < threshold:
+                continue
+            if node >= size:
+                return low
+            middle = (low + high) // 2
+            stack.append((2 * node + 1, middle, high))
+            stack.append((2 * node, low, middle))
+        return None
+class SheetPacker:
+    """
+    Shelf packing state for one group on one sheet size. Items can be added in
+    several batches: later arrivals first-fit into the shelves and sheets left
+    open by earlier ones, which is what makes incremental planning cheap.
+    """
+    def __init__(self, sheet, gutter=0.0, margin=0.0):
+        self.sheet, self.gutter, self.margin = sheet, gutter, margin
+        # a gutter after every piece, and the same added to the usable area, keeps the arithmetic to one addition
+        self.width, self.height = sheet[0] - 2 * margin + gutter, sheet[1] - 2 * margin + gutter
+        self.group, self.full_runs, self.unplaced = None, [], []
+        self.sheets = []  # [used height, placements] of sheets that mix items
+        self.shelves = []  # [sheet index, y, shelf height, used width]
+        self.sheet_room, self.shelf_room = _FirstFit(), _FirstFit()  # height left per sheet, width left per shelf
+    def add(self, items):
+        oriented = []
+        for item in items:
+            fit = _orient(item, self.width, self.height, self.gutter)
+            if fit is None:
+                self.unplaced.append(item)
+            elif item.quantity > 0:
+                oriented.append((fit[1] + self.gutter, fit[0] + self.gutter, fit[2], item))
+        if not oriented:
+            return self
+        self.group = oriented[0][3].group
+        oriented.sort(key=lambda o: (-o[0], -o[1], o[3].id))
+        for h, w, rotated, item in oriented:
+            remaining = self._full_sheets(item, w, h, rotated)
+            index = 0
+            while remaining:
+                index = self.shelf_room.first(w - EPS, index)
+                if index is None:
+                    break
+                shelf = self.shelves[index]
+                if shelf[2] + EPS < h:  # a shorter shelf left by an earlier batch
+                    index += 1
+                    continue
+                count = min(remaining, int((self.width - shelf[3] + EPS) // w))
+                self._place(shelf[0], shelf[3], shelf[1], count, w, h, rotated, item)
+                shelf[3] += count * w
+                self.shelf_room.update(index, self.width - shelf[3])
+                remaining -= count
+            columns = int((self.width + EPS) // w)
+            while remaining:
+                target = self.sheet_room.first(h - EPS)
+                if target is None:
+                    self.sheets.append([0.0, []])
+                    target = self.sheet_room.append(self.height)
+                y = self.sheets[target][0]
+                self.sheets[target][0] += h
+                self.sheet_room.update(target, self.height - self.sheets[target][0])
+                count = min(remaining, columns)
+                self._place(target, 0.0, y, count, w, h, rotated, item)
+                remaining -= count
+                self.shelves.append([target, y, h, count * w])
+                self.shelf_room.append(self.width - count * w)
+        return self
+    def _full_sheets(self, item, w, h, rotated):
+        """Emit the whole sheets of ``item`` alone as one run; returns the quantity left over."""
+        columns, rows = int((self.width + EPS) // w), int((self.height + EPS) // h)
+        per_sheet = columns * rows
+        if item.quantity < per_sheet:
+            return item.quantity
+        x0, y0, pw, ph = self.margin, self.margin, w - self.gutter, h - self.gutter
+        grid = tuple((item.id, x0 + c * w, y0 + r * h, pw, ph, rotated) for r in range(rows) for c in range(columns))
+        self.full_runs.append(PrintRun(item.group, self.sheet, item.quantity // per_sheet, grid))
+        return item.quantity % per_sheet
+    def _place(self, sheet_index, x, y, count, w, h, rotated, item):
+        x0, y, pw, ph = self.margin + x, self.margin + y, w - self.gutter, h - self.gutter
+        self.sheets[sheet_index][1].extend((item.id, x0 + i * w, y, pw, ph, rotated) for i in range(count))
+    def runs(self):
+        """Full-sheet runs plus the mixed sheets, identical layouts merged into one run."""
+        layouts = Counter(tuple(placements) for _used, placements in self.sheets)
+        return self.full_runs + [PrintRun(self.group, self.sheet, count, layout) for layout, count in layouts.items()]
+def pack(items, sheet, gutter=0.0, margin=0.0):
+    """Pack one group of compatible items onto ``sheet``; returns (runs, unplaced items)."""
+    packer = SheetPacker(sheet, gutter, margin).add(items)
+    return packer.runs(), packer.unplaced
+def plan_group(items, sheet_sizes, gutter=0.0, margin=0.0):
+    """Pack ``items`` (one group) on every sheet size and keep the packer using the least paper."""
+    best = None
+    for sheet in sheet_sizes:
+        packer = SheetPacker(sheet, gutter, margin).add(items)
+        sheets = sum(run.impressions for run in packer.full_runs) + len(packer.sheets)
+        key = (len(packer.unplaced), sheets * sheet[0] * sheet[1], sheets)
+        if best is None or key < best[0]:
+            best = key, packer
+    return best[1]
+def _setting_sizes():
+    return [tuple(float(v) for v in size.lower().split('x')) for size in settings.GANG_SHEET_SIZES]
+class GangPlanner:
+    """
+    Keeps the pending items by compatible group. ``plan()`` packs new arrivals
+    into the open space of their group's current sheets, and fully re-packs
+    (every sheet size, tallest pieces first) only the groups that lost or
+    changed an item, or that are planned for the first time.
+    """
+    def __init__(self, sheet_sizes=None, gutter=None, margin=None):
+        self.sheet_sizes = sheet_sizes or _setting_sizes()
+        self.gutter = settings.GANG_SHEET_GUTTER if gutter is None else gutter
+        self.margin = settings.GANG_SHEET_MARGIN if margin is None else margin
+        self.groups = defaultdict(dict)  # group -> {item id: item}
+        self.packers, self.plans = {}, {}
+        self.dirty, self.arrived = set(), defaultdict(list)
+    def add(self, items):
+        for item in items:
+            if self.remove([item.id]) or item.group not in self.packers:
+                self.dirty.add(item.group)
+            else:
+                self.arrived[item.group].append(item)
+            self.groups[item.group][item.id] = item
+    def remove(self, item_ids):
+        """Drop items (e.g. their order was cancelled or printed); returns how many were known."""
+        removed = 0
+        for item_id in item_ids:
+            for group, members in self.groups.items():
+                if members.pop(item_id, None) is not None:
+                    self.dirty.add(group)
+                    removed += 1
+                    break
+        return removed
+    def sync(self, items):
+        """
+        Make the pending set exactly ``items``: drop the ones no longer there and
+        (re-)add the new or edited ones, so a size, quantity or paper change, or
+        an older order moving back to pending, is planned on the next ``plan()``.
+        """
+        current = {item.id: item for item in items}
+        known = {item_id: item for members in self.groups.values() for item_id, item in members.items()}
+        self.remove(known.keys() - current.keys())
+        self.add([item for item_id, item in current.items() if known.get(item_id) != item])
+    def plan(self):
+        """Plans for every group, sorted by group, and how many groups were fully re-packed."""
+        for group in self.dirty:
+            members = self.groups.get(group)
+            if members:
+                self.packers[group] = plan_group(sorted(members.values(), key=lambda i: i.id), self.sheet_sizes, self.gutter, self.margin)
+            else:
+                self.groups.pop(group, None)
+                self.packers.pop(group, None)
+                self.plans.pop(group, None)
+        for group, items in self.arrived.items():
+            if group not in self.dirty:
+                self.packers[group].add(items)
+        for group in self.dirty | set(self.arrived):
+            packer = self.packers.get(group)
+            if packer is not None:
+                self.plans[group] = GroupPlan(group, packer.sheet, packer.runs(), list(packer.unplaced))
+        repacked, self.dirty, self.arrived = len(self.dirty), set(), defaultdict(list)
+        return [self.plans[group] for group in sorted(self.plans)], repacked
+def pending_items():
+    """PrintItems of order items whose order is still pending or confirmed."""
+    from .models import OrderItem
+    rows = OrderItem.objects.filter(order__status__in=PLANNED_STATUSES).values_list(
+        'id', 'order_id', 'size_width', 'size_height', 'quantity', 'paper_type', 'has_lamination', 'has_uv_coating',
+    )
+    return [PrintItem(pk, order_id, float(w), float(h), *rest) for pk, order_id, w, h, *rest in rows.iterator(chunk_size=2000)]
@@ -0,0 +1,238 @@
+"""
+Order status changes as server-sent events.
+
+Every status change is stored as an OrderEvent (see Order.save) whose primary key
+is the SSE event id, so a reconnecting client resumes from ``Last-Event-ID`` by
+reading the log. Open streams do not poll it: each one sleeps on an asyncio.Event
+that the broadcaster sets when one of its user's orders changes. Changes
+committed in this process wake streams directly (``transaction.on_commit``);
+changes made by other workers are picked up by one poller per process, which
+reads new event ids every ORDER_EVENTS_POLL_INTERVAL seconds while the process has
+listeners, so the database sees one small query per worker per interval however
+many clients are connected.
+
+Under ASGI, config.asgi serves the stream with EventStreamApp instead of the
+Django view, so an open stream is one coroutine rather than a parked thread.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict
+from asgiref.sync import sync_to_async
+from datetime import timedelta
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connection
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from urllib.parse import parse_qs
+
+class Listener:
+    """One open stream: an asyncio.Event that any thread can set."""
+    __slots__ = ('loop', 'event')
+    def __init__(self, loop):
+        self.loop, self.event = loop, asyncio.Event()
+    def wake(self):
+        try:
+            self.loop.call_soon_threadsafe(self.event.set)
+        except RuntimeError:  # the loop has closed
+            pass
+    async def wait(self, timeout):
+        """True when woken, False after ``timeout`` seconds of silence."""
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self.event.clear()
+        return True
+class Broadcaster:
+    """Per-process registry of open streams by user id, plus the cross-worker poller."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._listeners = defaultdict(set)
+        self._pollers = {}  # event loop -> poller task
+        self._purged_at = 0.0
+    def __len__(self):
+        with self._lock:
+            return sum(len(listeners) for listeners in self._listeners.values())
+    def subscribe(self, user_id):
+        """Register a stream for ``user_id``; must be called from its event loop."""
+        loop = asyncio.get_running_loop()
+        listener = Listener(loop)
+        with self._lock:
+            self._listeners[user_id].add(listener)
+        poller = self._pollers.get(loop)
+        if poller is None or poller.done():
+            self._pollers[loop] = loop.create_task(self._poll(loop))
+        return listener
+    def unsubscribe(self, user_id, listener):
+        with self._lock:
+            listeners = self._listeners.get(user_id)
+            if listeners is not None:
+                listeners.discard(listener)
+                if not listeners:
+                    del self._listeners[user_id]
+    def publish(self, user_id):
+        """Wake every stream of ``user_id`` in this process; safe to call from any thread."""
+        with self._lock:
+            listeners = list(self._listeners.get(user_id, ()))
+        for listener in listeners:
+            listener.wake()
+    def _listening(self, loop):
+        with self._lock:
+            return any(listener.loop is loop for listeners in self._listeners.values() for listener in listeners)
+    async def _poll(self, loop):
+        """Wake local streams for events written by other processes; exits when the loop has no listeners."""
+        cursor = await sync_to_async(latest_event_id)()
+        try:
+            while self._listening(loop):
+                await asyncio.sleep(settings.ORDER_EVENTS_POLL_INTERVAL)
+                rows = await sync_to_async(_new_events)(cursor)
+                for user_id in {user_id for _pk, user_id in rows}:
+                    self.publish(user_id)
+                if rows:
+                    cursor = rows[-1][0]
+                if time.monotonic() - self._purged_at > 3600:
+                    self._purged_at = time.monotonic()
+                    await sync_to_async(purge_events)()
+        finally:
+            if self._pollers.get(loop) is asyncio.current_task():
+                del self._pollers[loop]
+broadcaster = Broadcaster()
+def latest_event_id(user_id=None):
+    from .models import OrderEvent
+    events = OrderEvent.objects.all() if user_id is None else OrderEvent.objects.filter(user_id=user_id)
+    return events.order_by('-id').values_list('id', flat=True).first() or 0
+def _new_events(after):
+    from .models import OrderEvent
+    return list(OrderEvent.objects.filter(id__gt=after).order_by('id').values_list('id', 'user_id'))
+def events_after(user_id, after, limit):
+    from .models import OrderEvent
+    rows = OrderEvent.objects.filter(user_id=user_id, id__gt=after).order_by('id')
+    return list(rows.values('id', 'order_id', 'status', 'previous_status', 'created_at')[:limit])
+def purge_events():
+    """Delete events older than ORDER_EVENTS_RETENTION_HOURS; they can no longer be resumed from."""
+    from .models import OrderEvent
+    cutoff = timezone.now() - timedelta(hours=settings.ORDER_EVENTS_RETENTION_HOURS)
+    return OrderEvent.objects.filter(created_at__lt=cutoff).delete()[0]
+def format_event(event):
+    data = {'order': event['order_id'], 'status': event['status'], 'previous_status': event['previous_status'] or None,
+            'at': event['created_at']}
+    return f'id: {event["id"]}\nevent: order.status\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n'
+def parse_event_id(value):
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return None
+async def order_event_stream(user_id, last_event_id=None):
+    """
+    SSE body for one user: events after ``last_event_id`` (or only new ones when it
+    is None), then live events, with a comment line every ORDER_EVENTS_HEARTBEAT
+    seconds so proxies keep the connection open. Ends after
+    ORDER_EVENTS_MAX_STREAM seconds; EventSource reconnects with Last-Event-ID.
+    """
+    listener = broadcaster.subscribe(user_id)  # before reading the log, so nothing slips in between
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.ORDER_EVENTS_MAX_STREAM
+    limit = settings.ORDER_EVENTS_REPLAY_LIMIT
+    try:
+        yield f'retry: {settings.ORDER_EVENTS_RETRY_MS}\n\n'
+        if last_event_id is None:
+            last_event_id = await sync_to_async(latest_event_id)(user_id)
+        woken = True
+        while True:
+            # the log is only read on start and when woken; a heartbeat costs no query
+            if woken:
+                events = await sync_to_async(events_after)(user_id, last_event_id, limit)
+                if events:
+                    last_event_id = events[-1]['id']
+                    yield ''.join(format_event(event) for event in events)
+                    if len(events) == limit:
+                        continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            woken = await listener.wait(min(settings.ORDER_EVENTS_HEARTBEAT, remaining))
+            if not woken:
+                yield ': keep-alive\n\n'
+    finally:
+        broadcaster.unsubscribe(user_id, listener)
+class StreamTokenAuthentication(JWTAuthentication):
+    """
+    JWT from the Authorization header or, because EventSource cannot send headers,
+    from the ``access_token`` query parameter.
+    """
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        raw_token = request.query_params.get('access_token')
+        if result is not None or not raw_token:
+            return result
+        validated_token = self.get_validated_token(raw_token)
+        return self.get_user(validated_token), validated_token
+def _authenticate(raw_token):
+    """User id for a valid access token of an active user, else None."""
+    if not connection.in_atomic_block:  # a new stream is a new request: drop a stale or broken connection
+        close_old_connections()
+    authentication = JWTAuthentication()
+    try:
+        return authentication.get_user(authentication.get_validated_token(raw_token)).pk
+    except (AuthenticationFailed, InvalidToken):
+        return None
+def _cors_headers(origin):
+    allowed = settings.CORS_ALLOW_ALL_ORIGINS or origin in getattr(settings, 'CORS_ALLOWED_ORIGINS', ())
+    if not origin or not allowed:
+        return []
+    return [(b'access-control-allow-origin', origin.encode('latin-1')), (b'access-control-allow-credentials', b'true'),
+            (b'vary', b'Origin')]
+async def _wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+class EventStreamApp:
+    """
+    ASGI wrapper that serves GET ``path`` (the order event stream) itself and
+    passes everything else to Django.
+
+    Django's ASGI handler runs each request's sync code (middleware,
+    authentication) on a thread of its own and keeps that thread until the
+    response ends, so every open stream would park a thread and a database
+    connection. Here a stream is a coroutine: the token check and the event reads
+    run on asgiref's shared sync thread, the same one the poller uses. Accepts the
+    same ``Authorization: Bearer``/``?access_token=`` and ``Last-Event-ID``/
+    ``?last_event_id=`` as OrderEventStreamView.
+    """
+    def __init__(self, app, path):
+        self.app, self.path = app, path
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] != self.path or scope['method'] != 'GET':
+            return await self.app(scope, receive, send)
+        headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in scope['headers']}
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        raw_token = headers.get('authorization', '').removeprefix('Bearer ').strip() or query.get('access_token', [''])[0]
+        user_id = await sync_to_async(_authenticate)(raw_token) if raw_token else None
+        cors = _cors_headers(headers.get('origin'))
+        if user_id is None:
+            await send({'type': 'http.response.start', 'status': 401, 'headers': [
+                (b'content-type', b'application/json'), (b'www-authenticate', b'Bearer realm="api"'), *cors,
+            ]})
+            await send({'type': 'http.response.body', 'body': b'{"detail":"Authentication credentials were not provided or are invalid."}'})
+            return
+        last_event_id = parse_event_id(headers.get('last-event-id') or query.get('last_event_id', [None])[0])
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream'), (b'cache-control', b'no-cache'), (b'x-accel-buffering', b'no'), *cors,
+        ]})
+        stream = order_event_stream(user_id, last_event_id)
+        async def pump():
+            async for chunk in stream:
+                await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        streaming, disconnect = asyncio.ensure_future(pump()), asyncio.ensure_future(_wait_for_disconnect(receive))
+        try:
+            await asyncio.wait({streaming, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (streaming, disconnect):
+                task.cancel()
+            await asyncio.gather(streaming, disconnect, return_exceptions=True)
+            await stream.aclose()
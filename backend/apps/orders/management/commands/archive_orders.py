@@ -0,0 +1,24 @@
+from apps.orders.archive import archive_orders
+from django.core.management.base import BaseCommand
+
+class Command(BaseCommand):
+    help = 'Move delivered and cancelled orders untouched for a while to the archive table, in throttled batches'
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, metavar='DAYS', help='default: ORDER_ARCHIVE_AFTER_DAYS')
+        parser.add_argument('--batch-size', type=int, help='orders per transaction (default: ORDER_ARCHIVE_BATCH_SIZE)')
+        parser.add_argument('--pause', type=float, help='seconds between batches (default: ORDER_ARCHIVE_BATCH_PAUSE)')
+        parser.add_argument('--limit', type=int, help='stop after this many orders')
+        parser.add_argument('--dry-run', action='store_true', help='only count the orders that would move')
+    def handle(self, *args, **options):
+        def progress(stats):
+            if options['verbosity'] > 1:
+                self.stdout.write(f'  {stats.archived} orders in {stats.batches} batches, {stats.seconds:.1f}s')
+        stats = archive_orders(
+            options['older_than'], options['batch_size'], options['pause'], options['limit'], options['dry_run'], progress,
+        )
+        if options['dry_run']:
+            self.stdout.write(f'[dry run] {stats.archived} orders would be archived')
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'{stats.archived} orders archived in {stats.batches} batches ({stats.seconds:.2f}s)'
+        ))
@@ -0,0 +1,47 @@
+from apps.orders.batching import GangPlanner, pending_items
+from django.core.management.base import BaseCommand, CommandError
+import json
+import time
+
+class Command(BaseCommand):
+    help = 'Group pending order items by paper and finish and pack them onto gang sheets as print runs'
+    def add_arguments(self, parser):
+        parser.add_argument('--sheet', action='append', help='sheet size in cm as WxH (repeatable; default: GANG_SHEET_SIZES)')
+        parser.add_argument('--gutter', type=float, help='gap between pieces in cm (default: GANG_SHEET_GUTTER_CM)')
+        parser.add_argument('--margin', type=float, help='unprintable sheet border in cm (default: GANG_SHEET_MARGIN_CM)')
+        parser.add_argument('--json', action='store_true', help='print the plan with every placement as JSON')
+        parser.add_argument('--watch', type=float, metavar='SECONDS', help='keep polling the pending items and re-plan the groups that gained, lost or changed one')
+    def handle(self, *args, **options):
+        try:
+            sizes = [tuple(float(v) for v in size.lower().split('x')) for size in options['sheet']] if options['sheet'] else None
+        except ValueError:
+            raise CommandError('--sheet must look like 70x100')
+        planner = GangPlanner(sizes, options['gutter'], options['margin'])
+        planner.add(pending_items())
+        while True:
+            started = time.perf_counter()
+            plans, replanned = planner.plan()
+            self.report(plans, replanned, time.perf_counter() - started, options['json'])
+            if not options['watch']:
+                return
+            time.sleep(options['watch'])
+            # the whole pending set is re-read and diffed, so edits and orders moving back to pending are seen too
+            planner.sync(pending_items())
+    def report(self, plans, replanned, seconds, as_json):
+        if as_json:
+            self.stdout.write(json.dumps([{
+                'paper_type': plan.group[0], 'lamination': plan.group[1], 'uv_coating': plan.group[2],
+                'sheet': plan.sheet, 'impressions': plan.impressions, 'waste': round(plan.waste, 4),
+                'unplaced': [item.id for item in plan.unplaced],
+                'runs': [{'impressions': run.impressions, 'waste': round(run.waste, 4), 'placements': [[pk, round(x, 2), round(y, 2), round(w, 2), round(h, 2), rotated] for pk, x, y, w, h, rotated in run.placements]}
+                         for run in plan.runs],
+            } for plan in plans], ensure_ascii=False))
+            return
+        for plan in plans:
+            paper, lamination, uv = plan.group
+            finish = '+'.join(name for name, on in (('lamination', lamination), ('uv', uv)) if on) or 'plain'
+            self.stdout.write(f'{paper} / {finish}: {len(plan.runs)} runs, {plan.impressions} sheets '
+                              f'{plan.sheet[0]:g}x{plan.sheet[1]:g}, waste {plan.waste:.1%}')
+            for item in plan.unplaced:
+                self.stderr.write(f'  item {item.id} ({item.width:g}x{item.height:g}) does not fit any sheet')
+        self.stdout.write(self.style.SUCCESS(f'{len(plans)} groups ({replanned} re-planned) in {seconds * 1000:.1f} ms'))
@@ -1,5 +1,7 @@
+from .events import broadcaster
 from django.conf import settings
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
 
 class Order(models.Model):
     STATUS_CHOICES = [
@@ -22,4 +24,65 @@ class Order(models.Model):
         ordering = ['-created_at']
     def __str__(self):
         user_repr = self.user.username if self.user else 'anonymous'
-        return f'Order {self.id} - {user_repr} - {self.product_name}'
\ No newline at end of file
+        return f'Order {self.id} - {user_repr} - {self.product_name}'
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_status = instance.__dict__.get('status')
+        return instance
+    def save(self, *args, **kwargs):
+        """Saving a new status also logs an OrderEvent and wakes the owner's event streams (queryset.update() does not)."""
+        previous = getattr(self, '_saved_status', None)
+        if 'status' not in self.__dict__ or self.status == previous or self.user_id is None:
+            super().save(*args, **kwargs)
+            self._saved_status = self.__dict__.get('status', previous)
+            return
+        using = kwargs.get('using')
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+            OrderEvent.objects.using(using).create(user_id=self.user_id, order=self, status=self.status, previous_status=previous or '')
+        transaction.on_commit(lambda user_id=self.user_id: broadcaster.publish(user_id), using=using)
+        self._saved_status = self.status
+class OrderItem(models.Model):
+    """A printed piece of an order; the print attributes decide which jobs can share a press sheet"""
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items')
+    product_name = models.CharField(max_length=255, blank=True)
+    quantity = models.PositiveIntegerField('تعداد', default=1)
+    paper_type = models.SlugField('نوع کاغذ', max_length=100)
+    size_width = models.DecimalField('عرض (سانتی‌متر)', max_digits=6, decimal_places=2)
+    size_height = models.DecimalField('ارتفاع (سانتی‌متر)', max_digits=6, decimal_places=2)
+    has_lamination = models.BooleanField('لمینت', default=False)
+    has_uv_coating = models.BooleanField('پوشش UV', default=False)
+    def __str__(self):
+        return f'{self.quantity} x {self.size_width}x{self.size_height} {self.paper_type}'
+class OrderEvent(models.Model):
+    """One status transition; the primary key is the SSE event id clients resume from"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='order_events')
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='events')
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    previous_status = models.CharField(max_length=20, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    class Meta:
+        indexes = [models.Index(fields=['user', 'id'])]
+class ArchivedOrder(models.Model):
+    """
+    A delivered or cancelled Order moved out of the hot table by apps.orders.archive;
+    same id and columns, its items kept as JSON. The API and admin read both tables.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_orders', db_index=False)  # covered by the (user, -created_at) index
+    product_name = models.CharField(max_length=255)
+    product_id = models.IntegerField(null=True, blank=True)
+    quantity = models.IntegerField(default=1)
+    total_price = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    created_at = models.DateTimeField(db_index=True)
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    items = models.JSONField(default=list, blank=True, encoder=DjangoJSONEncoder)
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [models.Index(fields=['user', '-created_at'])]
+    def __str__(self):
+        user_repr = self.user.username if self.user else 'anonymous'
+        return f'Archived order {self.id} - {user_repr} - {self.product_name}'
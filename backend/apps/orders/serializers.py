@@ -1,7 +1,8 @@
 from .models import Order
+from apps.core.serializers import SparseFieldsMixin
 from rest_framework import serializers
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = [
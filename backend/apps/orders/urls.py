@@ -3,6 +3,7 @@ from django.urls import path
 
 urlpatterns = [
     path('', views.OrderViewSet.as_view({'get': 'list', 'post': 'create'}), name='order-list'),
+    path('events/', views.OrderEventStreamView.as_view(), name='order-events'),
     path('<int:pk>/', views.OrderViewSet.as_view({'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}), name='order-detail'),
     path('<int:pk>/cancel/', views.OrderViewSet.as_view({'post': 'cancel'}), name='order-cancel'),
 ]
\ No newline at end of file
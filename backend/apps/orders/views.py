@@ -1,11 +1,19 @@
-from .models import Order
+from .archive import restore_orders, with_archived
+from .events import StreamTokenAuthentication, order_event_stream, parse_event_id
+from .models import ArchivedOrder, Order
 from .serializers import OrderSerializer
+from apps.core.renderers import EventStreamRenderer, FastJSONRenderer
+from apps.core.views import AsyncAPIView, ValuesListMixin
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, status
+from rest_framework.authentication import SessionAuthentication
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(ValuesListMixin, viewsets.ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     def get_permissions(self):
@@ -17,6 +25,24 @@ class OrderViewSet(viewsets.ModelViewSet):
         if user and user.is_authenticated:
             return Order.objects.filter(user=user)
         return Order.objects.none()
+    def get_archived_queryset(self):
+        user = self.request.user
+        if user and user.is_authenticated:
+            return ArchivedOrder.objects.filter(user=user)
+        return ArchivedOrder.objects.none()
+    def get_values(self, fast, queryset):
+        """The list includes archived orders (see apps.orders.archive)."""
+        return with_archived(queryset, self.get_archived_queryset(), fast.lookups)
+    def get_object(self):
+        """Falls back to the archive; an archived order is restored before it is modified."""
+        try:
+            return super().get_object()
+        except Http404:
+            archived = get_object_or_404(self.get_archived_queryset(), pk=self.kwargs['pk'])
+            if self.action not in ('update', 'partial_update', 'destroy'):
+                return archived
+            restore_orders([archived.pk])
+            return super().get_object()
     def perform_create(self, serializer):
         user = self.request.user if self.request.user.is_authenticated else None
         serializer.save(user=user)
@@ -27,4 +53,26 @@ class OrderViewSet(viewsets.ModelViewSet):
             order.status = 'cancelled'
             order.save()
             return Response({'status': 'سفارش لغو شد'})
-        return Response({'error': 'نمی‌توان این سفارش را لغو کرد'}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        return Response({'error': 'نمی‌توان این سفارش را لغو کرد'}, status=status.HTTP_400_BAD_REQUEST)
+class OrderEventStreamView(AsyncAPIView):
+    """
+    Server-sent events with the authenticated user's order status changes, so the
+    SPA does not have to poll ``/orders/``. Resumes after ``Last-Event-ID`` (or
+    ``?last_event_id=``); EventSource clients pass the JWT as ``?access_token=``.
+    Only served under ASGI: Django's WSGI handler buffers an async stream until it
+    ends, so the client would get nothing while a worker stays busy. There the view
+    answers 503 and the SPA polls the order instead.
+    """
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [StreamTokenAuthentication, SessionAuthentication]
+    renderer_classes = [EventStreamRenderer, FastJSONRenderer]
+    async def get(self, request):
+        if not isinstance(request._request, ASGIRequest):
+            return Response({'detail': 'Order events are only streamed by ASGI workers.'},
+                            status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        last_event_id = parse_event_id(request.headers.get('Last-Event-ID') or request.query_params.get('last_event_id'))
+        response = StreamingHttpResponse(order_event_stream(request.user.pk, last_event_id), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # nginx would otherwise buffer the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
@@ -0,0 +1,17 @@
+from .models import PortfolioItem
+from django.contrib import admin
+from django.utils.html import format_html
+
+@admin.register(PortfolioItem)
+class PortfolioItemAdmin(admin.ModelAdmin):
+    list_display = ('title', 'category', 'swatch', 'width', 'height', 'is_featured', 'is_active', 'created_at')
+    list_filter = ('category', 'is_featured', 'is_active')
+    search_fields = ('title', 'client', 'description')
+    prepopulated_fields = {'slug': ('title',)}
+    readonly_fields = ('width', 'height', 'dominant_color', 'preview')
+    @admin.display(description='color')
+    def swatch(self, obj):
+        return format_html('<span style="display:inline-block;width:1.5em;height:1em;background:{}"></span>', obj.dominant_color)
+    @admin.display(description='placeholder')
+    def preview(self, obj):
+        return format_html('<img src="{}" width="{}" style="filter:blur(4px)">', obj.placeholder, 160) if obj.placeholder else '-'
@@ -0,0 +1,40 @@
+import base64
+import io
+from PIL import Image, ImageOps
+
+# longest side of the blurred placeholder; the browser scales it up behind a CSS blur
+PLACEHOLDER_SIZE = 8
+PALETTE_SIZE = 64
+# EXIF orientation tag; values 5-8 swap width and height
+ORIENTATION = 0x0112
+
+def image_metadata(file):
+    """
+    Layout metadata for an uploaded image, computed once at ingest: display
+    width/height (EXIF orientation applied), the dominant colour as ``#rrggbb``
+    and a tiny PNG data URI to show while the real image loads.
+    """
+    file.seek(0)
+    with Image.open(file) as image:
+        width, height = image.size
+        if image.getexif().get(ORIENTATION) in (5, 6, 7, 8):
+            width, height = height, width
+        # decode JPEGs at a reduced scale: only a thumbnail is needed from here on
+        image.draft('RGB', (PALETTE_SIZE, PALETTE_SIZE))
+        small = ImageOps.exif_transpose(image).convert('RGB')
+    small.thumbnail((PALETTE_SIZE, PALETTE_SIZE))
+    # most frequent colour of a 5-colour palette: closer to what the eye picks than the mean
+    palette = small.quantize(colors=5)
+    _count, index = max(palette.getcolors())
+    red, green, blue = palette.getpalette()[index * 3:index * 3 + 3]
+    placeholder = small.copy()
+    placeholder.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    buffer = io.BytesIO()
+    placeholder.save(buffer, 'PNG', optimize=True)
+    file.seek(0)
+    return {
+        'width': width,
+        'height': height,
+        'dominant_color': f'#{red:02x}{green:02x}{blue:02x}',
+        'placeholder': 'data:image/png;base64,' + base64.b64encode(buffer.getvalue()).decode(),
+    }
@@ -0,0 +1,39 @@
+from .images import image_metadata
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+class PortfolioItem(models.Model):
+    """
+    A gallery item. Width, height, dominant colour and the blur placeholder are
+    computed from the image when it is saved, so listings never open files.
+    """
+    title = models.CharField(_('title'), max_length=200)
+    slug = models.SlugField(_('slug'), max_length=200, unique=True)
+    category = models.SlugField(_('category'), max_length=100, db_index=True)
+    client = models.CharField(_('client'), max_length=200, blank=True)
+    year = models.PositiveSmallIntegerField(_('year'), null=True, blank=True)
+    description = models.TextField(_('description'), blank=True)
+    image = models.ImageField(_('image'), upload_to='portfolio/%Y/%m/')
+    width = models.PositiveIntegerField(_('width'), default=0, editable=False)
+    height = models.PositiveIntegerField(_('height'), default=0, editable=False)
+    dominant_color = models.CharField(_('dominant color'), max_length=7, blank=True, editable=False)
+    placeholder = models.TextField(_('placeholder'), blank=True, editable=False)
+    is_featured = models.BooleanField(_('is featured'), default=False)
+    is_active = models.BooleanField(_('is active'), default=True)
+    created_at = models.DateTimeField(_('created at'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('updated at'), auto_now=True)
+    class Meta:
+        verbose_name = _('portfolio item')
+        verbose_name_plural = _('portfolio items')
+        ordering = ('-created_at', '-id')
+        indexes = [models.Index(fields=['category', '-created_at'])]
+    def __str__(self):
+        return self.title
+    def save(self, *args, **kwargs):
+        # a new upload is an uncommitted file; a stored image keeps its metadata
+        if self.image and not getattr(self.image, '_committed', True):
+            for name, value in image_metadata(self.image).items():
+                setattr(self, name, value)
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'width', 'height', 'dominant_color', 'placeholder'}
+        super().save(*args, **kwargs)
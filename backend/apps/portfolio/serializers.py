@@ -0,0 +1,17 @@
+from .models import PortfolioItem
+from apps.core.serializers import SparseFieldsMixin
+from rest_framework import serializers
+
+class PortfolioListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Gallery tile: everything the masonry grid needs to lay out before images load"""
+    class Meta:
+        model = PortfolioItem
+        fields = ['id', 'title', 'slug', 'category', 'image', 'width', 'height', 'dominant_color', 'placeholder', 'is_featured']
+class PortfolioItemSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Serializer for a single portfolio item"""
+    class Meta:
+        model = PortfolioItem
+        fields = [
+            'id', 'title', 'slug', 'category', 'client', 'year', 'description', 'image', 'width', 'height',
+            'dominant_color', 'placeholder', 'is_featured', 'created_at', 'updated_at',
+        ]
@@ -1,9 +1,32 @@
-from rest_framework.response import Response
-from rest_framework.views import APIView
+from .models import PortfolioItem
+from .serializers import PortfolioItemSerializer, PortfolioListSerializer
+from apps.core.views import AsyncAPIView, SparseQuerysetMixin
+from asgiref.sync import sync_to_async
+from rest_framework import generics, mixins
+from rest_framework.pagination import CursorPagination
 
-class PortfolioListAPIView(APIView):
-    def get(self, request):
-        return Response({'count': 0, 'results': []})
-class PortfolioDetailAPIView(APIView):
-    def get(self, request, pk):
-        return Response({'detail': 'یافت نشد'}, status=404)
\ No newline at end of file
+class PortfolioCursorPagination(CursorPagination):
+    """Stable pages while items are added: no COUNT and no OFFSET scans"""
+    ordering = ('-created_at', '-id')
+    page_size = 24
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+class PortfolioListAPIView(SparseQuerysetMixin, mixins.ListModelMixin, AsyncAPIView, generics.GenericAPIView):
+    """Active gallery items, newest first; ``?category=`` narrows to one category"""
+    serializer_class = PortfolioListSerializer
+    pagination_class = PortfolioCursorPagination
+    def get_queryset(self):
+        queryset = PortfolioItem.objects.filter(is_active=True).defer('description')
+        category = self.request.query_params.get('category')
+        if category:
+            queryset = queryset.filter(category=category)
+        return queryset
+    async def get(self, request, *args, **kwargs):
+        # the query, cursor pagination and serialization are sync; one thread hop for all of them
+        return await sync_to_async(self.list)(request, *args, **kwargs)
+class PortfolioDetailAPIView(SparseQuerysetMixin, mixins.RetrieveModelMixin, AsyncAPIView, generics.GenericAPIView):
+    """A single active portfolio item with its description"""
+    serializer_class = PortfolioItemSerializer
+    queryset = PortfolioItem.objects.filter(is_active=True)
+    async def get(self, request, *args, **kwargs):
+        return await sync_to_async(self.retrieve)(request, *args, **kwargs)
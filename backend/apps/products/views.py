@@ -1,4 +1,6 @@
 from .serializers import ProductSerializer, CategorySerializer, ReviewSerializer
+from apps.core.throttling import ScopedSlidingWindowThrottle
+from apps.core.views import AsyncAPIView
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -14,8 +16,10 @@ class ProductListAPIView(APIView):
 class ProductDetailAPIView(APIView):
     def get(self, request, slug):
         return Response({'detail': 'محصول یافت نشد'}, status=status.HTTP_404_NOT_FOUND)
-class CalculatePriceAPIView(APIView):
-    def post(self, request, product_id):
+class CalculatePriceAPIView(AsyncAPIView):
+    throttle_classes = [ScopedSlidingWindowThrottle]
+    throttle_scope = 'calculate_price'
+    async def post(self, request, product_id):
         data = request.data or {}
         quantity = int(data.get('quantity', 1))
         base_price = float(data.get('base_price', 0) or 0)
@@ -23,6 +27,8 @@ class CalculatePriceAPIView(APIView):
         total = round(unit_price * quantity, 2)
         return Response({'unit_price': unit_price, 'quantity': quantity, 'total_price': total})
 class ReviewsAPIView(APIView):
+    throttle_classes = [ScopedSlidingWindowThrottle]
+    throttle_scope = 'reviews'
     def post(self, request, product_id):
         serializer = ReviewSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -1,7 +1,8 @@
 from .models import Service
+from apps.core.serializers import SparseFieldsMixin
 from rest_framework import serializers
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for the Service model"""
     class Meta:
         model = Service
@@ -1,10 +1,10 @@
 from .models import Service
 from .serializers import ServiceSerializer
+from apps.core.views import ValuesListMixin
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
-from rest_framework.response import Response
 
-class ServiceViewSet(viewsets.ModelViewSet):
+class ServiceViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """
     A viewset for viewing and editing service instances.
     """
@@ -27,6 +27,4 @@ class ServiceViewSet(viewsets.ModelViewSet):
         """
         Return a list of all active services.
         """
-        active_services = self.get_queryset().filter(is_active=True)
-        serializer = self.get_serializer(active_services, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return self.list_values(self.get_queryset().filter(is_active=True), paginate=False)
\ No newline at end of file
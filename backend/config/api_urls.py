@@ -1,22 +1,9 @@
+from apps.core.schema import live_schema_view, schema_json_view, schema_ui_view
+from django.conf import settings
 from django.urls import path, include
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
-from rest_framework import permissions
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-schema_view = get_schema_view(
-   openapi.Info(
-      title="Daidi Print API",
-      default_version='v1',
-      description="API documentation for Daidi Print",
-      terms_of_service="https://www.daidi-print.com/terms/",
-      contact=openapi.Contact(email="contact@daidi-print.com"),
-      license=openapi.License(name="BSD License"),
-   ),
-   public=True,
-   permission_classes=(permissions.AllowAny,),
-)
 router = DefaultRouter()
 urlpatterns = [
     path('v1/', include([
@@ -31,8 +18,20 @@ urlpatterns = [
         path('portfolio/', include('apps.portfolio.urls')),
         path('orders/', include('apps.orders.urls')),
         path('contact/', include('apps.contact.urls')),
+        path('newsletter/', include('apps.newsletter.urls')),
+        path('health/', include('apps.core.urls')),
         path('', include(router.urls)),
     ])),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
-]
\ No newline at end of file
+]
+if settings.OPENAPI_SCHEMA_PREBUILT:
+    urlpatterns += [
+        path('openapi.json', schema_json_view, name='schema-json'),
+        path('swagger/', schema_ui_view('swagger'), name='schema-swagger-ui'),
+        path('redoc/', schema_ui_view('redoc'), name='schema-redoc'),
+    ]
+else:
+    urlpatterns += [
+        path('openapi.json', live_schema_view(), name='schema-json'),
+        path('swagger/', live_schema_view('swagger'), name='schema-swagger-ui'),
+        path('redoc/', live_schema_view('redoc'), name='schema-redoc'),
+    ]
@@ -0,0 +1,17 @@
+from django.core.asgi import get_asgi_application
+import os
+
+"""
+ASGI config for config project.
+It exposes the ASGI callable as a module-level variable named ``application``.
+Run it with uvicorn workers so slow clients and uploads do not pin a whole worker:
+    gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker
+For more information on this file, see
+https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
+"""
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django_application = get_asgi_application()
+# open order event streams bypass the middleware stack: one coroutine each instead of a parked thread
+# (imported here because it needs the app registry)
+from apps.orders.events import EventStreamApp
+application = EventStreamApp(django_application, '/api/v1/orders/events/')
@@ -0,0 +1,52 @@
+"""
+Gunicorn config tuned for fast cold starts and scale-ups.
+
+    gunicorn config.wsgi:application -c config/gunicorn.py
+
+``preload_app`` imports Django, the URLconf and every app once in the master;
+workers are then forked from it and share those pages copy-on-write. ``gc.freeze()``
+moves the preloaded objects out of the collector's generations so the first GC
+pass in a worker does not touch (and therefore copy) them.
+
+Environment: PORT, WEB_CONCURRENCY, GUNICORN_THREADS, GUNICORN_TIMEOUT,
+GUNICORN_PRELOAD (default true), GUNICORN_WORKER_CLASS (e.g.
+``uvicorn.workers.UvicornWorker`` together with ``config.asgi:application``).
+"""
+import gc
+import multiprocessing
+import os
+
+def _env_bool(name, default):
+    return os.environ.get(name, str(default)).lower() in ('true', '1', 't', 'yes')
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 4)))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+preload_app = _env_bool('GUNICORN_PRELOAD', True)
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 0))
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+accesslog = '-'
+if preload_app:
+    # No collections while the app is being imported; pre_fork freezes the result. This
+    # must run here: gunicorn reads this file first, then imports the preloaded app while
+    # constructing the arbiter, before any server hook (on_starting included) is called.
+    gc.disable()
+def when_ready(server):
+    if not preload_app:
+        return
+    # Resolve the URLconf in the master so views, serializers and DRF are imported
+    # before forking instead of on each worker's first request.
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+def pre_fork(server, worker):
+    if not preload_app:
+        return
+    # Never share a DB socket between processes.
+    from django.db import connections
+    connections.close_all()
+    gc.freeze()
+def post_fork(server, worker):
+    if preload_app:
+        gc.enable()
@@ -2,22 +2,18 @@ from pathlib import Path
 import os
 import environ
 from datetime import timedelta
-from dotenv import load_dotenv
 import dj_database_url
 
 # ------------------ مسیر اصلی پروژه ------------------
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-# ------------------ بارگذاری .env ------------------
-env_path = BASE_DIR / '.env'
-if env_path.exists():
-    load_dotenv(dotenv_path=env_path)
-
-# ------------------ تعریف env ------------------
+# ------------------ تعریف env و بارگذاری .env (فقط یک بار) ------------------
 env = environ.Env(
     DEBUG=(bool, False)
 )
-environ.Env.read_env(env_file=env_path)
+env_path = BASE_DIR / '.env'
+if env_path.exists():
+    environ.Env.read_env(env_file=env_path)
 
 # ------------------ مقادیر اصلی ------------------
 SECRET_KEY = env('SECRET_KEY', default='django-insecure-your-secret-key-here')
@@ -25,15 +21,52 @@ DEBUG = env.bool('DEBUG', default=False)
 ALLOWED_HOSTS = env.list('ALLOWED_HOSTS', default=['*'])
 
 # ------------------ دیتابیس ------------------
+# اتصال‌های پایدار با health check برای هر دو حالت (DATABASE_URL و SQLite پیش‌فرض)
+DB_CONN_MAX_AGE = env.int('DB_CONN_MAX_AGE', default=600)
 DATABASES = {}
 DATABASE_URL = os.environ.get('DATABASE_URL')
 if DATABASE_URL:
-    DATABASES['default'] = dj_database_url.parse(DATABASE_URL, conn_max_age=600)
+    DATABASES['default'] = dj_database_url.parse(
+        DATABASE_URL, conn_max_age=DB_CONN_MAX_AGE, conn_health_checks=True
+    )
 else:
     DATABASES['default'] = env.db(
         'DATABASE_URL',
         default=f'sqlite:///{BASE_DIR / "db.sqlite3"}'
     )
+    DATABASES['default']['CONN_MAX_AGE'] = DB_CONN_MAX_AGE
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+# Read replicaها (اختیاری، با کاما جدا شوند): خواندن‌ها به replica و نوشتن‌ها به default می‌روند
+DATABASE_REPLICA_URLS = env.list('DATABASE_REPLICA_URLS', default=[])
+for i, url in enumerate(DATABASE_REPLICA_URLS, 1):
+    DATABASES[f'replica{i}'] = dj_database_url.parse(
+        url, conn_max_age=DB_CONN_MAX_AGE, conn_health_checks=True, test_options={'MIRROR': 'default'}
+    )
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['apps.core.db.router.PrimaryReplicaRouter'] if DATABASE_REPLICAS else []
+# بعد از هر نوشتن، خواندن‌های همان کلاینت تا این مدت (ثانیه) از default انجام می‌شود
+REPLICA_STICKY_SECONDS = env.int('REPLICA_STICKY_SECONDS', default=5)
+# پروفایل SQLite برای production: WAL، synchronous=NORMAL، mmap، busy_timeout و تراکنش IMMEDIATE
+SQLITE_TUNED = env.bool('SQLITE_TUNED', default=True)
+for database in DATABASES.values():
+    if SQLITE_TUNED and database['ENGINE'] == 'django.db.backends.sqlite3':
+        database['ENGINE'] = 'apps.core.db.sqlite3'
+        database.setdefault('OPTIONS', {}).setdefault('timeout', 20)
+
+# ------------------ فشرده‌سازی پاسخ‌ها ------------------
+# brotli یا gzip بر اساس Accept-Encoding برای پاسخ‌های بزرگ‌تر از API_COMPRESSION_MIN_SIZE بایت
+API_COMPRESSION = env.bool('API_COMPRESSION', default=True)
+API_COMPRESSION_MIN_SIZE = env.int('API_COMPRESSION_MIN_SIZE', default=1024)
+# سطح فشرده‌سازی به ازای content type (پیشوند)؛ انواع دیگر فشرده نمی‌شوند.
+# text/html عمداً نیست: صفحات admin و فرم‌ها توکن CSRF دارند و فشرده‌سازی آن‌ها در برابر BREACH آسیب‌پذیر است
+API_COMPRESSION_LEVELS = {
+    'application/json': {
+        'br': env.int('API_COMPRESSION_BROTLI_QUALITY', default=4),
+        'gzip': env.int('API_COMPRESSION_GZIP_LEVEL', default=6),
+    },
+    'application/vnd.oai.openapi': {'br': 5, 'gzip': 6},
+    'text/plain': {'br': 4, 'gzip': 6},
+}
 
 # ------------------ اپلیکیشن‌ها ------------------
 INSTALLED_APPS = [
@@ -51,6 +84,7 @@ INSTALLED_APPS = [
     'apps.accounts',
     'apps.contact',
     'apps.core',
+    'apps.newsletter',
     'apps.orders',
     'apps.portfolio',
     'apps.products',
@@ -59,7 +93,9 @@ INSTALLED_APPS = [
 
 # ------------------ بقیه تنظیمات ------------------
 MIDDLEWARE = [
+    'apps.core.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -68,9 +104,21 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
+if API_COMPRESSION:
+    MIDDLEWARE.insert(1, 'apps.core.middleware.CompressionMiddleware')
+if DATABASE_REPLICAS:
+    MIDDLEWARE.insert(1, 'apps.core.middleware.ReplicaRoutingMiddleware')
 
 ROOT_URLCONF = 'config.urls'
 
+# ------------------ مانیتورینگ درخواست‌ها ------------------
+# هدر Server-Timing در پاسخ‌ها
+REQUEST_TIMING_HEADER = env.bool('REQUEST_TIMING_HEADER', default=True)
+# درخواست‌های کندتر از این مقدار (میلی‌ثانیه) لاگ می‌شوند (0 = غیرفعال)
+REQUEST_SLOW_LOG_MS = env.int('REQUEST_SLOW_LOG_MS', default=1000)
+# توکن Bearer برای /metrics/؛ اگر خالی باشد /metrics/ فقط با DEBUG در دسترس است
+METRICS_TOKEN = env('METRICS_TOKEN', default='')
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -88,6 +136,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -116,8 +165,48 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# ------------------ سرو فایل‌های استاتیک و مدیا ------------------
+# نام فایل‌ها با hash محتوا، نسخه‌های gzip و brotli در collectstatic و کش immutable از طریق WhiteNoise
+STATIC_FINGERPRINT = env.bool('STATIC_FINGERPRINT', default=not DEBUG)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': 'apps.core.storage.FingerprintedStaticFilesStorage' if STATIC_FINGERPRINT
+        else 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+# فایل‌های بدون hash (مثلاً favicon) این مدت (ثانیه) کش می‌شوند
+WHITENOISE_MAX_AGE = env.int('WHITENOISE_MAX_AGE', default=0 if DEBUG else 3600)
+# سرو MEDIA_ROOT توسط جنگو با پشتیبانی Range (پیش‌فرض فقط با DEBUG؛ در production معمولاً nginx/CDN)
+# فقط تصاویر و PDF در مرورگر نمایش داده می‌شوند، بقیه به صورت دانلود (attachment) ارسال می‌شوند
+SERVE_MEDIA = env.bool('SERVE_MEDIA', default=DEBUG)
+# فایل‌های مدیا این مدت (ثانیه) در مرورگر کش می‌شوند
+MEDIA_MAX_AGE = env.int('MEDIA_MAX_AGE', default=3600)
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# ------------------ کش و محدودسازی نرخ درخواست ------------------
+# مثلاً redis://localhost:6379/0؛ پیش‌فرض حافظه‌ی محلی هر process
+# sqlitecache:///path/cache.sqlite3 = یک فایل SQLite مشترک بین workerهای همین سرور، بدون Redis (apps.core.cache)؛
+# sqlitecache:// یعنی cache.sqlite3 کنار manage.py و ?max_size=67108864 سقف حجم بر حسب بایت
+environ.Env.CACHE_SCHEMES['sqlitecache'] = 'apps.core.cache.SQLiteCache'
+CACHES = {'default': env.cache('CACHE_URL', default='locmemcache://')}
+if CACHES['default']['BACKEND'] == environ.Env.CACHE_SCHEMES['sqlitecache']:
+    CACHES['default']['LOCATION'] = env.url('CACHE_URL').path or str(BASE_DIR / 'cache.sqlite3')
+# شمارنده‌های throttle بین همه‌ی workerها مشترک است:
+# 'sqlite' = یک فایل SQLite محلی (بدون سرور)، 'cache' = CACHES (برای چند سرور، Redis)
+THROTTLE_STORE = env('THROTTLE_STORE', default='sqlite')
+THROTTLE_SQLITE_PATH = env('THROTTLE_SQLITE_PATH', default=str(BASE_DIR / 'throttle.sqlite3'))
+THROTTLE_CACHE_ALIAS = 'default'
+# سقف درخواست برای endpointهای عمومی پرهزینه (به ازای IP یا کاربر). IP کاربران ناشناس پشت proxy
+# (Render، Railway) فقط با NUM_PROXIES=1 درست است؛ با 0 همه IP همان proxy را دارند و یک سقف مشترک می‌گیرند
+THROTTLE_RATES = {
+    'calculate_price': env('THROTTLE_RATE_CALCULATE_PRICE', default='60/min'),
+    'contact': env('THROTTLE_RATE_CONTACT', default='10/hour'),
+    'reviews': env('THROTTLE_RATE_REVIEWS', default='20/hour'),
+    'register': env('THROTTLE_RATE_REGISTER', default='10/hour'),
+}
+
 # ------------------ DRF ------------------
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -128,9 +217,23 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'apps.core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_THROTTLE_RATES': THROTTLE_RATES,
+    # تعداد reverse proxyهای مورد اعتماد مقابل اپ؛ 0 یعنی X-Forwarded-For نادیده گرفته و REMOTE_ADDR
+    # استفاده شود (وگرنه هر کلاینت با XFF جعلی از throttle فرار می‌کند). پشت nginx، Render یا Railway: 1
+    # (render.yaml و railway.json آن را 1 می‌گذارند)
+    'NUM_PROXIES': env.int('NUM_PROXIES', default=0),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
-    'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.coreapi.AutoSchema'
+    'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.openapi.AutoSchema'
 }
 
 SIMPLE_JWT = {
@@ -138,8 +241,22 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': False,
     'BLACKLIST_AFTER_ROTATION': True,
+    # توکن‌های لغوشده (logout) در apps.accounts.denylist رد می‌شوند
+    'AUTH_TOKEN_CLASSES': ('apps.accounts.tokens.AccessToken',),
+    'TOKEN_REFRESH_SERIALIZER': 'apps.accounts.serializers.TokenRefreshSerializer',
 }
 
+# ------------------ لغو توکن‌های JWT ------------------
+# هر worker شناسه‌ی توکن‌های لغوشده را در یک Bloom filter نگه می‌دارد؛ هر چند ثانیه موارد جدید از دیتابیس اضافه می‌شوند
+JWT_DENYLIST_REFRESH_SECONDS = env.float('JWT_DENYLIST_REFRESH_SECONDS', default=5)
+# ردیف‌هایی که تا این چند ثانیه پیش از به‌روزرسانی قبلی ثبت شده‌اند دوباره خوانده می‌شوند تا تراکنش‌هایی که دیر commit می‌شوند جا نمانند
+JWT_DENYLIST_RESCAN_SECONDS = env.float('JWT_DENYLIST_RESCAN_SECONDS', default=60)
+# ظرفیت اولیه و نرخ مثبت کاذب filter (مثبت‌های کاذب فقط یک کوئری اضافه دارند)
+JWT_DENYLIST_CAPACITY = env.int('JWT_DENYLIST_CAPACITY', default=100000)
+JWT_DENYLIST_ERROR_RATE = env.float('JWT_DENYLIST_ERROR_RATE', default=0.001)
+# فاصله‌ی حذف توکن‌های منقضی‌شده و ساخت دوباره‌ی filter (ثانیه)
+JWT_DENYLIST_REBUILD_SECONDS = env.float('JWT_DENYLIST_REBUILD_SECONDS', default=3600)
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 
@@ -154,4 +271,77 @@ SWAGGER_SETTINGS = {
     'USE_SESSION_AUTH': False,
 }
 
+# ------------------ OpenAPI از پیش ساخته ------------------
+# در این حالت schema یک بار (هنگام build یا اولین درخواست) ساخته و روی دیسک ذخیره می‌شود
+OPENAPI_SCHEMA_PREBUILT = env.bool('OPENAPI_SCHEMA_PREBUILT', default=not DEBUG)
+OPENAPI_SCHEMA_PATH = env('OPENAPI_SCHEMA_PATH', default=str(BASE_DIR / 'openapi' / 'openapi.json'))
+OPENAPI_SCHEMA_MAX_AGE = env.int('OPENAPI_SCHEMA_MAX_AGE', default=60 * 60 * 24)
+
 AUTH_USER_MODEL = 'accounts.User'
+
+# ------------------ ایمیل ------------------
+EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = env('EMAIL_HOST', default='localhost')
+EMAIL_PORT = env.int('EMAIL_PORT', default=25)
+EMAIL_USE_TLS = env.bool('EMAIL_USE_TLS', default=False)
+EMAIL_HOST_USER = env('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD', default='')
+EMAIL_TIMEOUT = env.int('EMAIL_TIMEOUT', default=30)
+DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='webmaster@localhost')
+
+# ------------------ خبرنامه ------------------
+# تعداد مشترک‌هایی که در هر کوئری خوانده می‌شود
+NEWSLETTER_CHUNK_SIZE = env.int('NEWSLETTER_CHUNK_SIZE', default=500)
+# حداکثر ایمیل در ثانیه (0 = بدون محدودیت)
+NEWSLETTER_RATE_LIMIT = env.float('NEWSLETTER_RATE_LIMIT', default=10)
+# تعداد ایمیل ارسالی روی یک اتصال SMTP قبل از باز کردن اتصال جدید
+NEWSLETTER_MESSAGES_PER_CONNECTION = env.int('NEWSLETTER_MESSAGES_PER_CONNECTION', default=100)
+# تعداد تلاش برای اتصال دوباره به SMTP و مکث اولیه‌ی بین آن‌ها (ثانیه، هر بار دو برابر)؛ پس از آن ارسال متوقف می‌شود
+NEWSLETTER_RECONNECT_ATTEMPTS = env.int('NEWSLETTER_RECONNECT_ATTEMPTS', default=3)
+NEWSLETTER_RECONNECT_BACKOFF = env.float('NEWSLETTER_RECONNECT_BACKOFF', default=2)
+
+# ------------------ چیدمان گروهی روی شیت چاپ ------------------
+# اندازه شیت‌های قابل استفاده در پرس به سانتی‌متر (عرض x ارتفاع)
+GANG_SHEET_SIZES = env.list('GANG_SHEET_SIZES', default=['70x100', '50x70', '35x50'])
+# فاصله برش بین قطعات روی شیت (سانتی‌متر)
+GANG_SHEET_GUTTER = env.float('GANG_SHEET_GUTTER_CM', default=0.3)
+# حاشیه غیرقابل چاپ دور شیت (گریپر) به سانتی‌متر
+GANG_SHEET_MARGIN = env.float('GANG_SHEET_MARGIN_CM', default=1.0)
+
+# ------------------ رویدادهای وضعیت سفارش (SSE) ------------------
+# هر چند ثانیه هر worker رویدادهای ثبت‌شده در workerهای دیگر را از دیتابیس می‌خواند
+ORDER_EVENTS_POLL_INTERVAL = env.float('ORDER_EVENTS_POLL_INTERVAL', default=2)
+# فاصله‌ی ارسال خط keep-alive روی اتصال‌های بی‌کار (ثانیه)
+ORDER_EVENTS_HEARTBEAT = env.float('ORDER_EVENTS_HEARTBEAT', default=20)
+# حداکثر عمر هر اتصال؛ مرورگر خودکار با Last-Event-ID دوباره وصل می‌شود (ثانیه)
+ORDER_EVENTS_MAX_STREAM = env.float('ORDER_EVENTS_MAX_STREAM', default=900)
+# فاصله‌ی تلاش مجدد مرورگر پس از قطع اتصال (میلی‌ثانیه)
+ORDER_EVENTS_RETRY_MS = env.int('ORDER_EVENTS_RETRY_MS', default=3000)
+# حداکثر رویداد در هر بار خواندن از لاگ
+ORDER_EVENTS_REPLAY_LIMIT = env.int('ORDER_EVENTS_REPLAY_LIMIT', default=100)
+# رویدادهای قدیمی‌تر از این (ساعت) پاک می‌شوند و دیگر قابل ادامه نیستند
+ORDER_EVENTS_RETENTION_HOURS = env.int('ORDER_EVENTS_RETENTION_HOURS', default=72)
+
+# ------------------ پیش‌رندر پوسته‌ی SPA ------------------
+# جنگو خود templates/index.html را سرو می‌کند، داده‌های اولین نمایش (خدمات، دسته‌بندی‌ها، مشخصات شرکت) را در آن جاسازی
+# و صفحات خدمات و محصولات را برای موتورهای جستجو از پیش رندر می‌کند (نیازمند build فرانت‌اند در static/frontend)
+SPA_BOOTSTRAP = env.bool('SPA_BOOTSTRAP', default=False)
+# عمر کش صفحات رندرشده (ثانیه)؛ با تغییر خدمات زودتر باطل می‌شود
+SPA_BOOTSTRAP_CACHE_SECONDS = env.int('SPA_BOOTSTRAP_CACHE_SECONDS', default=300)
+# مشخصات شرکت که در صفحه جاسازی می‌شود (پاسخ /company/settings/ در فرانت‌اند)
+COMPANY = {
+    'name': env('COMPANY_NAME', default='دیجی چاپ و گرافیک'),
+    'description': env('COMPANY_DESCRIPTION', default=''),
+    'phone': env('COMPANY_PHONE', default=''),
+    'email': env('COMPANY_EMAIL', default=''),
+    'address': env('COMPANY_ADDRESS', default=''),
+    'working_hours': env('COMPANY_WORKING_HOURS', default=''),
+}
+
+# ------------------ بایگانی سفارش‌های قدیمی ------------------
+# سفارش‌های تحویل‌شده یا لغوشده‌ای که این تعداد روز تغییری نکرده‌اند به جدول بایگانی منتقل می‌شوند
+ORDER_ARCHIVE_AFTER_DAYS = env.int('ORDER_ARCHIVE_AFTER_DAYS', default=180)
+# تعداد سفارش در هر تراکنش انتقال
+ORDER_ARCHIVE_BATCH_SIZE = env.int('ORDER_ARCHIVE_BATCH_SIZE', default=500)
+# مکث بین دسته‌ها (ثانیه) تا ترافیک عادی دیتابیس را در اختیار داشته باشد
+ORDER_ARCHIVE_BATCH_PAUSE = env.float('ORDER_ARCHIVE_BATCH_PAUSE', default=0.2)
@@ -1,8 +1,9 @@
+from apps.core.views import metrics_view, serve_media, spa_view
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.http import HttpResponse
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.views.generic import RedirectView
 
 def home_view(request):
@@ -13,11 +14,16 @@ def home_view(request):
     <p>Admin Panel: <a href='/admin/'>Django Admin</a></p>
     """)
 urlpatterns = [
-    path('', home_view, name='home'),
+    path('', spa_view if settings.SPA_BOOTSTRAP else home_view, name='home'),
     path('admin/', admin.site.urls),
+    path('metrics/', metrics_view, name='metrics'),
     path('api/', include('config.api_urls')),
     path('api', RedirectView.as_view(url='/api/swagger/', permanent=False)),
 ]
+# serve_media answers 404 unless SERVE_MEDIA is on
+urlpatterns.append(re_path(rf'^{settings.MEDIA_URL.strip("/")}/(?P<path>.+)$', serve_media, name='media'))
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file
+    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+if settings.SPA_BOOTSTRAP:
+    # client-side routes of the SPA (no file extension); must stay last
+    urlpatterns.append(re_path(r'^(?!(?:api|admin|static|media)/)(?!.*\.\w+/?$).+$', spa_view, name='spa'))
\ No newline at end of file
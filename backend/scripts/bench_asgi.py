@@ -0,0 +1,129 @@
+"""
+Compare WSGI (gunicorn sync workers) and ASGI (gunicorn + uvicorn workers) under
+slow clients.
+
+Each run starts the server, opens --slow-clients connections that trickle a POST
+body to /api/v1/contact/ one byte at a time, and meanwhile measures fast GETs to
+/api/v1/health/. Sync workers are pinned by the slow uploads; uvicorn keeps
+reading them on the event loop and keeps answering.
+
+Usage (from backend/):
+  python scripts/bench_asgi.py [--workers 2] [--slow-clients 8] [--requests 100]
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+PROFILES = {
+    'wsgi': ['gunicorn', 'config.wsgi:application'],
+    'asgi': ['gunicorn', 'config.asgi:application', '-k', 'uvicorn.workers.UvicornWorker'],
+}
+def start_server(profile, port, workers):
+    cmd = PROFILES[profile] + ['--bind', f'127.0.0.1:{port}', '--workers', str(workers), '--timeout', '120']
+    env = {**os.environ, 'DEBUG': 'False'}
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/v1/health/', timeout=1):
+                return proc
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f'{profile} server did not start on port {port}')
+def stop_server(proc):
+    proc.send_signal(signal.SIGTERM)
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+def slow_client(port, body_size, delay, stop):
+    body = json.dumps({'message': 'x' * max(body_size - 15, 1)}).encode()
+    try:
+        sock = socket.create_connection(('127.0.0.1', port), timeout=5)
+        sock.sendall(
+            b'POST /api/v1/contact/ HTTP/1.1\r\nHost: localhost\r\n'
+            b'Content-Type: application/json\r\n'
+            + f'Content-Length: {len(body)}\r\n\r\n'.encode()
+        )
+        for i in range(len(body)):
+            if stop.is_set():
+                break
+            sock.sendall(body[i:i + 1])
+            time.sleep(delay)
+        sock.close()
+    except OSError:
+        pass
+def fast_request(port, timeout):
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/v1/health/', timeout=timeout) as r:
+            r.read()
+        return time.perf_counter() - started
+    except (urllib.error.URLError, OSError):
+        return None
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+def run_profile(profile, args, port):
+    proc = start_server(profile, port, args.workers)
+    stop = threading.Event()
+    slow = [
+        threading.Thread(target=slow_client, args=(port, args.body_size, args.delay, stop), daemon=True)
+        for _ in range(args.slow_clients)
+    ]
+    try:
+        for t in slow:
+            t.start()
+        time.sleep(0.5)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(lambda _: fast_request(port, args.timeout), range(args.requests)))
+        elapsed = time.perf_counter() - started
+    finally:
+        stop.set()
+        stop_server(proc)
+    ok = [r * 1000 for r in results if r is not None]
+    return {
+        'profile': profile,
+        'ok': len(ok),
+        'failed': len(results) - len(ok),
+        'throughput_rps': round(len(ok) / elapsed, 1),
+        'p50_ms': round(statistics.median(ok), 1) if ok else None,
+        'p95_ms': round(percentile(ok, 95), 1) if ok else None,
+        'max_ms': round(max(ok), 1) if ok else None,
+    }
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--slow-clients', type=int, default=8)
+    parser.add_argument('--body-size', type=int, default=64, help='bytes each slow client trickles')
+    parser.add_argument('--delay', type=float, default=0.1, help='seconds between trickled bytes')
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--profiles', nargs='*', default=['wsgi', 'asgi'], choices=list(PROFILES))
+    args = parser.parse_args()
+    rows = [run_profile(p, args, args.port + i) for i, p in enumerate(args.profiles)]
+    print(f"{'profile':8} {'ok':>5} {'failed':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for r in rows:
+        print(f"{r['profile']:8} {r['ok']:>5} {r['failed']:>7} {r['throughput_rps']:>8} "
+              f"{str(r['p50_ms']):>8} {str(r['p95_ms']):>8} {str(r['max_ms']):>8}")
+    return 0
+if __name__ == '__main__':
+    sys.exit(main())
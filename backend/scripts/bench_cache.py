@@ -0,0 +1,91 @@
+"""
+get/set/incr throughput of the shared SQLite cache (apps.core.cache.SQLiteCache)
+against Django's LocMemCache and DatabaseCache (on the tuned SQLite backend).
+
+The first table runs each operation ``--ops`` times in one process over
+``--keys`` keys holding a ~1 kB value. The second runs a 90% get / 10% set mix
+from several processes at once, like gunicorn workers sharing one cache;
+LocMemCache is left out there, as every process would only see its own copy.
+Reports operations per second.
+
+Usage (from backend/):
+  python scripts/bench_cache.py [--ops 20000] [--keys 5000] [--workers 4]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+VALUE = {'id': 1, 'title': 'Business cards, 300 g coated', 'description': 'x' * 600, 'prices': list(range(50))}
+def make_caches(tmp, keys):
+    from apps.core.cache import SQLiteCache
+    from django.core.cache import caches
+    from django.core.cache.backends.locmem import LocMemCache
+    return {
+        'locmem': LocMemCache('bench', {'OPTIONS': {'MAX_ENTRIES': keys * 2}}),
+        'database': caches['default'],
+        'sqlite': SQLiteCache(os.path.join(tmp, 'cache.sqlite3'), {'OPTIONS': {'MAX_ENTRIES': keys * 2}}),
+    }
+def rate(operation, ops):
+    started = time.perf_counter()
+    for i in range(ops):
+        operation(i)
+    return ops / (time.perf_counter() - started)
+def mixed(name, tmp, keys, ops, seed):
+    from django.db import connections
+    connections.close_all()  # a forked worker opens its own connections
+    cache, rng = make_caches(tmp, keys)[name], random.Random(seed)
+    for _ in range(ops):
+        key = f'k{rng.randrange(keys)}'
+        if rng.random() < 0.9:
+            cache.get(key)
+        else:
+            cache.set(key, VALUE)
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ops', type=int, default=20000, help='operations per measurement')
+    parser.add_argument('--keys', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=4, help='processes for the shared run')
+    args = parser.parse_args()
+    tmp = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f'sqlite:///{Path(tmp) / "bench.sqlite3"}'
+    os.environ['CACHE_URL'] = f'dbcache://bench_cache?max_entries={args.keys * 2}'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    sys.path.insert(0, str(BACKEND_DIR))
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from django.db import connections
+    call_command('createcachetable', verbosity=0)
+    caches, keys = make_caches(tmp, args.keys), args.keys
+    print(f"{'ops/s':>10} {'set':>9} {'get':>9} {'get miss':>9} {'incr':>9}")
+    for name, cache in caches.items():
+        cache.set('counter', 0, None)
+        results = [
+            rate(lambda i: cache.set(f'k{i % keys}', VALUE), args.ops),
+            rate(lambda i: cache.get(f'k{i % keys}'), args.ops),
+            rate(lambda i: cache.get(f'missing{i}'), args.ops),
+            rate(lambda i: cache.incr('counter'), args.ops),
+        ]
+        print(f'{name:>10} ' + ' '.join(f'{result:>9.0f}' for result in results))
+    connections.close_all()
+    context = multiprocessing.get_context('fork')
+    print(f"\n{'workers':>7} {'database':>10} {'sqlite':>10}   (90% get / 10% set, ops/s over all workers)")
+    for workers in sorted({1, args.workers}):
+        results = []
+        for name in ('database', 'sqlite'):
+            processes = [context.Process(target=mixed, args=(name, tmp, keys, args.ops, seed)) for seed in range(workers)]
+            started = time.perf_counter()
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            results.append(workers * args.ops / (time.perf_counter() - started))
+        print(f'{workers:>7} {results[0]:>10.0f} {results[1]:>10.0f}')
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Throughput of ``manage.py import_catalog`` (apps.core.catalog_import) on
+generated service price lists.
+
+For each size a CSV and an XLSX file are written to a temp dir and imported
+into a throwaway SQLite database three times: fresh (every row created), again
+unchanged (should be a read-only diff) and with 10% of prices changed. Reports
+rows/s per pass and the peak RSS of the process.
+
+Usage (from backend/):
+  python scripts/bench_catalog_import.py [--rows 10000 100000] [--batch-size 1000]
+"""
+import argparse
+import csv
+import os
+import resource
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+HEADER = ['name', 'slug', 'price', 'description', 'is_active']
+def generate(n, bump=0):
+    for i in range(n):
+        price = 150000 + i + (1000 if bump and i % 10 == 0 else 0)
+        yield [f'چاپ کارت ویزیت {i}', f'business-card-{i}', f'{price:,}', 'چاپ افست و دیجیتال', 'true' if i % 3 else 'false']
+def write_csv(path, n, bump=0):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(generate(n, bump))
+def write_xlsx(path, n, bump=0):
+    """Inline-string sheet written row by row."""
+    main = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+    rel = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+    def cells(row):
+        return ''.join(f'<c t="inlineStr"><is><t>{value}</t></is></c>' for value in row)
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('xl/workbook.xml', f'<workbook xmlns="{main}" xmlns:r="{rel}"><sheets>'
+                         f'<sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>')
+        archive.writestr('xl/_rels/workbook.xml.rels', '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                         '<Relationship Id="rId1" Target="worksheets/sheet1.xml"/></Relationships>')
+        with archive.open('xl/worksheets/sheet1.xml', 'w') as f:
+            f.write(f'<worksheet xmlns="{main}"><sheetData><row>{cells(HEADER)}</row>'.encode())
+            for row in generate(n, bump):
+                f.write(f'<row>{cells(row)}</row>'.encode())
+            f.write(b'</sheetData></worksheet>')
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='*', default=[10000, 100000])
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+    tmp = tempfile.TemporaryDirectory()
+    os.environ['DATABASE_URL'] = f'sqlite:///{Path(tmp.name) / "bench.sqlite3"}'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    sys.path.insert(0, str(BACKEND_DIR))
+    import django
+    django.setup()
+    from apps.core.catalog_import import TARGETS, import_catalog
+    from apps.services.models import Service
+    from django.core.management import call_command
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    print(f"{'file':>14} {'pass':>10} {'rows/s':>9} {'created':>8} {'updated':>8} {'unchanged':>10}")
+    for n in args.rows:
+        for kind, writer in (('csv', write_csv), ('xlsx', write_xlsx)):
+            Service.objects.all().delete()
+            path, bumped = Path(tmp.name) / f'prices.{kind}', Path(tmp.name) / f'prices-bumped.{kind}'
+            writer(path, n)
+            writer(bumped, n, bump=1)
+            for label, source in (('fresh', path), ('unchanged', path), ('10% price', bumped)):
+                stats = import_catalog(source, TARGETS['services'], batch_size=args.batch_size)
+                assert not stats.errors, stats.errors[:3]
+                print(f'{f"{kind} x{n}":>14} {label:>10} {stats.rows_per_second:>9.0f} {stats.created:>8} '
+                      f'{stats.updated:>8} {stats.unchanged:>10}')
+    print(f'\npeak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB')
+if __name__ == '__main__':
+    main()
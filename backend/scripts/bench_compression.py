@@ -0,0 +1,78 @@
+"""
+Bytes saved and CPU cost of CompressionMiddleware for typical API payloads.
+
+Builds service and order list responses with the real serializers and renderer
+(unsaved model instances, no database needed), runs them through the middleware
+for each encoding/level and reports the compressed size and CPU time per request.
+
+Usage (from backend/):
+  python scripts/bench_compression.py [--sizes 10 100 1000] [--repeat 200]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+LEVELS = [('gzip', 1), ('gzip', 6), ('gzip', 9), ('br', 1), ('br', 4), ('br', 6), ('br', 11)]
+def build_payloads(sizes):
+    from apps.orders.models import Order
+    from apps.orders.serializers import OrderSerializer
+    from apps.services.models import Service
+    from apps.services.serializers import ServiceSerializer
+    from rest_framework.renderers import JSONRenderer
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    payloads = {}
+    for n in sizes:
+        services = [
+            Service(id=i, name=f'چاپ کارت ویزیت {i}', slug=f'business-card-{i}', price=Decimal(150000 + i),
+                    description='چاپ افست و دیجیتال با کاغذ گلاسه ۳۰۰ گرم، برش و لمینت ' * 3,
+                    is_active=True, created_at=now, updated_at=now)
+            for i in range(n)
+        ]
+        orders = [
+            Order(id=i, user_id=i % 40, product_name=f'بنر تبلیغاتی {i % 25}', product_id=i % 25, quantity=1 + i % 9,
+                  total_price=Decimal('250000.00'), status=Order.STATUS_CHOICES[i % 6][0], created_at=now, updated_at=now)
+            for i in range(n)
+        ]
+        renderer = JSONRenderer()
+        payloads[f'services x{n}'] = renderer.render(ServiceSerializer(services, many=True).data)
+        payloads[f'orders x{n}'] = renderer.render(OrderSerializer(orders, many=True).data)
+    return payloads
+def measure(content, coding, level, repeat):
+    from apps.core.middleware import CompressionMiddleware
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+    from django.test.utils import override_settings
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=coding)
+    with override_settings(API_COMPRESSION_MIN_SIZE=0, API_COMPRESSION_LEVELS={'application/json': {coding: level}}):
+        middleware = CompressionMiddleware(lambda request: HttpResponse(content, content_type='application/json'))
+    started = time.process_time()
+    for _ in range(repeat):
+        response = middleware(request)
+    cpu_ms = (time.process_time() - started) / repeat * 1000
+    return len(response.content), cpu_ms
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='*', default=[10, 100, 1000], help='rows per list response')
+    parser.add_argument('--repeat', type=int, default=200, help='iterations per measurement')
+    args = parser.parse_args()
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+    from apps.core.middleware import brotli
+    print(f"{'payload':16} {'raw bytes':>10} {'encoding':>9} {'bytes':>9} {'saved':>7} {'cpu ms/req':>11}")
+    for name, content in build_payloads(args.sizes).items():
+        for coding, level in LEVELS:
+            if coding == 'br' and brotli is None:
+                continue
+            size, cpu_ms = measure(content, coding, level, max(1, args.repeat // (10 if level >= 9 else 1)))
+            saved = (1 - size / len(content)) * 100
+            print(f'{name:16} {len(content):>10} {f"{coding}:{level}":>9} {size:>9} {saved:>6.1f}% {cpu_ms:>11.3f}')
+        print()
+if __name__ == '__main__':
+    main()
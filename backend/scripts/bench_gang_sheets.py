@@ -0,0 +1,61 @@
+"""
+Gang-sheet planner (apps.orders.batching) on synthetic order items.
+
+Items get realistic print sizes (cards, flyers, A-series, posters, labels),
+quantities from 1 to 5000 and a paper/finish mix that makes a few dozen
+groups. For each size the full plan is timed, then 100 new items are added
+across random groups and the incremental re-plan is timed. Reports sheets,
+print runs and overall waste.
+
+Usage (from backend/):
+  python scripts/bench_gang_sheets.py [--items 10000 50000] [--sheet 70x100 --sheet 50x70] [--seed 1]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+SIZES = [(9, 5), (8.5, 5.5), (10, 15), (14.8, 21), (21, 29.7), (29.7, 42), (48, 33), (5, 5), (7, 3), (20, 10)]
+PAPERS = ['coated-135', 'coated-300', 'offset-80', 'kraft', 'sticker', 'tahrir-70', 'glossy-170']
+def generate(rng, n, start=0):
+    from apps.orders.batching import PrintItem
+    for pk in range(start + 1, start + n + 1):
+        w, h = rng.choice(SIZES)
+        quantity = int(rng.choice([1, 10, 50, 100, 250, 500, 1000, 5000]) * rng.uniform(0.5, 1.5)) or 1
+        yield PrintItem(pk, pk // 3, w, h, quantity, rng.choice(PAPERS), rng.random() < 0.3, rng.random() < 0.1)
+def summary(plans):
+    sheets = sum(plan.impressions for plan in plans)
+    paper = sum(plan.impressions * plan.sheet[0] * plan.sheet[1] for plan in plans)
+    used = sum(run.used_area * run.impressions for plan in plans for run in plan.runs)
+    return sheets, sum(len(plan.runs) for plan in plans), 1 - used / paper
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, nargs='*', default=[10000, 50000])
+    parser.add_argument('--sheet', action='append', help='WxH in cm (default: GANG_SHEET_SIZES)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    sys.path.insert(0, str(BACKEND_DIR))
+    import django
+    django.setup()
+    from apps.orders.batching import GangPlanner
+    sizes = [tuple(float(v) for v in size.split('x')) for size in args.sheet] if args.sheet else None
+    print(f"{'items':>7} {'groups':>7} {'plan s':>8} {'+100 ms':>8} {'replanned':>9} {'sheets':>8} {'runs':>7} {'waste':>7}")
+    for n in args.items:
+        rng = random.Random(args.seed)
+        planner = GangPlanner(sizes)
+        planner.add(generate(rng, n))
+        started = time.perf_counter()
+        plans, _ = planner.plan()
+        full = time.perf_counter() - started
+        planner.add(generate(rng, 100, start=n))
+        started = time.perf_counter()
+        plans, replanned = planner.plan()
+        incremental = time.perf_counter() - started
+        sheets, runs, waste = summary(plans)
+        print(f'{n:>7} {len(plans):>7} {full:>8.2f} {incremental * 1000:>8.0f} {replanned:>9} {sheets:>8} {runs:>7} {waste:>7.1%}')
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Microbenchmark of DRF's JSONRenderer/JSONParser vs apps.core FastJSONRenderer/
+FastJSONParser (orjson) on realistic order payloads.
+
+Two payload shapes per size: the output of OrderSerializer (Decimals and
+datetimes already strings) and raw rows with Decimal ``total_price`` and aware
+``created_at`` values that go through the encoder. Reports ms per render/parse.
+
+Usage (from backend/):
+  python scripts/bench_json.py [--sizes 100 1000 10000] [--repeat 20]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+def build_payloads(n):
+    from apps.orders.models import Order
+    from apps.orders.serializers import OrderSerializer
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        {
+            'id': i, 'user': i % 400, 'product_name': f'بنر تبلیغاتی {i % 25}', 'product_id': i % 25,
+            'quantity': 1 + i % 9, 'total_price': Decimal(f'{250000 + i}.50'),
+            'status': Order.STATUS_CHOICES[i % 6][0],
+            'created_at': start + timedelta(minutes=i, microseconds=i), 'updated_at': start + timedelta(hours=i),
+        }
+        for i in range(n)
+    ]
+    orders = [Order(**{('user_id' if k == 'user' else k): v for k, v in row.items()}) for row in rows]
+    serialized = {'count': n, 'next': None, 'previous': None, 'results': OrderSerializer(orders, many=True).data}
+    return {'serialized': serialized, 'raw rows': {'count': n, 'results': rows}}
+def timed(func, repeat):
+    func()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='*', default=[100, 1000, 10000], help='orders per payload')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+    from apps.core.parsers import FastJSONParser
+    from apps.core.renderers import FastJSONRenderer, orjson
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    if orjson is None:
+        print('orjson is not installed: FastJSON* fall back to the stdlib and match DRF.')
+    drf_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+    drf_parser, fast_parser = JSONParser(), FastJSONParser()
+    print(f"{'payload':22} {'bytes':>10} {'render drf':>11} {'render fast':>12} {'x':>6} {'parse drf':>10} {'parse fast':>11} {'x':>6}")
+    for n in args.sizes:
+        repeat = max(1, args.repeat * 1000 // max(n, 1000))
+        for shape, data in build_payloads(n).items():
+            body = drf_renderer.render(data)
+            assert fast_renderer.render(data) == body, 'renderers disagree'
+            render_drf = timed(lambda: drf_renderer.render(data), repeat)
+            render_fast = timed(lambda: fast_renderer.render(data), repeat)
+            parse_drf = timed(lambda: drf_parser.parse(io.BytesIO(body)), repeat)
+            parse_fast = timed(lambda: fast_parser.parse(io.BytesIO(body)), repeat)
+            print(f'{f"{shape} x{n}":22} {len(body):>10} {render_drf:>9.2f}ms {render_fast:>10.2f}ms '
+                  f'{render_drf / render_fast:>5.1f}x {parse_drf:>8.2f}ms {parse_fast:>9.2f}ms {parse_drf / parse_fast:>5.1f}x')
+if __name__ == '__main__':
+    main()
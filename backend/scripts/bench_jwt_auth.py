@@ -0,0 +1,93 @@
+"""
+Per-request cost of JWT authentication with the revocation denylist.
+
+A throwaway SQLite database gets one user and ``--revoked`` revoked token rows.
+The script then validates ``--requests`` distinct access tokens three ways
+(best of five interleaved rounds) and reports microseconds per request:
+
+- plain: simplejwt's stock AccessToken, no revocation check at all;
+- denylist: apps.accounts.tokens.AccessToken, i.e. the per-worker Bloom filter
+  (a query only for revoked tokens and false positives);
+- table lookup: the stock token plus an indexed ``jti`` lookup on every request,
+  which is what a database-only denylist costs.
+
+It also reports the filter's size, load time and false-positive rate.
+
+Usage (from backend/):
+  python scripts/bench_jwt_auth.py [--revoked 100000] [--requests 20000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+def per_request_us(validate, raw_tokens):
+    started = time.perf_counter()
+    for raw in raw_tokens:
+        validate(raw)
+    return (time.perf_counter() - started) / len(raw_tokens) * 1e6
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--revoked', type=int, default=100000, help='revoked, unexpired token rows')
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+    tmp = tempfile.TemporaryDirectory()
+    os.environ['DATABASE_URL'] = f'sqlite:///{Path(tmp.name) / "bench.sqlite3"}'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    sys.path.insert(0, str(BACKEND_DIR))
+    import django
+    django.setup()
+    from apps.accounts.denylist import denylist
+    from apps.accounts.models import RevokedToken
+    from apps.accounts.tokens import AccessToken
+    from datetime import timedelta
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.utils import timezone
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.tokens import AccessToken as PlainAccessToken
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    user = get_user_model().objects.create_user('bench@example.com', 'Passw0rd-123')
+    expires_at = timezone.now() + timedelta(days=1)
+    for start in range(0, args.revoked, 10000):
+        RevokedToken.objects.bulk_create([
+            RevokedToken(jti=uuid.uuid4().hex, token_type='access', expires_at=expires_at)
+            for _ in range(min(10000, args.revoked - start))
+        ])
+    started = time.perf_counter()
+    denylist.refresh(force=True)
+    loaded = time.perf_counter() - started
+    bloom = denylist.bloom
+    probes = [uuid.uuid4().hex for _ in range(100000)]
+    false_positives = sum(probe in bloom for probe in probes) / len(probes)
+    print(f'{args.revoked} revoked tokens: filter {len(bloom.bits) / 1024:.0f} KB, {bloom.hashes} hashes, '
+          f'loaded in {loaded * 1000:.0f} ms, false positives {false_positives:.3%}')
+    # a fresh token per request, as with many clients: nothing is cached per token
+    raw_tokens = [str(PlainAccessToken.for_user(user)).encode() for _ in range(args.requests)]
+    authentication = JWTAuthentication()
+    def table_lookup(raw):
+        token = PlainAccessToken(raw)
+        RevokedToken.objects.filter(jti=token['jti']).exists()
+    results = [
+        ('plain simplejwt', PlainAccessToken),
+        ('denylist (filter)', AccessToken),
+        ('table lookup', table_lookup),
+    ]
+    timings = {name: [] for name, _validate in results}
+    for _ in range(5):  # interleaved, so drift in machine speed hits every variant alike
+        for name, validate in results:
+            timings[name].append(per_request_us(validate, raw_tokens))
+    baseline = min(timings['plain simplejwt'])
+    for name, runs in timings.items():
+        print(f'{name:>18}: {min(runs):6.1f} us/request ({min(runs) - baseline:+.1f} us)')
+    started = time.perf_counter()
+    for raw in raw_tokens:
+        authentication.get_user(authentication.get_validated_token(raw))
+    print(f'for scale, a full authentication (token + user row) takes '
+          f'{(time.perf_counter() - started) / len(raw_tokens) * 1e6:.0f} us/request')
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+List throughput of ModelSerializer vs the values_list() fast path
+(apps.core.serializers.ValuesSerializer) for services and orders.
+
+Seeds a throwaway SQLite database with --rows services and orders, then times
+query + serialization + JSON rendering of the whole table both ways and checks
+the rendered bytes are identical. --fields also times a sparse fieldset
+(``?fields=``) on the values path and reports its payload size.
+
+Usage (from backend/):
+  python scripts/bench_list_serializers.py [--rows 1000 10000] [--repeat 5] [--fields id name status]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+def seed(rows):
+    from apps.orders.models import Order
+    from apps.services.models import Service
+    from django.contrib.auth import get_user_model
+    Order.objects.all().delete()
+    Service.objects.all().delete()
+    user = get_user_model().objects.get_or_create(email='bench@example.com')[0]
+    Service.objects.bulk_create([
+        Service(name=f'چاپ کارت ویزیت {i}', slug=f'business-card-{i}', description='چاپ افست و دیجیتال ' * 4,
+                price=Decimal(150000 + i), is_active=bool(i % 3))
+        for i in range(rows)
+    ], batch_size=1000)
+    Order.objects.bulk_create([
+        Order(user=user if i % 5 else None, product_name=f'بنر تبلیغاتی {i % 25}', product_id=i % 25,
+              quantity=1 + i % 9, total_price=Decimal(f'{250000 + i}.50'), status=Order.STATUS_CHOICES[i % 6][0])
+        for i in range(rows)
+    ], batch_size=1000)
+def timed(func, repeat):
+    result = func()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return result, (time.perf_counter() - started) / repeat * 1000
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='*', default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--fields', nargs='*', default=['id', 'name', 'product_name', 'status'],
+                        help='sparse fieldset for dashboard tables (unknown names are ignored per table)')
+    args = parser.parse_args()
+    tmp = tempfile.TemporaryDirectory()
+    os.environ['DATABASE_URL'] = f'sqlite:///{Path(tmp.name) / "bench.sqlite3"}'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    sys.path.insert(0, str(BACKEND_DIR))
+    import django
+    django.setup()
+    from apps.core.serializers import readable_fields, values_serializer
+    from apps.orders.models import Order
+    from apps.orders.serializers import OrderSerializer
+    from apps.services.models import Service
+    from apps.services.serializers import ServiceSerializer
+    from django.core.management import call_command
+    from rest_framework.renderers import JSONRenderer
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    renderer = JSONRenderer()
+    print(f"{'table':10} {'rows':>7} {'ModelSerializer':>16} {'values':>10} {'speedup':>8} {'rows/s values':>14} "
+          f"{'bytes':>10} {'sparse':>9} {'sparse bytes':>13}")
+    for rows in args.rows:
+        seed(rows)
+        for name, model, serializer_class in (('services', Service, ServiceSerializer), ('orders', Order, OrderSerializer)):
+            fast = values_serializer(serializer_class)
+            slow_bytes, slow_ms = timed(lambda: renderer.render(serializer_class(model.objects.all(), many=True).data), args.repeat)
+            fast_bytes, fast_ms = timed(lambda: renderer.render(fast.to_representation(fast.values(model.objects.all()))), args.repeat)
+            assert slow_bytes == fast_bytes, f'{name}: outputs differ'
+            sparse = values_serializer(serializer_class, frozenset(args.fields) & frozenset(readable_fields(serializer_class)))
+            sparse_bytes, sparse_ms = timed(lambda: renderer.render(sparse.to_representation(sparse.values(model.objects.all()))), args.repeat)
+            print(f'{name:10} {rows:>7} {slow_ms:>14.1f}ms {fast_ms:>8.1f}ms {slow_ms / fast_ms:>7.1f}x {rows / fast_ms * 1000:>14,.0f} '
+                  f'{len(fast_bytes):>10,} {sparse_ms:>7.1f}ms {len(sparse_bytes):>13,}')
+    tmp.cleanup()
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Hot-table size and hot-path query latency before and after archiving cold orders
+(apps.orders.archive).
+
+A throwaway SQLite database gets ``--orders`` orders with one item each, spread
+over ``--users`` users and the last two years; ``--cold`` of them are delivered or
+cancelled more than ORDER_ARCHIVE_AFTER_DAYS ago. The script measures the hot
+tables (``orders_order`` and ``orders_orderitem`` with their indexes, from
+SQLite's dbstat) and the median latency of the hot-path queries, archives with
+no pause between batches, VACUUMs, and measures again.
+
+Usage (from backend/):
+  python scripts/bench_order_archive.py [--orders 200000] [--users 2000] [--cold 0.85]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+def median_ms(query, repeat=20):
+    query()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        query()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+def table_mb(connection, tables):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT SUM(pgsize) FROM dbstat WHERE name IN (SELECT name FROM sqlite_master WHERE tbl_name IN (%s))'
+            % ', '.join('%s' for _ in tables), tables,
+        )
+        return (cursor.fetchone()[0] or 0) / 2 ** 20
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--orders', type=int, default=200000)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--cold', type=float, default=0.85, help='share of orders old enough to archive')
+    args = parser.parse_args()
+    tmp = tempfile.TemporaryDirectory()
+    os.environ['DATABASE_URL'] = f'sqlite:///{Path(tmp.name) / "bench.sqlite3"}'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    sys.path.insert(0, str(BACKEND_DIR))
+    import django
+    django.setup()
+    from apps.orders.archive import archive_orders
+    from apps.orders.batching import pending_items
+    from apps.orders.models import ArchivedOrder, Order
+    from apps.orders.views import OrderViewSet
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.db import connection, transaction
+    from django.utils import timezone
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    User = get_user_model()
+    User.objects.bulk_create([User(email=f'archive-{i}@example.com') for i in range(args.users)])
+    user_ids = list(User.objects.values_list('pk', flat=True))
+    rng, now = random.Random(7), timezone.now()
+    cold_before = now - timedelta(days=settings.ORDER_ARCHIVE_AFTER_DAYS + 1)
+    started = time.perf_counter()
+    # raw inserts: bulk_create would stamp created_at/updated_at with the current time
+    with transaction.atomic(), connection.cursor() as cursor:
+        orders, items = [], []
+        for pk in range(1, args.orders + 1):
+            if rng.random() < args.cold:
+                status, at = rng.choice(('delivered', 'cancelled')), cold_before - timedelta(minutes=rng.randrange(500000))
+            else:
+                status = rng.choice(('pending', 'confirmed', 'processing', 'shipped', 'delivered'))
+                at = now - timedelta(minutes=rng.randrange(60 * 24 * settings.ORDER_ARCHIVE_AFTER_DAYS))
+            orders.append((pk, rng.choice(user_ids), f'Product {pk % 50}', pk % 50, 1 + pk % 5, pk % 900, status, at, at))
+            items.append((pk, f'Product {pk % 50}', 100 * (1 + pk % 5), 'coated-300', 9, 5, pk % 2 == 0, False))
+        cursor.executemany(
+            'INSERT INTO orders_order (id, user_id, product_name, product_id, quantity, total_price, status, created_at, '
+            'updated_at) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)', orders,
+        )
+        cursor.executemany(
+            'INSERT INTO orders_orderitem (order_id, product_name, quantity, paper_type, size_width, size_height, '
+            'has_lamination, has_uv_coating) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)', items,
+        )
+    print(f'seeded {args.orders} orders in {time.perf_counter() - started:.1f}s')
+    busiest = Order.objects.values('user_id').order_by().annotate(n=django.db.models.Count('id')).order_by('-n')[0]['user_id']
+    user = User.objects.get(pk=busiest)
+    factory, list_view = APIRequestFactory(), OrderViewSet.as_view({'get': 'list'})
+    def user_order_list():
+        request = factory.get('/api/v1/orders/')
+        force_authenticate(request, user)
+        list_view(request).render()
+    queries = [
+        ('open orders, newest 50', lambda: list(Order.objects.filter(status__in=('pending', 'confirmed')).values_list('pk')[:50])),
+        ('count by status', lambda: list(Order.objects.values('status').order_by().annotate(n=django.db.models.Count('id')))),
+        ('gang-sheet pending items', lambda: pending_items()),
+        ('a user\'s orders (API page 1)', user_order_list),
+    ]
+    def measure():
+        return table_mb(connection, ['orders_order', 'orders_orderitem']), [median_ms(query) for _name, query in queries]
+    size_before, before = measure()
+    stats = archive_orders(pause=0)
+    with connection.cursor() as cursor:
+        cursor.execute('VACUUM')
+    size_after, after = measure()
+    print(f'archived {stats.archived} orders in {stats.batches} batches, {stats.seconds:.1f}s '
+          f'({stats.archived / stats.seconds:.0f} orders/s without pauses)')
+    print(f'hot tables: {Order.objects.count() + stats.archived} -> {Order.objects.count()} orders, '
+          f'{size_before:.1f} -> {size_after:.1f} MB (archive: {table_mb(connection, ["orders_archivedorder"]):.1f} MB, '
+          f'{ArchivedOrder.objects.count()} rows)')
+    for (name, _query), b, a in zip(queries, before, after):
+        print(f'{name:>30}: {b:7.2f} -> {a:7.2f} ms')
+if __name__ == '__main__':
+    main()
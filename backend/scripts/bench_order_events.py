@@ -0,0 +1,152 @@
+"""
+Idle-connection cost of the order status stream (``/api/v1/orders/events/``)
+under uvicorn, and how fast a status change reaches its listeners.
+
+A throwaway SQLite database gets ``--users`` users with one order each; a
+uvicorn server (config.asgi, one worker) is started on it and ``--connections``
+EventSource-like clients are opened, spread over those users. The script then
+reports the server's RSS per open stream and its CPU use while every stream
+sits idle. Finally it changes the status of ``--changes`` orders from this
+process, i.e. from "another worker", so delivery goes through the database
+poller, and reports how long the events took to arrive.
+
+For comparison it prints the request rate the same clients would cause by
+polling ``/orders/`` every ``--poll-every`` seconds.
+
+Usage (from backend/):
+  python scripts/bench_order_events.py [--connections 2000] [--users 500] [--changes 50] [--idle 10]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+def rss_mb(pid):
+    with open(f'/proc/{pid}/status') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith('VmRSS')) / 1024
+def cpu_seconds(pid):
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+class Client:
+    """Minimal SSE client on a raw socket: records when each event id arrives."""
+    def __init__(self, user_id):
+        self.user_id, self.received = user_id, {}
+    async def open(self, port, token):
+        self.reader, self.writer = await asyncio.open_connection('127.0.0.1', port)
+        self.writer.write(f'GET /api/v1/orders/events/?access_token={token} HTTP/1.1\r\nHost: bench\r\n'
+                          'Accept: text/event-stream\r\n\r\n'.encode())
+        await self.writer.drain()
+        status = await self.reader.readline()
+        assert b' 200 ' in status, status
+        await self.reader.readuntil(b'retry: ')
+    async def listen(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    return
+                if line.startswith(b'id: '):
+                    self.received[int(line[4:])] = time.perf_counter()
+        except (ConnectionError, asyncio.CancelledError):
+            return
+async def run(args, port, tokens, server):
+    users = list(tokens)
+    clients = [Client(users[i % len(users)]) for i in range(args.connections)]
+    base_rss = rss_mb(server.pid)
+    started = time.perf_counter()
+    for start in range(0, len(clients), 200):
+        await asyncio.gather(*(c.open(port, tokens[c.user_id]) for c in clients[start:start + 200]))
+    opened = time.perf_counter() - started
+    listeners = [asyncio.ensure_future(c.listen()) for c in clients]
+    await asyncio.sleep(1)
+    rss = rss_mb(server.pid)
+    threads = len(os.listdir(f'/proc/{server.pid}/task'))
+    print(f'opened {len(clients)} streams in {opened:.1f}s; server RSS {base_rss:.0f} -> {rss:.0f} MB '
+          f'({(rss - base_rss) * 1024 / len(clients):.1f} KB per stream), {threads} threads')
+    cpu = cpu_seconds(server.pid)
+    await asyncio.sleep(args.idle)
+    idle_cpu = (cpu_seconds(server.pid) - cpu) / args.idle
+    print(f'idle for {args.idle:.0f}s: server CPU {idle_cpu:.1%} of one core '
+          f'(heartbeats every {os.environ["ORDER_EVENTS_HEARTBEAT"]}s, DB poll every {os.environ["ORDER_EVENTS_POLL_INTERVAL"]}s)')
+    from apps.orders.models import Order
+    changed = users[:args.changes]
+    sent = {}
+    def change():
+        for user_id in changed:
+            order = Order.objects.get(user_id=user_id)
+            order.status = 'processing'
+            order.save()
+            sent[order.events.latest('id').pk] = (user_id, time.perf_counter())
+    await asyncio.to_thread(change)
+    expected = [(c, event_id) for c in clients for event_id, (user_id, _at) in sent.items() if c.user_id == user_id]
+    deadline = time.perf_counter() + 10
+    while time.perf_counter() < deadline and any(event_id not in c.received for c, event_id in expected):
+        await asyncio.sleep(0.05)
+    latencies = sorted((c.received[event_id] - sent[event_id][1]) * 1000 for c, event_id in expected if event_id in c.received)
+    print(f'{len(sent)} status changes -> {len(latencies)}/{len(expected)} deliveries, latency p50 '
+          f'{statistics.median(latencies):.0f} ms, max {latencies[-1]:.0f} ms')
+    print(f'polling /orders/ every {args.poll_every:g}s instead: {len(clients) / args.poll_every:.0f} authenticated '
+          f'requests/s, each with DB queries, for the same {len(sent)} changes')
+    for listener in listeners:
+        listener.cancel()
+    for client in clients:
+        client.writer.close()
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--connections', type=int, default=2000)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--changes', type=int, default=50, help='orders whose status is changed at the end')
+    parser.add_argument('--idle', type=float, default=10, help='seconds to sample idle CPU')
+    parser.add_argument('--poll-every', type=float, default=5, help='polling interval to compare against')
+    args = parser.parse_args()
+    tmp = tempfile.TemporaryDirectory()
+    os.environ['DATABASE_URL'] = f'sqlite:///{Path(tmp.name) / "bench.sqlite3"}'
+    os.environ['THROTTLE_SQLITE_PATH'] = str(Path(tmp.name) / 'throttle.sqlite3')
+    os.environ.setdefault('ORDER_EVENTS_HEARTBEAT', '20')
+    os.environ.setdefault('ORDER_EVENTS_POLL_INTERVAL', '1')
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    sys.path.insert(0, str(BACKEND_DIR))
+    import django
+    django.setup()
+    from apps.orders.models import Order
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from rest_framework_simplejwt.tokens import AccessToken
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    User = get_user_model()
+    User.objects.bulk_create([User(email=f'sse-{i}@example.com') for i in range(args.users)])
+    users = list(User.objects.all())
+    Order.objects.bulk_create([Order(user=user, product_name='Cards') for user in users])
+    tokens = {user.pk: str(AccessToken.for_user(user)) for user in users}
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'config.asgi:application', '--port', str(port), '--log-level', 'warning',
+         '--backlog', '4096'],
+        cwd=BACKEND_DIR, env={**os.environ, 'REQUEST_SLOW_LOG_MS': '0'},
+    )
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/api/v1/health/', timeout=1)
+                break
+            except OSError:
+                time.sleep(0.1)
+        asyncio.run(run(args, port, tokens, server))
+    finally:
+        server.terminate()
+        server.wait()
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Time to content of the SPA's first paint, with and without the server-side
+bootstrap (SPA_BOOTSTRAP, apps.core.bootstrap).
+
+A throwaway SQLite database gets ``--services`` services and a uvicorn server
+(config.asgi, one worker, SPA_BOOTSTRAP on) is started on it. Each sample
+loads a page the way a browser would:
+
+- without bootstrap: fetch the shell, then the first-paint API calls
+  (``/services/``, ``/services/active/``, ``/categories/``) in parallel, i.e.
+  two round trips on the critical path;
+- with bootstrap: fetch the shell with the data (and, for ``/services/<slug>``,
+  the rendered content) embedded, i.e. one round trip.
+
+``--rtt`` milliseconds of network latency are added per round trip (localhost
+has none); the medians of ``--samples`` loads are reported, plus the cost of a
+cold render after an invalidation and the extra bytes in the HTML.
+
+Usage (from backend/):
+  python scripts/bench_spa_bootstrap.py [--services 50] [--samples 200] [--rtt 80]
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+API_PATHS = ('/api/v1/services/', '/api/v1/services/active/', '/api/v1/categories/')
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+def fetch(url):
+    started = time.perf_counter()
+    with urllib.request.urlopen(url) as response:
+        body = response.read()
+    return time.perf_counter() - started, len(body)
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--services', type=int, default=50)
+    parser.add_argument('--samples', type=int, default=200)
+    parser.add_argument('--rtt', type=float, default=80, help='simulated network round trip, ms')
+    args = parser.parse_args()
+    tmp = tempfile.TemporaryDirectory()
+    os.environ['DATABASE_URL'] = f'sqlite:///{Path(tmp.name) / "bench.sqlite3"}'
+    os.environ['THROTTLE_SQLITE_PATH'] = str(Path(tmp.name) / 'throttle.sqlite3')
+    os.environ['SPA_BOOTSTRAP'] = 'true'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    sys.path.insert(0, str(BACKEND_DIR))
+    import django
+    django.setup()
+    from apps.services.models import Service
+    from django.core.management import call_command
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    Service.objects.bulk_create([
+        Service(name=f'Service {i}', slug=f'service-{i}', description='Full-colour print ' * 10, price=1000 * i)
+        for i in range(args.services)
+    ])
+    port = free_port()
+    base = f'http://127.0.0.1:{port}'
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'config.asgi:application', '--port', str(port), '--log-level', 'warning'],
+        cwd=BACKEND_DIR, env={**os.environ, 'REQUEST_SLOW_LOG_MS': '0'},
+    )
+    rtt = args.rtt / 1000
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(f'{base}/api/v1/health/', timeout=1)
+                break
+            except OSError:
+                time.sleep(0.1)
+        pool = ThreadPoolExecutor(len(API_PATHS))
+        def without_bootstrap(path):
+            shell, _size = fetch(base + path)
+            api = max(t for t, _size in pool.map(fetch, (base + p for p in API_PATHS)))
+            return shell + api + 2 * rtt
+        def with_bootstrap(path):
+            return fetch(base + path)[0] + rtt
+        for path in ('/', '/services/service-1'):
+            for load in (without_bootstrap, with_bootstrap):
+                load(path)  # warm up: imports, URLconf, the page cache
+            before = statistics.median(without_bootstrap(path) for _ in range(args.samples)) * 1000
+            after = statistics.median(with_bootstrap(path) for _ in range(args.samples)) * 1000
+            print(f'{path:<20} time to content {before:6.1f} ms -> {after:6.1f} ms '
+                  f'({before - after:.1f} ms saved at {args.rtt:g} ms RTT)')
+        _t, html_size = fetch(f'{base}/')
+        api_size = sum(size for _t, size in pool.map(fetch, (base + p for p in API_PATHS)))
+        print(f'shell HTML {html_size / 1024:.1f} KB with {args.services} services embedded '
+              f'(the API calls it replaces: {api_size / 1024:.1f} KB)')
+        # the server's locmem cache is its own, so time a cold render in-process instead
+        from apps.core.bootstrap import cached_page, invalidate
+        from django.test import RequestFactory
+        cold = []
+        for _ in range(20):
+            invalidate()
+            started = time.perf_counter()
+            cached_page(RequestFactory().get('/'))
+            cold.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        for _ in range(1000):
+            cached_page(RequestFactory().get('/'))
+        warm = (time.perf_counter() - started) / 1000
+        print(f'render after invalidation {statistics.median(cold) * 1000:.1f} ms, cached {warm * 1e6:.0f} us')
+    finally:
+        server.terminate()
+        server.wait()
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Write throughput of the default SQLite backend vs the tuned profile
+(apps.core.db.sqlite3: WAL, synchronous=NORMAL, mmap, busy_timeout, BEGIN IMMEDIATE).
+
+Every run creates a fresh database file, then starts --processes worker processes
+(standing in for gunicorn workers) that each perform --writes short transactions:
+a read followed by an insert, the pattern that deadlocks into "database is locked"
+under SQLite's default deferred transactions. Reports committed writes/s and failures.
+
+Usage (from backend/):
+  python scripts/bench_sqlite_writes.py [--processes 4] [--writes 300]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+PROFILES = {'default': '0', 'tuned': '1'}
+def worker(worker_id, writes):
+    import django
+    django.setup()
+    from apps.newsletter.models import Subscriber
+    from django.db import OperationalError, transaction
+    ok = failed = 0
+    for i in range(writes):
+        try:
+            with transaction.atomic():
+                Subscriber.objects.filter(is_active=True).exists()
+                Subscriber.objects.create(email=f'w{worker_id}-{i}@example.com')
+            ok += 1
+        except OperationalError:
+            failed += 1
+    print(json.dumps({'ok': ok, 'failed': failed}))
+def run_profile(profile, processes, writes):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'config.settings',
+            'DATABASE_URL': f'sqlite:///{Path(tmp) / "bench.sqlite3"}',
+            'SQLITE_TUNED': PROFILES[profile],
+            'DEBUG': 'False',
+        }
+        subprocess.run(
+            [sys.executable, 'manage.py', 'migrate', '--run-syncdb', '-v', '0'],
+            cwd=BACKEND_DIR, env=env, check=True, stderr=subprocess.DEVNULL,
+        )
+        started = time.perf_counter()
+        procs = [
+            subprocess.Popen(
+                [sys.executable, __file__, '--worker', str(n), '--writes', str(writes)],
+                cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+            )
+            for n in range(processes)
+        ]
+        results = [json.loads(p.communicate()[0].strip().splitlines()[-1]) for p in procs]
+        elapsed = time.perf_counter() - started
+    ok = sum(r['ok'] for r in results)
+    failed = sum(r['failed'] for r in results)
+    return {'profile': profile, 'committed': ok, 'failed': failed, 'seconds': round(elapsed, 2),
+            'writes_per_s': round(ok / elapsed, 1)}
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--writes', type=int, default=300, help='transactions per process')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker is not None:
+        sys.path.insert(0, str(BACKEND_DIR))
+        worker(args.worker, args.writes)
+        return
+    print(f"{'profile':10} {'committed':>10} {'failed':>7} {'seconds':>8} {'writes/s':>9}")
+    for profile in PROFILES:
+        r = run_profile(profile, args.processes, args.writes)
+        print(f"{r['profile']:10} {r['committed']:>10} {r['failed']:>7} {r['seconds']:>8} {r['writes_per_s']:>9}")
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Per-request overhead of DRF's ScopedRateThrottle (a timestamp list per client in
+the cache) vs apps.core ScopedSlidingWindowThrottle (two counters per client) on
+the local-memory cache and on the shared SQLite counter file.
+
+"hot client" sends every request from one IP, so DRF's history list grows up to
+the rate limit; "many clients" spreads requests over 1000 IPs. A second table
+runs the SQLite store from several processes at once (like gunicorn workers) and
+checks that no hit is lost. Reports microseconds per allow_request().
+
+Usage (from backend/):
+  python scripts/bench_throttle.py [--rates 60/min 1000/min 10000/min] [--requests 5000] [--workers 4]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+def make_requests(n, clients):
+    from django.test import RequestFactory
+    from rest_framework.request import Request
+    factory, requests = RequestFactory(), []
+    for i in range(n):
+        request = Request(factory.post('/', REMOTE_ADDR=f'10.0.{i % clients // 256}.{i % clients % 256}'))
+        request.user = None
+        requests.append(request)
+    return requests
+def timed(throttle_class, rate, requests):
+    from django.core.cache import cache
+    class View:
+        throttle_scope = 'bench'
+    throttle_class.THROTTLE_RATES = {'bench': rate}
+    cache.clear()
+    view = View()
+    started = time.perf_counter()
+    for request in requests:
+        throttle_class().allow_request(request, view)
+    return (time.perf_counter() - started) / len(requests) * 1e6
+def hammer(path, n):
+    from apps.core.throttling import SQLiteCounterStore
+    store = SQLiteCounterStore(path)
+    for _ in range(n):
+        store.hit('bench:shared', 1, 3600)
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rates', nargs='*', default=['60/min', '1000/min', '10000/min'])
+    parser.add_argument('--requests', type=int, default=5000, help='allow_request() calls per measurement')
+    parser.add_argument('--workers', type=int, default=4, help='processes for the shared SQLite run')
+    args = parser.parse_args()
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+    from apps.core.throttling import ScopedSlidingWindowThrottle, SQLiteCounterStore
+    from django.test import override_settings
+    from rest_framework.throttling import ScopedRateThrottle
+    tmp = tempfile.mkdtemp()
+    print(f"{'rate':>10} {'clients':>12} {'drf (µs)':>9} {'window/cache':>13} {'window/sqlite':>14}")
+    for rate in args.rates:
+        for label, clients in (('hot client', 1), ('many clients', 1000)):
+            requests = make_requests(args.requests, clients)
+            drf = timed(ScopedRateThrottle, rate, requests)
+            with override_settings(THROTTLE_STORE='cache'):
+                window_cache = timed(ScopedSlidingWindowThrottle, rate, requests)
+            with override_settings(THROTTLE_STORE='sqlite', THROTTLE_SQLITE_PATH=os.path.join(tmp, f'{rate.replace("/", "-")}-{clients}.sqlite3')):
+                window_sqlite = timed(ScopedSlidingWindowThrottle, rate, requests)
+            print(f'{rate:>10} {label:>12} {drf:>9.1f} {window_cache:>13.1f} {window_sqlite:>14.1f}')
+    print(f"\n{'workers':>7} {'hits':>8} {'counted':>8} {'hits/s':>9}")
+    for workers in sorted({1, args.workers}):
+        path = os.path.join(tmp, f'shared-{workers}.sqlite3')
+        SQLiteCounterStore(path).hit('warm-up', 0, 1)
+        context = multiprocessing.get_context('fork')
+        processes = [context.Process(target=hammer, args=(path, args.requests)) for _ in range(workers)]
+        started = time.perf_counter()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+        _previous, counted = SQLiteCounterStore(path).hit('bench:shared', 1, 3600)
+        total = workers * args.requests
+        print(f'{workers:>7} {total:>8} {counted - 1:>8} {total / elapsed:>9.0f}')
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,38 @@
+"""
+Smoke tests and load benchmark for a locally running backend (runserver or gunicorn).
+
+  python scripts/smoke_tests.py                       # one call per endpoint, print responses
+  python scripts/smoke_tests.py load --duration 20 --concurrency 16 \\
+      --scenarios browse quote order upload --output run.json [--baseline base.json]
+
+The load mode runs each scenario for --duration seconds with --concurrency threads.
+Every thread keeps one HTTP/1.1 keep-alive connection (reopened when the server
+closes it) and reports throughput and p50/p95/p99 latency. Results are saved as
+JSON and, with --baseline, compared against a previous run; the exit code is 1
+when a scenario regresses by more than --max-regression percent.
+
+The server's default throttles (THROTTLE_RATE_*) cap calculate_price at 60/min and
+registration at 10/hour per client, so ``quote`` would mostly measure 429s and
+``order`` could not register its users. Start the server under test with the
+throttles raised, e.g.:
+
+  THROTTLE_RATE_CALCULATE_PRICE=1000000/min THROTTLE_RATE_REGISTER=1000000/hour \\
+      gunicorn config.wsgi:application -c config/gunicorn.py
+
+Throttled responses are counted as errors and reported separately.
+"""
+import argparse
+import http.client
 import json
+import statistics
+import sys
+import threading
+import time
 import urllib.error
+import urllib.parse
 import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 BASE = 'http://127.0.0.1:8000/api/v1'
 def get_products():
@@ -40,9 +72,200 @@ def post_contact():
         print('HTTPError:', e.code, e.read().decode())
     except Exception as e:
         print('Error:', e)
-if __name__ == '__main__':
+def run_smoke():
     get_products()
     print('\n---\n')
     post_calculate()
     print('\n---\n')
-    post_contact()
\ No newline at end of file
+    post_contact()
+
+# ------------------ Load benchmark ------------------
+class Client:
+    """One keep-alive connection per thread; reconnects when the server closes it."""
+    def __init__(self, base):
+        parsed = urllib.parse.urlsplit(base)
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        self.prefix = parsed.path.rstrip('/')
+        self.connection_class = http.client.HTTPSConnection if parsed.scheme == 'https' else http.client.HTTPConnection
+        self.conn = None
+        self.token = None
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = self.connection_class(self.host, self.port, timeout=30)
+            try:
+                self.conn.request(method, self.prefix + path, body=body, headers=headers)
+                response = self.conn.getresponse()
+                payload = response.read()
+                if response.will_close:
+                    self.conn.close()
+                    self.conn = None
+                return response.status, payload
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+    def reset(self):
+        """Drop the connection after an error; the next request opens a new one."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+    def json(self, method, path, data):
+        return self.request(method, path, json.dumps(data).encode(), {'Content-Type': 'application/json'})
+def login(client):
+    email = f'load-{uuid.uuid4().hex[:12]}@example.com'
+    password = 'Load-test-pass-123'
+    status, payload = client.json('POST', '/accounts/register/', {
+        'email': email, 'password': password, 'password2': password, 'first_name': 'Load', 'last_name': 'Test',
+    })
+    if status == 429:
+        raise RuntimeError('Registration is throttled: run the server with THROTTLE_RATE_REGISTER raised')
+    status, payload = client.json('POST', '/accounts/token/', {'email': email, 'password': password})
+    if status != 200:
+        raise RuntimeError(f'Could not obtain a token ({status}): {payload[:200]!r}')
+    client.token = json.loads(payload)['access']
+def browse(client, i):
+    path = ('/products/', '/categories/', '/services/', '/services/active/')[i % 4]
+    return client.request('GET', path)
+def quote(client, i):
+    return client.json('POST', f'/products/{i % 50}/calculate_price/', {'quantity': 1 + i % 10, 'base_price': 12500})
+def place_order(client, i):
+    return client.json('POST', '/orders/', {'product_name': f'Load product {i % 20}', 'quantity': 1 + i % 5, 'total_price': '150000.00'})
+UPLOAD_BODY = b'%PDF-1.4\n' + b'0' * 64 * 1024
+def upload(client, i):
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="load-{i}.pdf"\r\n'
+        f'Content-Type: application/pdf\r\n\r\n'
+    ).encode() + UPLOAD_BODY + f'\r\n--{boundary}--\r\n'.encode()
+    return client.request('POST', '/files/upload/', body, {'Content-Type': f'multipart/form-data; boundary={boundary}'})
+SCENARIOS = {
+    'browse': (browse, False),
+    'quote': (quote, False),
+    'order': (place_order, True),
+    'upload': (upload, False),
+}
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+def run_scenario(name, base, duration, concurrency):
+    func, needs_auth = SCENARIOS[name]
+    clients = [Client(base) for _ in range(concurrency)]
+    if needs_auth:
+        # log in before the clock starts; password hashing is not what we measure
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(login, clients))
+    deadline = time.perf_counter() + duration
+    counter = iter(range(10 ** 12))
+    lock = threading.Lock()
+    def worker(client):
+        latencies, errors, throttled = [], 0, 0
+        while time.perf_counter() < deadline:
+            with lock:
+                i = next(counter)
+            started = time.perf_counter()
+            try:
+                status, _payload = func(client, i)
+            except (OSError, http.client.HTTPException):
+                client.reset()
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status >= 400:
+                errors += 1
+            throttled += status == 429
+        return latencies, errors, throttled
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(worker, clients))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(l for r in results for l in r[0])
+    errors = sum(r[1] for r in results)
+    return {
+        'scenario': name,
+        'requests': len(latencies),
+        'errors': errors,
+        'throttled': sum(r[2] for r in results),
+        'seconds': round(elapsed, 2),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0,
+        'mean_ms': round(statistics.fmean(latencies), 2) if latencies else None,
+        'p50_ms': round(percentile(latencies, 50), 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95), 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99), 2) if latencies else None,
+    }
+def compare(results, baseline, max_regression):
+    """Print deltas against a saved run; return True when any scenario regressed."""
+    previous = {r['scenario']: r for r in baseline.get('results', [])}
+    regressed = False
+    print(f"\n{'scenario':10} {'rps':>18} {'p95 ms':>22}")
+    for r in results:
+        old = previous.get(r['scenario'])
+        if not old:
+            print(f"{r['scenario']:10} (no baseline)")
+            continue
+        rps_delta = (r['throughput_rps'] - old['throughput_rps']) / old['throughput_rps'] * 100 if old['throughput_rps'] else 0
+        p95_delta = (r['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100 if old.get('p95_ms') and r['p95_ms'] else 0
+        flag = ''
+        if rps_delta < -max_regression or p95_delta > max_regression:
+            regressed = True
+            flag = '  REGRESSION'
+        print(f"{r['scenario']:10} {old['throughput_rps']:>7} -> {r['throughput_rps']:<7} ({rps_delta:+.0f}%) "
+              f"{old['p95_ms']:>7} -> {r['p95_ms']:<7} ({p95_delta:+.0f}%){flag}")
+    return regressed
+def run_load(args):
+    results = []
+    for name in args.scenarios:
+        print(f'Running {name} for {args.duration}s with {args.concurrency} clients...')
+        try:
+            results.append(run_scenario(name, args.base, args.duration, args.concurrency))
+        except RuntimeError as exc:
+            print(f'  {name} skipped: {exc}')
+    print(f"\n{'scenario':10} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for r in results:
+        print(f"{r['scenario']:10} {r['requests']:>9} {r['errors']:>7} {r['throughput_rps']:>8} "
+              f"{str(r['p50_ms']):>8} {str(r['p95_ms']):>8} {str(r['p99_ms']):>8}")
+    if any(r['throttled'] for r in results):
+        print('\nSome requests were throttled (429): raise THROTTLE_RATE_* on the server, see --help.')
+    report = {
+        'base': args.base,
+        'concurrency': args.concurrency,
+        'duration': args.duration,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f'\nSaved results to {args.output}')
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.max_regression):
+            return 1
+    return 0
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('smoke', help='one request per endpoint (default)')
+    load = sub.add_parser('load', help='concurrent load benchmark')
+    load.add_argument('--base', default=BASE, help=f'API base URL (default {BASE})')
+    load.add_argument('--scenarios', nargs='*', default=list(SCENARIOS), choices=list(SCENARIOS))
+    load.add_argument('--duration', type=float, default=10, help='seconds per scenario')
+    load.add_argument('--concurrency', type=int, default=8, help='client threads')
+    load.add_argument('--output', help='write the results as JSON')
+    load.add_argument('--baseline', help='compare against a previous --output file')
+    load.add_argument('--max-regression', type=float, default=10, help='allowed throughput/p95 regression in percent')
+    args = parser.parse_args()
+    if args.command == 'load':
+        return run_load(args)
+    run_smoke()
+    return 0
+if __name__ == '__main__':
+    sys.exit(main())
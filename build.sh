@@ -21,4 +21,8 @@ python manage.py migrate --noinput
 echo "📁 Collecting static files..."
 python manage.py collectstatic --noinput --clear
 
+# Prebuild the OpenAPI schema served by /api/swagger/ and /api/redoc/
+echo "📘 Building OpenAPI schema..."
+python manage.py build_openapi_schema
+
 echo "✅ Build completed successfully!"
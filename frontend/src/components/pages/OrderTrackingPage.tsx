@@ -29,6 +29,8 @@ interface OrderStatus {
   }>;
 }
 
+const ORDER_POLL_INTERVAL = 30000;
+
 export default function OrderTrackingPage() {
   const { navigate, pageData } = useNavigation();
   const orderId = pageData?.orderId;
@@ -42,6 +44,41 @@ export default function OrderTrackingPage() {
     }
   }, [orderId]);
 
+  // status changes are pushed by the server instead of re-fetching the order;
+  // a server without ASGI workers refuses the stream (503) and the order is polled instead
+  useEffect(() => {
+    const token = localStorage.getItem('token');
+    if (!order || !token) return;
+    let poll: ReturnType<typeof setInterval> | undefined;
+    const source = new EventSource(`/api/v1/orders/events/?access_token=${encodeURIComponent(token)}`);
+    source.addEventListener('order.status', (event) => {
+      const change = JSON.parse((event as MessageEvent).data);
+      if (change.order === order.id) {
+        setOrder((current) => (current ? { ...current, status: change.status } : current));
+      }
+    });
+    source.onerror = () => {
+      // a dropped stream is retried by the browser; a refused one ends CLOSED
+      if (source.readyState !== EventSource.CLOSED || poll) return;
+      poll = setInterval(async () => {
+        try {
+          const response = await fetch(`/api/v1/orders/${order.id}/`, {
+            headers: { 'Authorization': `Bearer ${token}` }
+          });
+          if (!response.ok) return;
+          const data: OrderStatus = await response.json();
+          setOrder((current) => (current ? { ...current, status: data.status } : current));
+        } catch {
+          // offline: try again on the next tick
+        }
+      }, ORDER_POLL_INTERVAL);
+    };
+    return () => {
+      source.close();
+      if (poll) clearInterval(poll);
+    };
+  }, [order?.id]);
+
   const fetchOrder = async (id: string | number) => {
     try {
       setLoading(true);
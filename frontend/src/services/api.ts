@@ -72,6 +72,12 @@ class ApiClient {
   }
 
   async get<T>(endpoint: string, params?: Record<string, any>): Promise<T> {
+    // answered from the data the server embedded in the page, saving a round trip
+    const embedded = params ? undefined : takeBootstrap<T>(endpoint);
+    if (embedded !== undefined) {
+      return embedded;
+    }
+
     const url = new URL(endpoint, this.config.baseURL);
 
     if (params) {
@@ -123,6 +129,7 @@ class ApiClient {
 }
 
 import { API_URL } from '../config/env';
+import { takeBootstrap } from './bootstrap';
 
 // API Client Instance
 // API Client Instance
@@ -184,6 +191,8 @@ export const API_ENDPOINTS = {
     CREATE: '/orders/',
     UPDATE: (id: number) => `/orders/${id}/`,
     DELETE: (id: number) => `/orders/${id}/`,
+    // text/event-stream of status changes; EventSource passes the token as ?access_token=
+    EVENTS: '/orders/events/',
   },
 
   // Contact
@@ -0,0 +1,30 @@
+// First-paint API data embedded by the Django shell (backend/apps/core/bootstrap.py)
+// as <script id="bootstrap-data">, keyed by API path. Each entry answers one GET;
+// later requests go to the network so they see fresh data.
+
+let embedded: Record<string, unknown> | null = null;
+
+function load(): Record<string, unknown> {
+  if (embedded === null) {
+    embedded = {};
+    const element = typeof document !== 'undefined' ? document.getElementById('bootstrap-data') : null;
+    if (element?.textContent) {
+      try {
+        embedded = JSON.parse(element.textContent);
+      } catch (error) {
+        console.warn('⚠️ Ignoring malformed bootstrap data:', error);
+      }
+    }
+  }
+  return embedded!;
+}
+
+export function takeBootstrap<T>(endpoint: string): T | undefined {
+  const data = load();
+  if (!(endpoint in data)) {
+    return undefined;
+  }
+  const value = data[endpoint] as T;
+  delete data[endpoint];
+  return value;
+}
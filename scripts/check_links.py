@@ -1,123 +1,242 @@
 """
-Simple checker to verify frontend API endpoints exist on local backend.
+Contract check between the frontend's API calls and the Django backend.
+
+Backend routes come from Django's URL resolver (no server needed). Every
+.ts/.tsx/.js/.jsx file under frontend/src is scanned for API paths: literal
+"/api/v1/..." strings, `${API_URL}/...` templates, paths passed to
+api/apiClient/axios .get/.post/... and the UPPER_CASE endpoint maps in
+src/services. Per-file results are cached by mtime and size, so re-runs only
+re-parse changed files. Each path is resolved against the URLconf and its HTTP
+method compared with what the view allows; with a running backend the matched
+endpoints are also probed concurrently (OPTIONS, no side effects) over a pooled
+session.
 
 Usage:
-  python scripts/check_links.py [--backend http://localhost:8000] [--files path1 path2 ...]
+  python scripts/check_links.py [--backend http://localhost:8000] [--no-probe] [--jobs 16]
+                                [--src frontend/src] [--no-cache] [--unused]
 
-Default files checked are:
-  frontend/src/components/pages/LabelPage.tsx
-  frontend/src/components/pages/LabelCategoryPage.tsx
-
-Note:
-  - The script attempts simple substitutions for template vars like ${slug}, {id}, :slug -> 'test' or '1'.
-  - It performs GET requests; some endpoints may require auth or POST, so adjust manually if needed.
+Exit status 2 when the frontend calls missing endpoints or methods the view
+does not allow.
 """
+import argparse
+import json
+import os
 import re
-import requests
 import sys
-import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-import argparse
-
-DEFAULT_BACKEND = "http://localhost:8000"
-PROJECT_ROOT = Path(__file__).resolve().parents[1]  # .../Daidi_print
-
-DEFAULT_FILES = [
-    PROJECT_ROOT / "frontend" / "src" / "components" / "pages" / "LabelPage.tsx",
-    PROJECT_ROOT / "frontend" / "src" / "components" / "pages" / "LabelCategoryPage.tsx",
-]
-
-API_RE = re.compile(r'(["\'`])(/api/v1/[^"\')` ]+)')  # capture strings like "/api/v1/..."
-TPL_REPLACEMENTS = [
-    (re.compile(r'\$\{[^}]+\}'), 'test'),
-    (re.compile(r':slug\b'), 'test'),
-    (re.compile(r'\{slug\}'), 'test'),
-    (re.compile(r'\{id\}'), '1'),
-    (re.compile(r'\$\{product\.id\}'), '1'),
-    (re.compile(r'\$\{.*?id.*?\}'), '1'),
-]
-
-def normalize_endpoint(raw):
-    ep = raw.strip()
-    # remove query-sections that include template constructs? keep queries
-    for pattern, repl in TPL_REPLACEMENTS:
-        ep = pattern.sub(repl, ep)
-    # collapse duplicate slashes
-    ep = re.sub(r'\/+', '/', ep)
-    # ensure trailing slash for Django style
-    if not re.search(r'\.[a-z]{2,4}$', ep) and not ep.endswith('/'):
-        ep = ep + '/'
-    return ep
-
-def extract_endpoints_from_file(path: Path):
-    if not path.exists():
-        return []
-    text = path.read_text(encoding='utf-8')
-    matches = API_RE.findall(text)
-    endpoints = [m[1] for m in matches]
-    return endpoints
-
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument('--backend', default=DEFAULT_BACKEND, help='Backend base URL (default http://localhost:8000)')
-    parser.add_argument('--files', nargs='*', help='Frontend files to scan')
-    args = parser.parse_args()
 
-    files = []
-    if args.files:
-        files = [Path(f) for f in args.files]
-    else:
-        files = DEFAULT_FILES
-
-    found = set()
-    for f in files:
-        eps = extract_endpoints_from_file(f)
-        for e in eps:
-            found.add(e)
-
-    if not found:
-        print("No /api/v1/ endpoints found in the scanned files.")
-        return 0
-
-    print("Extracted endpoints (raw):")
-    for e in sorted(found):
-        print("  ", e)
-    print()
-
-    normalized = {normalize_endpoint(e) for e in found}
-    print("Normalized endpoints to test:")
-    for e in sorted(normalized):
-        print("  ", e)
-    print()
-
-    print(f"Testing endpoints against backend: {args.backend}")
+DEFAULT_BACKEND = 'http://localhost:8000'
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = PROJECT_ROOT / 'backend'
+DEFAULT_SRC = PROJECT_ROOT / 'frontend' / 'src'
+CACHE_PATH = PROJECT_ROOT / '.cache' / 'check_links.json'
+CACHE_VERSION = 1
+API_PREFIX = '/api/v1'
+EXTENSIONS = {'.ts', '.tsx', '.js', '.jsx'}
+SKIP_DIRS = {'node_modules', 'dist', 'build', '__tests__'}
+PLACEHOLDER_VALUES = ('1', 'test')
+
+# string, double-quoted and template literals (templates may span lines)
+LITERAL_RE = re.compile(r"""'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*"|`(?:[^`\\]|\\.)*`""")
+TEMPLATE_VAR_RE = re.compile(r'\$\{[^}]*\}')
+BASE_VAR_RE = re.compile(r'^\$\{[\w.]*(?:URL|Url|url|BASE|base)[\w.]*\}(?=/)')
+CLIENT_CALL_RE = re.compile(r'\b(?:api|apiClient|axios|client|http)\.(get|post|put|patch|delete)\s*(?:<[^>]*>)?\(\s*$')
+FETCH_RE = re.compile(r'\bfetch\(\s*$')
+FETCH_METHOD_RE = re.compile(r"""\bmethod\s*:\s*['"](\w+)['"]""")
+MAP_ENTRY_RE = re.compile(r'\b[A-Z][A-Z0-9_]*\s*:\s*(?:\([^()]*\)\s*=>\s*)?$')
+
+@dataclass(frozen=True)
+class Reference:
+    path: str  # relative to API_PREFIX, template variables as {}
+    method: str  # None when the frontend only names the endpoint
+    file: str
+    line: int
+def _api_path(value):
+    """The API path in a literal's text, relative to API_PREFIX, or None."""
+    value = TEMPLATE_VAR_RE.sub('{}', BASE_VAR_RE.sub('', value)) if BASE_VAR_RE.match(value) else value
+    if API_PREFIX + '/' in value:
+        value = value[value.index(API_PREFIX + '/') + len(API_PREFIX):]
+    elif not value.startswith('/') or value.startswith('//'):
+        return None
+    value = TEMPLATE_VAR_RE.sub('{}', value).split('?')[0].split('#')[0]
+    return value if re.fullmatch(r'/[\w\-./{}]*', value) else None
+def parse_source(text, name):
+    """API references in one source file."""
+    references = []
+    for match in LITERAL_RE.finditer(text):
+        raw = match.group()[1:-1]
+        before = text[max(0, match.start() - 120):match.start()]
+        line_start = before.rsplit('\n', 1)[-1]
+        call = CLIENT_CALL_RE.search(before)
+        explicit = API_PREFIX + '/' in raw or BASE_VAR_RE.match(raw)
+        if not (explicit or call or MAP_ENTRY_RE.search(line_start)):
+            continue
+        path = _api_path(raw)
+        if path is None or path == '/':
+            continue
+        if call:
+            method = call.group(1).upper()
+        elif FETCH_RE.search(before):
+            options = text[match.end():match.end() + 400].split('fetch(')[0]
+            found = FETCH_METHOD_RE.search(options)
+            method = found.group(1).upper() if found else 'GET'
+        else:
+            method = None
+        references.append(Reference(path, method, name, text.count('\n', 0, match.start()) + 1))
+    return references
+def scan_frontend(src, use_cache=True):
+    """References in every source file under ``src``; returns (references, parsed, cached)."""
+    cache = {}
+    if use_cache and CACHE_PATH.exists():
+        try:
+            cache = json.loads(CACHE_PATH.read_text(encoding='utf-8'))
+        except ValueError:
+            cache = {}
+    if cache.get('version') != CACHE_VERSION or cache.get('src') != str(src):
+        cache = {'version': CACHE_VERSION, 'src': str(src), 'files': {}}
+    files, fresh, references, parsed = cache['files'], {}, [], 0
+    for root, dirs, names in os.walk(src):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith('.')]
+        for filename in names:
+            path = Path(root, filename)
+            if path.suffix not in EXTENSIONS:
+                continue
+            name = path.relative_to(src.parent).as_posix()
+            stat = path.stat()
+            entry = files.get(name)
+            if entry is None or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                text = path.read_text(encoding='utf-8', errors='replace')
+                entry = {
+                    'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                    'refs': [[r.path, r.method, r.line] for r in parse_source(text, name)],
+                }
+                parsed += 1
+            fresh[name] = entry
+            references.extend(Reference(p, m, name, line) for p, m, line in entry['refs'])
+    if use_cache:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        CACHE_PATH.write_text(json.dumps({**cache, 'files': fresh}), encoding='utf-8')
+    return references, parsed, len(fresh) - parsed
+def setup_django():
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+def allowed_methods(func):
+    """HTTP methods the resolved view accepts, or None when it cannot be told statically."""
+    actions = getattr(func, 'actions', None)
+    if actions:  # DRF viewset route
+        return sorted({method.upper() for method in actions} | {'OPTIONS'})
+    view_class = getattr(func, 'cls', None) or getattr(func, 'view_class', None)
+    if view_class is None:
+        return None
+    return sorted(m.upper() for m in view_class.http_method_names if hasattr(view_class, m))
+def iter_routes(resolver, prefix=''):
+    """(route, name, callback) for every URL pattern below ``resolver``."""
+    from django.urls import URLPattern, URLResolver
+    for pattern in resolver.url_patterns:
+        route = prefix + str(pattern.pattern).lstrip('^').rstrip('$')
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern, route)
+        elif isinstance(pattern, URLPattern):
+            yield route, pattern.name, pattern.callback
+def resolve_reference(path):
+    """(concrete URL, ResolverMatch) for a frontend path, trying each placeholder value."""
+    from django.urls import Resolver404, resolve
+    for value in PLACEHOLDER_VALUES:
+        url = API_PREFIX + path.replace('{}', value)
+        try:
+            return url, resolve(url)
+        except Resolver404:
+            continue
+    return API_PREFIX + path.replace('{}', PLACEHOLDER_VALUES[0]), None
+def probe(backend, urls, jobs):
+    """OPTIONS every URL concurrently; {url: (status, Allow header or error)}."""
+    import requests
+    from requests.adapters import HTTPAdapter
     session = requests.Session()
-    session.headers.update({"User-Agent": "daidi-link-checker/1.0"})
-    results = []
-    for ep in sorted(normalized):
-        url = args.backend.rstrip('/') + ep
+    session.headers.update({'User-Agent': 'daidi-link-checker/2.0', 'Accept': 'application/json'})
+    session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=jobs))
+    session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=jobs))
+    base = backend.rstrip('/')
+    try:
+        session.options(base + API_PREFIX + '/', timeout=3)
+    except requests.RequestException as exc:
+        return None, str(exc)
+    def one(url):
         try:
-            r = session.get(url, timeout=6)
-            results.append((ep, r.status_code, r.reason))
+            response = session.options(base + url, timeout=6, allow_redirects=False)
+            return url, (response.status_code, response.headers.get('Allow', ''))
         except requests.RequestException as exc:
-            results.append((ep, None, str(exc)))
-
-    print("\nResults:")
-    for ep, status, info in results:
-        status_str = str(status) if status is not None else "ERROR"
-        print(f"  {ep:60} -> {status_str}  {info}")
-
-    # Summary
-    missing = [r for r in results if r[1] is None or (isinstance(r[1], int) and r[1] >= 400)]
-    if missing:
-        print("\nEndpoints that returned errors (400+/network):")
-        for ep, status, info in missing:
-            print(f"  {ep} -> {status} {info}")
-        print("\nAction: Implement corresponding backend view/route or adjust frontend endpoint.")
-        return 2
-
-    print("\nAll tested endpoints responded with non-error status codes.")
-    return 0
-
-if __name__ == "__main__":
+            return url, (None, str(exc))
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return dict(pool.map(one, sorted(urls))), None
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', default=DEFAULT_BACKEND, help='running backend to probe (default http://localhost:8000)')
+    parser.add_argument('--no-probe', action='store_true', help='only compare against the URLconf')
+    parser.add_argument('--jobs', type=int, default=16, help='concurrent probe requests')
+    parser.add_argument('--src', type=Path, default=DEFAULT_SRC, help='frontend source tree')
+    parser.add_argument('--no-cache', action='store_true', help='re-parse every file')
+    parser.add_argument('--unused', action='store_true', help='also list backend API routes the frontend never calls')
+    args = parser.parse_args()
+    started = time.perf_counter()
+    references, parsed, cached = scan_frontend(args.src.resolve(), use_cache=not args.no_cache)
+    setup_django()
+    from django.urls import get_resolver
+    routes = [(route, name, callback) for route, name, callback in iter_routes(get_resolver())
+              if ('/' + route).startswith(API_PREFIX.rstrip('/'))]
+    print(f'Backend: {len(routes)} API routes. Frontend: {len(references)} API references '
+          f'({parsed} files parsed, {cached} from cache).')
+
+    missing, mismatched, matched, used = {}, {}, {}, set()
+    for ref in sorted(references, key=lambda r: (r.path, r.file, r.line)):
+        url, match = resolve_reference(ref.path)
+        if match is None:
+            missing.setdefault((ref.method or 'ANY', API_PREFIX + ref.path), []).append(ref)
+            continue
+        used.add(match.func)
+        allowed = allowed_methods(match.func)
+        matched.setdefault(url, set()).add(ref.method)
+        if ref.method and allowed is not None and ref.method not in allowed:
+            mismatched.setdefault((ref.method, API_PREFIX + ref.path, ', '.join(allowed)), []).append(ref)
+
+    def where(refs):
+        shown = ', '.join(f'{r.file}:{r.line}' for r in refs[:3])
+        return shown + (f' (+{len(refs) - 3} more)' if len(refs) > 3 else '')
+    print(f'\nMissing on the backend ({len(missing)}):' if missing else '\nNo missing endpoints.')
+    for (method, path), refs in sorted(missing.items(), key=lambda item: item[0][1]):
+        print(f'  {method:7} {path:50} {where(refs)}')
+    print(f'\nMethod not allowed by the view ({len(mismatched)}):' if mismatched else '\nNo method mismatches.')
+    for (method, path, allowed), refs in sorted(mismatched.items(), key=lambda item: item[0][1]):
+        print(f'  {method:7} {path:50} allows {allowed}  {where(refs)}')
+
+    probe_failures = []
+    if not args.no_probe and matched:
+        results, error = probe(args.backend, matched, args.jobs)
+        if results is None:
+            print(f'\nBackend {args.backend} not reachable, probing skipped ({error}).')
+        else:
+            for url, (status, info) in sorted(results.items()):
+                methods = {m for m in matched[url] if m}
+                allowed = {m.strip() for m in info.split(',')} if status else set()
+                if status is None or status == 404 or status >= 500:
+                    probe_failures.append(f'  {url:58} -> {status or "ERROR"} {info if status is None else ""}')
+                elif allowed - {''} and methods - allowed:
+                    probe_failures.append(f'  {url:58} -> {", ".join(sorted(methods - allowed))} not in Allow: {info}')
+            print(f'\nProbed {len(results)} endpoints on {args.backend}: '
+                  + (f'{len(probe_failures)} problems' if probe_failures else 'all present'))
+            for failure in probe_failures:
+                print(failure)
+    if args.unused:
+        unused = sorted(f'/{route}' for route, _name, callback in routes if callback not in used)
+        print(f'\nBackend API routes not called by the frontend ({len(unused)}):')
+        for route in unused:
+            print(f'  {route}')
+    print(f'\nDone in {time.perf_counter() - started:.2f}s.')
+    return 2 if missing or mismatched or probe_failures else 0
+if __name__ == '__main__':
     sys.exit(main())
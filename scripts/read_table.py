@@ -1,15 +1,27 @@
-import pandas as pd
+"""
+Print the first rows of a CSV/XLSX price list without loading the whole file
+(rows are streamed by backend/apps/core/tabular.py).
 
-models:
-  - title: Grok 4
-    provider: openrouter
-    model: x-ai/grok-4
-    apiKey: sk-or-v1-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  # کلیدت از openrouter.ai
+Usage:
+  python scripts/read_table.py [table.csv] [--rows 5] [--sheet NAME]
+"""
+import argparse
+import sys
+from itertools import islice
+from pathlib import Path
 
-  - title: Grok 3
-    provider: openrouter
-    model: x-ai/grok-3
-    apiKey: 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  # همون کلید بالا
+BACKEND_DIR = Path(__file__).resolve().parents[1] / 'backend'
 
-df = pd.read_csv('table.csv')  # فرض بر این است که فایل در همین پوشه است
-print(df.head())
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', nargs='?', default='table.csv')
+    parser.add_argument('--rows', type=int, default=5, help='data rows to print after the header')
+    parser.add_argument('--sheet', help='XLSX sheet name or 0-based index')
+    args = parser.parse_args()
+    sys.path.insert(0, str(BACKEND_DIR))
+    from apps.core.tabular import iter_rows
+    for row in islice(iter_rows(args.path, args.sheet), args.rows + 1):
+        print(' | '.join(row))
+
+if __name__ == '__main__':
+    main()